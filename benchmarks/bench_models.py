@@ -0,0 +1,144 @@
+"""
+Модели и формы для бенчмарков.
+
+Модели объявлены в отдельном DeclarativeBase, чтобы не пересекаться с моделями приложения.
+"""
+import enum
+import tempfile
+
+from sqlalchemy import String, Integer, Boolean, Date, ForeignKey, Enum, Text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from miniform.fields import FileField
+from miniform.forms import ModelForm, Form
+from miniform.widgets import TextWidget, IntegerWidget, EmailWidget, CheckboxWidget, DateWidget, SelectWidget
+
+WIDE_COLUMNS = 40
+FK_COLUMNS = 10
+FK_ROWS = 50
+UPLOAD_DIR = tempfile.mkdtemp(prefix="miniform_bench_")
+
+
+class BenchBase(DeclarativeBase):
+    pass
+
+
+class Status(enum.Enum):
+    draft = "Draft"
+    published = "Published"
+    archived = "Archived"
+
+
+class Narrow(BenchBase):
+    __tablename__ = "bench_narrow"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(100))
+    active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=True)
+
+
+class UniqueNarrow(BenchBase):
+    __tablename__ = "bench_unique_narrow"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(100), unique=True)
+    code: Mapped[str] = mapped_column(String(100), unique=True)
+    active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=True)
+
+
+class Document(BenchBase):
+    __tablename__ = "bench_document"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(100))
+    file = mapped_column(FileField(upload_to=UPLOAD_DIR, max_size=16 * 1024, allowed_extensions=["txt"]))
+
+
+def _wide_columns() -> dict:
+    columns = {
+        "__tablename__": "bench_wide",
+        "id": mapped_column(Integer, primary_key=True),
+        "status": mapped_column(Enum(Status), nullable=True),
+        "published": mapped_column(Date, nullable=True),
+        "body": mapped_column(Text, nullable=True),
+    }
+    for number in range(WIDE_COLUMNS - len(columns) + 1):  # __tablename__ не является колонкой
+        columns[f"field_{number}"] = mapped_column(String(100), nullable=True)
+    return columns
+
+
+Wide = type("Wide", (BenchBase,), _wide_columns())
+
+
+class Related(BenchBase):
+    __tablename__ = "bench_related"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(100))
+
+    def __str__(self):
+        return self.title
+
+
+def _fk_columns() -> dict:
+    columns = {
+        "__tablename__": "bench_fk_heavy",
+        "id": mapped_column(Integer, primary_key=True),
+    }
+    for number in range(FK_COLUMNS):
+        columns[f"related_{number}_id"] = mapped_column(ForeignKey("bench_related.id"), nullable=True)
+    return columns
+
+
+FkHeavy = type("FkHeavy", (BenchBase,), _fk_columns())
+
+
+class NarrowForm(ModelForm):
+    model = Narrow
+
+
+class UniqueNarrowForm(ModelForm):
+    model = UniqueNarrow
+
+
+class WideForm(ModelForm):
+    model = Wide
+
+
+class WideSchemaForm(WideForm):
+    """Та же форма, для которой бенчмарк регистрирует скомпилированную схему."""
+
+
+class FkHeavyForm(ModelForm):
+    model = FkHeavy
+
+
+class DocumentForm(ModelForm):
+    model = Document
+
+
+class ContactForm(Form):
+    name = TextWidget(label="Name", required=True)
+    email = EmailWidget(label="Email", required=True)
+    age = IntegerWidget(label="Age")
+    birthday = DateWidget(label="Birthday")
+    subscribe = CheckboxWidget(label="Subscribe")
+    status = SelectWidget(label="Status", options={item.name: item.value for item in Status})
+    city = TextWidget(label="City")
+    street = TextWidget(label="Street")
+    company = TextWidget(label="Company")
+    position = TextWidget(label="Position")
+
+
+async def create_database():
+    """
+    Создает базу данных sqlite в памяти и заполняет связанные таблицы.
+
+    Returns:
+        tuple: движок и фабрика сессий.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(BenchBase.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        session.add_all(Related(title=f"related {number}") for number in range(FK_ROWS))
+        await session.commit()
+    return engine, session_maker
@@ -0,0 +1,460 @@
+"""
+Бенчмарки основных сценариев miniform.
+
+Запуск:
+    python benchmarks/run.py                          # результаты в benchmarks/results/<commit>.json
+    python benchmarks/run.py -k init -o current.json  # только бенчмарки, содержащие "init"
+    python benchmarks/run.py --compare benchmarks/results/abc1234.json
+
+Для работы требуется драйвер aiosqlite: все бенчмарки выполняются на базе sqlite в памяти.
+"""
+import argparse
+import asyncio
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sqlalchemy  # noqa: E402
+from starlette.datastructures import UploadFile, Headers  # noqa: E402
+
+from miniform import ModelImporter  # noqa: E402
+from miniform.schema import FormSchema  # noqa: E402
+
+from bench_models import (  # noqa: E402
+    NarrowForm,
+    UniqueNarrowForm,
+    WideForm,
+    WideSchemaForm,
+    FkHeavyForm,
+    DocumentForm,
+    ContactForm,
+    Narrow,
+    Status,
+    WIDE_COLUMNS,
+    UPLOAD_DIR,
+    create_database,
+)
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BENCHMARKS: Dict[str, Callable] = {}
+THROUGHPUT_ROWS: Dict[str, int] = {}
+
+
+def benchmark(name: str, rows: int = 0):
+    """
+    Регистрирует бенчмарк.
+
+    Функция бенчмарка получает фабрику сессий и возвращает замеряемую корутинную функцию
+    или кортеж (setup, run), где setup выполняется перед каждым замером и не учитывается во времени.
+    Если run возвращает число, оно используется как результат замера в секундах.
+
+    Args:
+        name: имя бенчмарка в отчете.
+        rows: количество строк, обрабатываемых за замер, для расчета строк в секунду.
+
+    Returns:
+        Callable
+    """
+
+    def decorator(func):
+        BENCHMARKS[name] = func
+        if rows:
+            THROUGHPUT_ROWS[name] = rows
+        return func
+
+    return decorator
+
+
+@benchmark("modelform_init_narrow")
+async def bench_modelform_init_narrow(session_maker):
+    async def run(_):
+        NarrowForm(session=session_maker())
+
+    return run
+
+
+@benchmark("modelform_init_wide")
+async def bench_modelform_init_wide(session_maker):
+    async def run(_):
+        WideForm(session=session_maker())
+
+    return run
+
+
+@benchmark("modelform_init_wide_schema")
+async def bench_modelform_init_wide_schema(session_maker):
+    FormSchema.compile(WideSchemaForm).register()
+
+    async def run(_):
+        WideSchemaForm(session=session_maker())
+
+    return run
+
+
+@benchmark("modelform_init_fk_heavy")
+async def bench_modelform_init_fk_heavy(session_maker):
+    async def run(_):
+        FkHeavyForm(session=session_maker())
+
+    return run
+
+
+@benchmark("modelform_init_fk_heavy_without_options")
+async def bench_modelform_init_fk_heavy_without_options(session_maker):
+    async def run(_):
+        FkHeavyForm(session=session_maker(), load_options=False)
+
+    return run
+
+
+@benchmark("form_init")
+async def bench_form_init(session_maker):
+    async def run(_):
+        ContactForm()
+
+    return run
+
+
+@benchmark("is_valid_without_unique")
+async def bench_is_valid_without_unique(session_maker):
+    form = NarrowForm(session=session_maker())
+
+    async def run(_):
+        await form.is_valid({"title": "Benchmark title", "active": "on"})
+
+    return run
+
+
+@benchmark("is_valid_with_unique")
+async def bench_is_valid_with_unique(session_maker):
+    form = UniqueNarrowForm(session=session_maker())
+
+    async def run(_):
+        await form.is_valid({"title": "Benchmark title", "code": "code-1", "active": "on"})
+
+    return run
+
+
+@benchmark("form_is_valid")
+async def bench_form_is_valid(session_maker):
+    form = ContactForm()
+    data = {
+        "name": "Name",
+        "email": "name@example.com",
+        "age": "30",
+        "birthday": "1990-01-01",
+        "subscribe": "on",
+        "status": "draft",
+        "city": "City",
+    }
+
+    async def run(_):
+        await form.is_valid(data)
+
+    return run
+
+
+def _wide_object() -> dict:
+    obj = {"id": 1, "status": Status.published, "published": datetime.date(2024, 1, 1), "body": "Body"}
+    obj.update({f"field_{number}": f"value {number}" for number in range(WIDE_COLUMNS)})
+    return obj
+
+
+@benchmark("render_html_wide")
+async def bench_render_html_wide(session_maker):
+    # html полей и опции внешних ключей кешируются формой, поэтому каждый замер выводит новую форму
+    async def setup():
+        return WideForm(session=session_maker(), obj=_wide_object())
+
+    async def run(form):
+        form.__html__()
+
+    return setup, run
+
+
+@benchmark("render_html_fk_heavy")
+async def bench_render_html_fk_heavy(session_maker):
+    # html полей и опции внешних ключей кешируются формой, поэтому каждый замер выводит новую форму
+    async def setup():
+        return FkHeavyForm(session=session_maker())
+
+    async def run(form):
+        form.__html__()
+
+    return setup, run
+
+
+@benchmark("form_json_wide")
+async def bench_form_json_wide(session_maker):
+    # html полей и опции внешних ключей кешируются формой, поэтому каждый замер выводит новую форму
+    async def setup():
+        return WideForm(session=session_maker(), obj=_wide_object())
+
+    async def run(form):
+        form.form_json()
+
+    return setup, run
+
+
+@benchmark("save_form_insert")
+async def bench_save_form_insert(session_maker):
+    async def setup():
+        form = NarrowForm(session=session_maker())
+        await form.is_valid({"title": "Inserted", "active": "on"})
+        return form
+
+    async def run(form):
+        await form.save_form()
+
+    return setup, run
+
+
+@benchmark("save_form_update")
+async def bench_save_form_update(session_maker):
+    async with session_maker() as session:
+        obj = Narrow(title="Updated", active=False)
+        session.add(obj)
+        await session.commit()
+
+    async def setup():
+        form = NarrowForm(session=session_maker(), obj=obj)
+        await form.is_valid({"id": str(obj.id), "title": "Updated again", "active": "on"})
+        return form
+
+    async def run(form):
+        await form.save_form()
+
+    return setup, run
+
+
+def _cold_import_benchmark(module: str):
+    async def bench(session_maker):
+        async def run(_):
+            # время импорта модуля в новом интерпретаторе по данным -X importtime
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=Path(__file__).resolve().parent.parent,
+            )
+            for line in result.stderr.splitlines():
+                parts = line.split("|")
+                if len(parts) == 3 and parts[2].strip() == module:
+                    return int(parts[1]) / 1_000_000
+            raise RuntimeError(f"{module} is not found in -X importtime output")
+
+        return run
+
+    return bench
+
+
+benchmark("import_miniform_cold")(_cold_import_benchmark("miniform"))
+benchmark("import_miniform_forms_cold")(_cold_import_benchmark("miniform.forms"))
+
+
+def _file_upload_benchmark(size: int):
+    async def bench(session_maker):
+        content = b"x" * size
+
+        async def setup():
+            upload = UploadFile(
+                file=io.BytesIO(content),
+                size=size,
+                filename="document.txt",
+                headers=Headers({"content-type": "text/plain"}),
+            )
+            form = DocumentForm(session=session_maker())
+            await form.is_valid({"title": "Document", "file": upload})
+            return form
+
+        async def run(form):
+            await form.save_form()
+
+        return setup, run
+
+    return bench
+
+
+for _name, _size in (("1kb", 1024), ("256kb", 256 * 1024), ("4mb", 4 * 1024 * 1024)):
+    benchmark(f"file_upload_{_name}")(_file_upload_benchmark(_size))
+
+
+IMPORT_ROWS = 10_000
+
+
+def _import_benchmark(**importer_kwargs):
+    async def bench(session_maker):
+        # каждый замер импортирует новые уникальные значения, одна строка из ста с ошибкой
+        rounds = iter(range(1_000_000))
+
+        async def setup():
+            round_number = next(rounds)
+            source = io.StringIO()
+            source.write("title,code,active\n")
+            for index in range(IMPORT_ROWS):
+                code = "" if index % 100 == 99 else f"{round_number}-{index}"
+                source.write(f"Title {round_number}-{index},{code},on\n")
+            source.seek(0)
+            return source
+
+        async def run(source):
+            # sqlite в памяти использует одно соединение, поэтому порции сохраняются последовательно
+            importer = ModelImporter(UniqueNarrowForm, session_maker, chunk_size=1000, concurrency=1, **importer_kwargs)
+            report = await importer.run(source, import_format="csv", error_report=io.StringIO())
+            return report.elapsed
+
+        return setup, run
+
+    return bench
+
+
+benchmark("import_csv_10k", rows=IMPORT_ROWS)(_import_benchmark())
+benchmark("import_csv_10k_processes", rows=IMPORT_ROWS)(_import_benchmark(processes=os.cpu_count() or 1))
+
+
+async def measure(func: Callable, session_maker, min_time: float, max_rounds: int, warmup: int) -> dict:
+    """
+    Замеряет время выполнения бенчмарка.
+
+    Args:
+        func: функция бенчмарка.
+        session_maker: фабрика сессий.
+        min_time: минимальное суммарное время замеров в секундах.
+        max_rounds: максимальное количество замеров.
+        warmup: количество прогревочных запусков.
+
+    Returns:
+        dict: статистика в секундах.
+    """
+    prepared = await func(session_maker)
+    setup, run = prepared if isinstance(prepared, tuple) else (None, prepared)
+    for _ in range(warmup):
+        await run(await setup() if setup else None)
+    timings = []
+    while len(timings) < max_rounds and (sum(timings) < min_time or len(timings) < 5):
+        argument = await setup() if setup else None
+        start = time.perf_counter()
+        measured = await run(argument)
+        elapsed = time.perf_counter() - start
+        timings.append(measured if isinstance(measured, float) else elapsed)
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def get_commit() -> str:
+    """
+    Возвращает короткий хеш текущего коммита.
+
+    Returns:
+        str
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_benchmarks(selected: list, args) -> dict:
+    engine, session_maker = await create_database()
+    results = {}
+    try:
+        for name in selected:
+            results[name] = await measure(
+                BENCHMARKS[name], session_maker, args.min_time, args.max_rounds, args.warmup
+            )
+            line = f"{name:45} median {results[name]['median'] * 1000:10.3f} ms  ({results[name]['rounds']} rounds)"
+            if name in THROUGHPUT_ROWS:
+                results[name]["rows_per_second"] = THROUGHPUT_ROWS[name] / results[name]["median"]
+                line += f"  {results[name]['rows_per_second']:,.0f} rows/s"
+            print(line)
+    finally:
+        await engine.dispose()
+        shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+    return results
+
+
+def compare(current: dict, baseline_path: Path, threshold: float) -> bool:
+    """
+    Сравнивает результаты с сохраненными ранее и выводит изменения медианы.
+
+    Args:
+        current: текущие результаты.
+        baseline_path: путь к файлу с результатами для сравнения.
+        threshold: допустимое отношение медиан, после которого фиксируется регрессия.
+
+    Returns:
+        bool: True, если найдена регрессия.
+    """
+    baseline = json.loads(baseline_path.read_text())
+    regression = False
+    print(f"\nCompared with {baseline['meta'].get('commit')} ({baseline_path}):")
+    for name, stats in current["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if not previous:
+            print(f"{name:45} new")
+            continue
+        ratio = stats["median"] / previous["median"] if previous["median"] else float("inf")
+        mark = "REGRESSION" if ratio > threshold else ""
+        regression = regression or bool(mark)
+        print(f"{name:45} x{ratio:6.2f} {mark}")
+    return regression
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="miniform benchmarks")
+    parser.add_argument("-k", dest="keyword", default="", help="run only benchmarks containing the keyword")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="path of the JSON results file")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.10, help="median ratio treated as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--min-time", type=float, default=0.5, help="minimal measured time per benchmark, s")
+    parser.add_argument("--max-rounds", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args()
+
+    selected = [name for name in BENCHMARKS if args.keyword in name]
+    commit = get_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+        },
+        "benchmarks": asyncio.run(run_benchmarks(selected, args)),
+    }
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults saved to {output}")
+    if args.compare and compare(results, args.compare, args.threshold) and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+ModelForm и Form для FastAPI и SQLAlchemy моделей.
+
+Публичные имена загружаются при первом обращении (PEP 562), поэтому `import miniform`
+не импортирует SQLAlchemy, starlette, bcrypt и остальные зависимости, пока они не нужны.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_LAZY_ATTRS = {
+    "ModelForm": "miniform.forms",
+    "Form": "miniform.forms",
+    "FormSet": "miniform.formsets",
+    "ModelImporter": "miniform.importer",
+    "ImportReport": "miniform.importer",
+    "import_rows": "miniform.importer",
+    "ValidationPlan": "miniform.schema",
+    "FormSchema": "miniform.schema",
+    "dump_schema": "miniform.schema",
+    "load_schema": "miniform.schema",
+    "prewarm": "miniform.schema",
+    "FileField": "miniform.fields",
+    "ImageField": "miniform.fields",
+    "PasswordField": "miniform.fields",
+    "TextWidget": "miniform.widgets",
+    "TextAreaWidget": "miniform.widgets",
+    "EmailWidget": "miniform.widgets",
+    "IntegerWidget": "miniform.widgets",
+    "FloatWidget": "miniform.widgets",
+    "RangeWidget": "miniform.widgets",
+    "PasswordWidget": "miniform.widgets",
+    "TimeWidget": "miniform.widgets",
+    "DateWidget": "miniform.widgets",
+    "DateTimeWidget": "miniform.widgets",
+    "SelectWidget": "miniform.widgets",
+    "MultiSelectWidget": "miniform.widgets",
+    "CheckboxWidget": "miniform.widgets",
+    "FileWidget": "miniform.widgets",
+    "ImageWidget": "miniform.widgets",
+    "hashed_func": "miniform.utils",
+    "check_hash": "miniform.utils",
+    "Instrumentation": "miniform.instrumentation",
+    "RecordingInstrumentation": "miniform.instrumentation",
+    "QueryGuard": "miniform.instrumentation",
+    "QueryBudgetExceeded": "miniform.instrumentation",
+    "set_instrumentation": "miniform.instrumentation",
+    "BaseStorage": "miniform.storage",
+    "LocalStorage": "miniform.storage",
+    "MemoryStorage": "miniform.storage",
+    "ContentAddressedStorage": "miniform.storage",
+    "set_default_storage": "miniform.storage",
+    "sweep_staging": "miniform.transactions",
+    "start_staging_sweeper": "miniform.transactions",
+    "check_content_length": "miniform.uploads",
+    "UploadRejected": "miniform.uploads",
+}
+
+if TYPE_CHECKING:
+    from miniform.forms import ModelForm, Form
+    from miniform.formsets import FormSet
+    from miniform.importer import ModelImporter, ImportReport, import_rows
+    from miniform.schema import ValidationPlan, FormSchema, dump_schema, load_schema, prewarm
+    from miniform.fields import FileField, ImageField, PasswordField
+    from miniform.widgets import (
+        TextWidget,
+        TextAreaWidget,
+        EmailWidget,
+        IntegerWidget,
+        FloatWidget,
+        RangeWidget,
+        PasswordWidget,
+        TimeWidget,
+        DateWidget,
+        DateTimeWidget,
+        SelectWidget,
+        MultiSelectWidget,
+        CheckboxWidget,
+        FileWidget,
+        ImageWidget,
+    )
+    from miniform.utils import hashed_func, check_hash
+    from miniform.instrumentation import (
+        Instrumentation,
+        RecordingInstrumentation,
+        QueryGuard,
+        QueryBudgetExceeded,
+        set_instrumentation,
+    )
+    from miniform.storage import (
+        BaseStorage,
+        LocalStorage,
+        MemoryStorage,
+        ContentAddressedStorage,
+        set_default_storage,
+    )
+    from miniform.transactions import sweep_staging, start_staging_sweeper
+    from miniform.uploads import check_content_length, UploadRejected
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
+
+__all__ = tuple(_LAZY_ATTRS)
@@ -1,12 +1,18 @@
 import os
 import re
+import tempfile
+import warnings
 from urllib.parse import unquote
 
 from sqlalchemy import Dialect
 from sqlalchemy.types import TypeDecorator, String
-from typing import Any, Union, Dict
+from typing import Any, Union, Dict, Tuple, Optional
 
-from miniform.utils import hashed_func
+from miniform.utils import hashed_func, run_sync
+from miniform.instrumentation import get_instrumentation
+from miniform.storage import BaseStorage, get_default_storage
+from miniform.transactions import get_file_transaction
+from miniform.uploads import expand_extensions, sniff_upload
 
 
 class FileField(TypeDecorator):
@@ -23,6 +29,8 @@ class FileField(TypeDecorator):
             allowed_extensions: list = None,
             file_is_empty: bool = False,
             name_translate: bool = False,
+            storage: Optional[BaseStorage] = None,
+            sniff_content: bool = True,
             *args,
             **kwargs,
     ) -> None:
@@ -30,34 +38,44 @@ class FileField(TypeDecorator):
         Конструктор класса.
 
         Args:
-            upload_to : место для загрузки файлов на диск.
+            upload_to : каталог для загрузки файлов в хранилище.
             max_size : максимальный размер файла в байтах.
-            allowed_extensions: поддерживаемые расширения для файлов.
+            allowed_extensions: поддерживаемые расширения для файлов и группы расширений ("image/*").
             file_is_empty: может ли файл быть пустым.
             name_translate: требуется ли перевод имен файлов с русского языка.
+            storage: хранилище файлов, по умолчанию get_default_storage() (локальный диск).
+            sniff_content: проверять соответствие начала файла его расширению.
             *args:
             **kwargs:
         """
         super().__init__(*args, **kwargs)
         self.upload_to = upload_to
+        self._storage = storage
+        self.sniff_content = sniff_content
         self.max_size = abs(max_size) * 1024
         self.file_is_empty = file_is_empty
-        self._existing_value = None
         self.name_translate = name_translate
-        self.allowed_extensions = []
-        if allowed_extensions:
-            for ext in allowed_extensions:
-                ext = ext.lower().strip()
-                if not ext.startswith("."):
-                    ext = f".{ext}"
-                self.allowed_extensions.append(ext)
+        self.allowed_extensions = expand_extensions(allowed_extensions or [])
         if kwargs:
             for key, value in kwargs.items():
                 setattr(self, key, value)
 
+    @property
+    def storage(self) -> BaseStorage:
+        """
+        Хранилище файлов поля.
+
+        Returns:
+            BaseStorage
+        """
+        return self._storage or get_default_storage()
+
     def set_existing_value(self, value: str) -> None:
         """
-        Метод для установки существующего значения.
+        Устаревший метод, ничего не делает.
+
+        Тип колонки общий для всех записей, поэтому старое значение теперь берется из истории
+        атрибута записи (см. miniform.transactions).
 
         Args:
             value: str
@@ -65,17 +83,46 @@ class FileField(TypeDecorator):
         Returns:
             None
         """
-        self._existing_value = value
+        warnings.warn(
+            "FileField.set_existing_value() is deprecated and has no effect: "
+            "the previous file is taken from the attribute history of each row",
+            DeprecationWarning,
+            stacklevel=2,
+        )
 
     def create_directory(self) -> None:
         """
-        Метод создания директории для загрузки файлов.
+        Устаревший метод создания каталога для загрузки файлов.
+
+        Хранилище создает каталоги при сохранении файлов. Метод создает каталог upload_to
+        в локальном хранилище поля и ничего не делает для хранилищ без локальных путей.
 
         Returns:
             None
         """
-        if not os.path.exists(self.upload_to):
-            os.makedirs(self.upload_to)
+        warnings.warn(
+            "FileField.create_directory() is deprecated: the storage creates directories when saving files",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        try:
+            directory = self.storage.path(self.upload_to)
+        except NotImplementedError:
+            return
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def is_empty_upload(value: Any) -> bool:
+        """
+        Проверяет, что файл не был выбран в форме.
+
+        Args:
+            value: UploadFile | None
+
+        Returns:
+            bool
+        """
+        return value is None or (getattr(value, "size", None) == 0 and getattr(value, "filename", None) == "")
 
     @staticmethod
     def russian_to_english(text) -> str:
@@ -109,33 +156,77 @@ class FileField(TypeDecorator):
         return ''.join(result)
 
     def process_bind_param(self, value, dialect) -> Union[str, None]:
-        if value is None or (value.size == 0 and value.filename == ""):
-            return (
-                    self._existing_value or ""
-            )  # Возвращаем существующее значение или пустую строку
+        if isinstance(value, str):
+            return value  # уже сохраненный файл
+        if self.is_empty_upload(value):
+            # у существующей записи пустая загрузка заменяется старым значением при присваивании
+            return ""
         if value.size == 0 and self.file_is_empty is False:
             raise ValueError("File must be not empty")
         if value.size == 0 and self.file_is_empty:
             return ""
         if value.size > self.max_size:
             raise ValueError(f"File size exceeds maximum allowed {self.max_size / 1024}KB")
-        self.create_directory()  # Убеждаемся, что каталог создан
         if self.name_translate:
             # Заменим русские буквы на английские
             value.filename = self.russian_to_english(value.filename)
             # Проверка имени файла и его расширения
         filename = self.validate_filename(unquote(value.filename))
-        # Генерация пути для сохранения файла
-        filepath = self.get_unique_filepath(filename)
-        # удаляем старый файл
-        if self._existing_value and os.path.exists(self._existing_value):
-            os.remove(self._existing_value)
-        with open(filepath, "wb") as f:
-            content = value.file.read()  # Читаем содержимое файла
-            f.write(content)
-            # Обновляем существующее значение на новый путь
-        self.set_existing_value(os.path.relpath(filepath))
-        return os.path.relpath(filepath)  # Возвращаем относительный путь к файлу
+        # Генерация имени файла в хранилище, свободное имя выбирает хранилище
+        filepath = self.get_filepath(filename)
+        self.validate_content(value)
+        instrumentation = get_instrumentation()
+        with instrumentation.span("file.write", field=self.model_type, size=value.size):
+            # содержимое передается в хранилище потоком, без чтения файла целиком;
+            # во время flush файл переносится под итоговое имя только после фиксации транзакции
+            transaction = get_file_transaction()
+            if transaction is not None:
+                name = transaction.stage(self.storage, filepath, value.file)
+            else:
+                name = run_sync(self.storage.save(filepath, value.file))
+        instrumentation.count("miniform_file_bytes_written_total", value.size, field=self.model_type)
+        return name  # Возвращаем имя файла в хранилище
+
+    def validate_content(self, value) -> None:
+        """
+        Проверяет содержимое загружаемого файла перед записью на диск по первому блоку файла.
+
+        Args:
+            value: UploadFile
+
+        Returns:
+            None
+        """
+        if self.sniff_content and not sniff_upload(value.file, value.filename):
+            raise ValueError(f"The content of the file '{value.filename}' does not match its type")
+
+    def remove_file(self, path: str) -> None:
+        """
+        Удаляет сохраненный файл. Во время flush удаление откладывается до фиксации транзакции.
+
+        Args:
+            path: имя файла в хранилище.
+
+        Returns:
+            None
+        """
+        transaction = get_file_transaction()
+        if transaction is not None:
+            transaction.on_commit(lambda: self.delete_file(path))
+        else:
+            self.delete_file(path)
+
+    def delete_file(self, path: str) -> None:
+        """
+        Удаляет файл из хранилища.
+
+        Args:
+            path: имя файла в хранилище.
+
+        Returns:
+            None
+        """
+        run_sync(self.storage.delete(path))
 
     def validate_filename(self, filename: str) -> str:
         filename = os.path.basename(filename)  # Удаляем пути
@@ -169,9 +260,9 @@ class FileField(TypeDecorator):
         """
         return re.sub(r"[^\w\-.()\"'?@!*,+_%]", "", filename.replace(" ", "_"))
 
-    def get_unique_filepath(self, filename: str) -> str:
+    def get_filepath(self, filename: str) -> str:
         """
-        Получает уникальный путь для файлов.
+        Получает путь файла в хранилище без проверки занятости имени.
 
         Args:
             filename: str
@@ -180,17 +271,21 @@ class FileField(TypeDecorator):
             str
         """
         clean_name = self.clean_filename(filename)
-        filepath = os.path.join(self.upload_to, clean_name)
         if not clean_name.strip("._-"):
             clean_name = "file" + (f".{extension}" if (extension := os.path.splitext(filename)[1]) else "")
-            filepath = os.path.join(self.upload_to, clean_name)
-        base, extension = os.path.splitext(clean_name)
-        counter = 2
-        while os.path.exists(filepath):
-            new_filename = f"{base}({counter}){extension}"
-            filepath = os.path.join(self.upload_to, new_filename)
-            counter += 1
-        return filepath
+        return os.path.join(self.upload_to, clean_name)
+
+    def get_unique_filepath(self, filename: str) -> str:
+        """
+        Получает уникальный путь для файлов.
+
+        Args:
+            filename: str
+
+        Returns:
+            str
+        """
+        return run_sync(self.storage.get_available_name(self.get_filepath(filename)))
 
     def process_result_value(self, value: Any, dialect) -> Any:
         return value if value else ""  # Возвращаем относительный путь
@@ -199,6 +294,7 @@ class FileField(TypeDecorator):
 class ImageField(FileField):
     impl = String
     model_type = "ImageField"
+    image_extensions = [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"]
 
     def __init__(
             self,
@@ -207,6 +303,12 @@ class ImageField(FileField):
             allowed_extensions: list = None,
             file_is_empty: bool = False,
             name_translate: bool = False,
+            derivatives: Optional[Dict[str, Tuple[int, int]]] = None,
+            derivative_format: str = "WEBP",
+            derivative_quality: int = 80,
+            max_dimensions: Optional[Tuple[int, int]] = None,
+            strip_exif: bool = False,
+            storage: Optional[BaseStorage] = None,
             *args,
             **kwargs,
     ) -> None:
@@ -219,27 +321,166 @@ class ImageField(FileField):
             allowed_extensions: поддерживаемые расширения.
             file_is_empty: может ли файл быть пустым.
             name_translate: преобразовывать имена файлов.
+            derivatives: производные размеры, например {"thumb": (200, 200), "medium": (800, 800)}.
+            derivative_format: формат производных изображений.
+            derivative_quality: качество сжатия производных изображений.
+            max_dimensions: максимальные ширина и высота исходного изображения в пикселях.
+            strip_exif: сохранять после загрузки перекодированную копию исходного изображения без EXIF
+                под новым именем (исходный файл удаляется). Перекодирование JPEG теряет качество.
+            storage: хранилище файлов, по умолчанию get_default_storage() (локальный диск).
             *args:
             **kwargs:
         """
-        super().__init__(*args, **kwargs)
-        self.upload_to = upload_to
-        self.max_size = abs(max_size) * 1024
-        self.file_is_empty = file_is_empty
-        self._existing_value = None
-        self.name_translate = name_translate
-        self.allowed_extensions = []
-        if allowed_extensions:
-            for ext in allowed_extensions:
-                ext = ext.lower().strip()
-                if not ext.startswith("."):
-                    ext = f".{ext}"
-                self.allowed_extensions.append(ext)
-        else:
-            self.allowed_extensions.append(".image/*")
-        if kwargs:
-            for key, value in kwargs.items():
-                setattr(self, key, value)
+        super().__init__(
+            upload_to,
+            max_size,
+            allowed_extensions or self.image_extensions,
+            file_is_empty,
+            name_translate,
+            storage,
+            *args,
+            **kwargs,
+        )
+        self.derivatives = dict(derivatives or {})
+        self.derivative_format = derivative_format.upper()
+        self.derivative_quality = derivative_quality
+        self.max_dimensions = max_dimensions
+        self.strip_exif = strip_exif
+
+    def validate_content(self, value) -> None:
+        """
+        Проверяет размеры изображения по заголовку файла.
+
+        Args:
+            value: UploadFile
+
+        Returns:
+            None
+        """
+        super().validate_content(value)
+        if not self.max_dimensions:
+            return
+        from miniform.images import get_image_size
+
+        width, height = get_image_size(value.file)
+        max_width, max_height = self.max_dimensions
+        if width > max_width or height > max_height:
+            raise ValueError(
+                f"Image dimensions {width}x{height} exceed maximum allowed {max_width}x{max_height}"
+            )
+
+    def get_derivative_paths(self, path: str) -> Dict[str, str]:
+        """
+        Возвращает пути производных изображений.
+
+        Args:
+            path: путь исходного изображения.
+
+        Returns:
+            dict: имя размера -> путь.
+        """
+        from miniform.images import get_derivative_path
+
+        if not path:
+            return {}
+        return {name: get_derivative_path(path, name, self.derivative_format) for name in self.derivatives}
+
+    def get_derivative_sizes(self, path: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Возвращает фактические размеры созданных производных изображений.
+
+        Размеры читаются из заголовков файлов (с кешированием), производные, которых нет на диске
+        или в хранилище без локальных путей, пропускаются.
+
+        Args:
+            path: путь исходного изображения.
+
+        Returns:
+            dict: имя размера -> (ширина, высота).
+        """
+        from miniform.images import read_image_size
+
+        sizes = {}
+        for name, derivative_path in self.get_derivative_paths(path).items():
+            try:
+                size = read_image_size(self.storage.path(derivative_path))
+            except NotImplementedError:
+                return {}
+            if size is not None:
+                sizes[name] = size
+        return sizes
+
+    async def strip_metadata(self, path: str) -> str:
+        """
+        Сохраняет в хранилище копию изображения без EXIF под новым именем.
+
+        Исходный файл не изменяется: в ContentAddressedStorage он может быть общим для нескольких записей.
+        Обработка выполняется только для хранилищ с локальными путями (LocalStorage).
+
+        Args:
+            path: имя исходного изображения в хранилище.
+
+        Returns:
+            str: имя копии или исходное имя, если копия не создана.
+        """
+        from miniform.images import run_strip_metadata
+
+        if not path:
+            return path
+        try:
+            local_path = self.storage.path(path)
+        except NotImplementedError:
+            return path
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(local_path) or ".", prefix=".", suffix=os.path.splitext(local_path)[1]
+        )
+        os.close(descriptor)
+        try:
+            if not await run_strip_metadata(local_path, temp_path):
+                return path
+            with open(temp_path, "rb") as file:
+                return await self.storage.save(path, file)
+        finally:
+            os.remove(temp_path)
+
+    async def process(self, path: str) -> Dict[str, str]:
+        """
+        Создает производные изображения в пуле процессов.
+
+        Обработка выполняется только для хранилищ с локальными путями (LocalStorage).
+
+        Args:
+            path: имя исходного изображения в хранилище.
+
+        Returns:
+            dict: имя размера -> путь производного изображения.
+        """
+        from miniform.images import run_image_pipeline
+
+        if not path or not self.derivatives:
+            return {}
+        try:
+            local_path = self.storage.path(path)
+        except NotImplementedError:
+            return {}
+        return await run_image_pipeline(local_path, self.derivatives, self.derivative_format, self.derivative_quality)
+
+    def delete_file(self, path: str) -> None:
+        """
+        Удаляет изображение вместе с производными.
+
+        Args:
+            path: путь к файлу.
+
+        Returns:
+            None
+        """
+        super().delete_file(path)
+        if run_sync(self.storage.exists(path)):
+            # в ContentAddressedStorage на файл остались другие ссылки
+            return
+        for derivative_path in self.get_derivative_paths(path).values():
+            run_sync(self.storage.delete(derivative_path))
 
 
 class PasswordField(TypeDecorator):
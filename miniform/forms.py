@@ -1,11 +1,19 @@
+from __future__ import annotations
+
 import asyncio
 import copy
+import csv
 import datetime
 import enum
+import io
 import json
+import time
+import warnings
+from contextlib import nullcontext
+from functools import partial
 
-import nest_asyncio
 from typing import (
+    TYPE_CHECKING,
     Sequence,
     Union,
     Type,
@@ -14,12 +22,25 @@ from typing import (
     Optional,
     Any,
     Callable,
+    Awaitable,
+    AsyncIterator,
 )
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import class_mapper, DeclarativeBase
+from sqlalchemy.orm import (
+    class_mapper,
+    DeclarativeBase,
+    MANYTOONE,
+    joinedload,
+    selectinload,
+    load_only,
+)
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy import (
     select,
+    insert,
+    update,
+    delete,
+    tuple_,
     String,
     Integer,
     Boolean,
@@ -32,11 +53,48 @@ from sqlalchemy import (
     Enum,
 )
 from sqlalchemy.orm.decl_api import DeclarativeAttributeIntercept
-from starlette.datastructures import UploadFile, FormData
 
-from miniform.fields import *
-from miniform.widgets import *
-from miniform.utils import get_class_name_with_table_name
+from miniform.fields import FileField, ImageField, PasswordField
+from miniform.widgets import (
+    AbstractWidget,
+    BaseWidget,
+    ExtraAttrsDict,
+    TextWidget,
+    TextAreaWidget,
+    EmailWidget,
+    IntegerWidget,
+    PasswordWidget,
+    DateWidget,
+    TimeWidget,
+    DateTimeWidget,
+    SelectWidget,
+    MultiSelectWidget,
+    CheckboxWidget,
+    FileWidget,
+    ImageWidget,
+)
+from miniform.utils import get_class_name_with_table_name, apply_nest_asyncio, enum_options
+from miniform.instrumentation import (
+    Instrumentation,
+    QueryGuard,
+    get_instrumentation,
+    get_query_guard,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from starlette.datastructures import UploadFile, FormData
+
+
+def _as_list(value: Any) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def _to_column_type(column, value: Any) -> Any:
+    try:
+        return column.type.python_type(value)
+    except (ValueError, TypeError, NotImplementedError):
+        return value
 
 
 class BaseForm:
@@ -45,12 +103,19 @@ class BaseForm:
     protect = []
     hidden = []
     readonly = []
+    validation_concurrency: int = 10
+    validator_timeout: Optional[float] = None
+    fail_fast: bool = False
+    instrumentation: Optional[Instrumentation] = None
+    query_guard: Optional[QueryGuard] = None
+    content_length_overhead: int = 64 * 1024  # запас на остальные поля и разделители multipart
 
     def __init__(self):
         self.errors = None
         self._fields: Dict[str, Any] = {}
         self._session: Optional[AsyncSession] = None
         self._obj: Optional[Union[DeclarativeBase, dict]] = None
+        self._cleaning_plan: Optional[tuple] = None
 
     def __str__(self) -> str:
         """
@@ -68,19 +133,72 @@ class BaseForm:
         Returns:
             str
         """
-        form_fieldset = (
-                "<fieldset>\n"
-                + (
-                    "".join(
-                        f"{widget}"
-                        for field, widget in self.fields.items()
-                        if field not in self.exclude
+        with self._span("render.html"), self._guard("render"):
+            form_fieldset = (
+                    "<fieldset>\n"
+                    + (
+                        "".join(
+                            f"{widget}"
+                            for field, widget in self.fields.items()
+                            if field not in self.exclude
+                        )
                     )
-                )
-                + "</fieldset>\n"
-        )
+                    + "</fieldset>\n"
+            )
         return form_fieldset
 
+    def _span(self, name: str, **attributes):
+        """
+        Возвращает контекстный менеджер замера фазы работы формы.
+
+        Args:
+            name: имя фазы.
+            **attributes: дополнительные атрибуты.
+
+        Returns:
+            контекстный менеджер
+        """
+        instrumentation = self.instrumentation or get_instrumentation()
+        if not instrumentation.enabled:
+            return instrumentation.span(name)
+        return instrumentation.span(
+            name, session=self._session, form=self.__class__.__name__, **attributes
+        )
+
+    def _guard(self, method: str):
+        """
+        Возвращает контекстный менеджер подсчета SQL запросов публичного метода формы.
+
+        Args:
+            method: имя метода.
+
+        Returns:
+            контекстный менеджер
+        """
+        guard = self.query_guard or get_query_guard()
+        if guard is None or self._session is None:
+            return nullcontext()
+        return guard.track(self, method, self._session)
+
+    def get_max_content_length(self) -> Optional[int]:
+        """
+        Возвращает допустимый размер тела запроса с формой для проверки Content-Length до чтения тела.
+
+        Пример:
+            check_content_length(request.headers, form.get_max_content_length())
+            await form.is_valid(await request.form())
+
+        Returns:
+            int | None: None, если размер одного из файлов не ограничен.
+        """
+        total = self.content_length_overhead
+        for widget in self.fields.values():
+            if isinstance(widget, FileWidget):
+                if widget.max_size is None:
+                    return None
+                total += widget.max_size
+        return total
+
     def form_dict(self) -> dict:
         """
         Метод приведения полей в формат словаря.
@@ -89,13 +207,14 @@ class BaseForm:
         """
         data = {}
         data_error = {}
-        for field, widget in self.fields.items():
-            if field not in self.exclude:
-                result, data_to_dict = widget.get_data_to_dict()
-                if result:
-                    data.update(data_to_dict)
-                else:
-                    data_error.update(data_to_dict)
+        with self._span("render.dict"), self._guard("render"):
+            for field, widget in self.fields.items():
+                if field not in self.exclude:
+                    result, data_to_dict = widget.get_data_to_dict()
+                    if result:
+                        data.update(data_to_dict)
+                    else:
+                        data_error.update(data_to_dict)
         if data_error:
             return data_error
         return data
@@ -110,11 +229,12 @@ class BaseForm:
         Returns:
             json
         """
-        return json.dumps(
-            self.form_dict(),
-            indent=indent if indent else 2,
-            ensure_ascii=ensure_ascii if ensure_ascii else False,
-        )
+        with self._span("render.json"):
+            return json.dumps(
+                self.form_dict(),
+                indent=indent if indent else 2,
+                ensure_ascii=ensure_ascii if ensure_ascii else False,
+            )
 
     def __getitem__(self, item) -> AbstractWidget:
         """
@@ -155,62 +275,254 @@ class BaseForm:
     @fields.setter
     def fields(self, value: Dict[str, Any]) -> None:
         self._fields.update(value)
+        self._cleaning_plan = None
 
     @property
     def obj(self):
         return self._obj
 
-    async def _convert_value_to_required_format(self, data: dict) -> dict:
+    def _add_field_error(self, field_name: str, message: str) -> None:
         """
-        Конвертирует значения словаря в требуемый формат.
+        Добавляет сообщение об ошибке полю формы и обновляет словарь ошибок.
 
         Args:
-            data: dict
+            field_name: имя поля.
+            message: текст ошибки.
+
         Returns:
-            dict
+            None
+        """
+        widget = self.fields[field_name]
+        if widget.list_error is None:
+            widget.list_error = []
+        widget.list_error.append(message)
+        self.errors[field_name] = ', '.join(map(str, widget.list_error))
+        self._obj.pop(field_name, None)
+
+    def _run_sync_validators(self, cleaned_data: dict, fail_fast: bool = False) -> dict:
+        """
+        Выполняет синхронные проверки полей.
+
+        Args:
+            cleaned_data: очищенные данные формы.
+            fail_fast: прекратить проверку после первой ошибки.
+
+        Returns:
+            dict: данные полей, прошедших проверку.
+        """
+        valid_data = {}
+        for field_name, field_value in cleaned_data.items():
+            if field_name not in self.fields:
+                continue
+            widget = self.fields[field_name]
+            widget_fail_fast = widget.fail_fast
+            widget.fail_fast = widget_fail_fast or fail_fast
+            try:
+                is_valid = widget.default_validator(field_value)
+            finally:
+                widget.fail_fast = widget_fail_fast
+            if not is_valid:
+                self.errors[field_name] = ', '.join(map(str, widget.list_error or []))
+                if fail_fast:
+                    break
+                continue
+            valid_data[field_name] = field_value
+        return valid_data
+
+    async def _call_async_validator(self, field_name: str, value: Any, semaphore: asyncio.Semaphore) -> Optional[str]:
+        """
+        Вызывает асинхронный валидатор поля с ограничением по времени.
+
+        Args:
+            field_name: имя поля.
+            value: значение поля.
+            semaphore: ограничение количества одновременно выполняемых проверок формы.
+
+        Returns:
+            str | None: текст ошибки или None, если значение корректно.
         """
-        converted_data = {}
-        for field, value in data.items():
+        async with semaphore:
             try:
-                converted_data[field] = self.fields[field].convert(value)
-            except (ValueError, TypeError):
-                converted_data[field] = value
-        return converted_data
+                is_valid = await asyncio.wait_for(
+                    self.fields[field_name].async_validator(value), self.validator_timeout
+                )
+            except asyncio.TimeoutError:
+                return "Validation timed out"
+            except Exception as e:
+                return f"Validation failed: {str(e)}"
+        return None if is_valid else f" Invalid value for {field_name}"
+
+    async def _run_async_validators(self, valid_data: dict, fail_fast: bool = False) -> None:
+        """
+        Параллельно выполняет асинхронные валидаторы полей, прошедших синхронные проверки.
+
+        Args:
+            valid_data: данные полей, прошедших синхронные проверки.
+            fail_fast: отменить оставшиеся проверки после первой ошибки.
+
+        Returns:
+            None
+        """
+        fields = [name for name in valid_data if self.fields[name].async_validator is not None]
+        if not fields:
+            return
+        with self._span("is_valid.async", validators=len(fields)):
+            await self._gather_async_validators(valid_data, fields, fail_fast)
+
+    async def _gather_async_validators(self, valid_data: dict, fields: List[str], fail_fast: bool) -> None:
+        """
+        Запускает асинхронные валидаторы указанных полей.
+
+        Args:
+            valid_data: данные полей, прошедших синхронные проверки.
+            fields: поля с асинхронными валидаторами.
+            fail_fast: отменить оставшиеся проверки после первой ошибки.
+
+        Returns:
+            None
+        """
+        semaphore = asyncio.Semaphore(self.validation_concurrency)
+        if not fail_fast:
+            results = await asyncio.gather(
+                *(self._call_async_validator(name, valid_data[name], semaphore) for name in fields)
+            )
+            for field_name, error in zip(fields, results):
+                if error:
+                    self._add_field_error(field_name, error)
+            return
+        tasks = {
+            asyncio.ensure_future(self._call_async_validator(name, valid_data[name], semaphore)): name
+            for name in fields
+        }
+        try:
+            for task in asyncio.as_completed(tasks):
+                error = await task
+                if error:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        for task, field_name in tasks.items():
+            if task.done() and not task.cancelled() and task.result():
+                self._add_field_error(field_name, task.result())
+                break
+
+    def _is_checkbox_field(self, name: str, widget: AbstractWidget) -> bool:
+        """
+        Проверяет, получает ли поле значение False при отсутствии в данных формы.
+
+        Args:
+            name: имя поля.
+            widget: виджет поля.
+
+        Returns:
+            bool
+        """
+        return isinstance(widget, CheckboxWidget)
+
+    def _get_cleaning_plan(self) -> tuple:
+        """
+        Возвращает план очистки данных формы.
+
+        План строится один раз для класса формы и набора полей и хранится в словаре класса,
+        формы с теми же полями используют готовый план.
+
+        Returns:
+            tuple: словарь имя поля -> (функция конвертации, поле-флажок, несколько значений)
+                и кортеж имен полей-флажков.
+        """
+        plan = self._cleaning_plan
+        if plan is not None:
+            return plan
+        cls = self.__class__
+        signature = tuple((name, type(widget), widget.multiple) for name, widget in self._fields.items())
+        plans = cls.__dict__.get("_cleaning_plans")
+        if plans is None:
+            plans = {}
+            setattr(cls, "_cleaning_plans", plans)
+        plan = plans.get(signature)
+        if plan is None:
+            entries = {
+                name: (type(widget).convert, self._is_checkbox_field(name, widget), widget.multiple)
+                for name, widget in self._fields.items()
+            }
+            checkboxes = tuple(name for name, (_, checkbox, _) in entries.items() if checkbox)
+            plan = plans[signature] = (entries, checkboxes)
+        self._cleaning_plan = plan
+        return plan
 
     @staticmethod
-    async def _convert_form_data_to_dict(form_data: Union[dict, FormData, DeclarativeBase]) -> dict:
+    def _iter_form_data(form_data: Union[dict, FormData, DeclarativeBase]):
         """
-        Получает данные формы и возвращает в формате словаря.
+        Возвращает пары ключ-значение данных формы без копирования.
 
         Args:
-            form_data:
-                Union[dict, FormData, DeclarativeBase] - данные формы.
+            form_data: dict, FormData или объект модели.
+
         Returns:
-            dict - словарь с данными
+            Iterable[tuple]: повторяющиеся ключи FormData возвращаются каждый со своим значением.
         """
         if isinstance(form_data, dict):
-            return form_data
-        if isinstance(form_data, FormData):
-            return dict(form_data.multi_items())
-        return form_data.__dict__
+            return form_data.items()
+        if hasattr(form_data, "multi_items"):  # FormData без импорта starlette
+            return form_data.multi_items()
+        return form_data.__dict__.items()
 
     async def _cleaned_form(self, form_data) -> Dict:
         """
-        Конвертирует входящие данные в словарь, удаляет пары ключ-значение не соответствующие полям формы.
+        Конвертирует входящие данные в словарь, см. _clean_data.
+
+        Args:
+            form_data: dict, FormData или объект модели.
+
+        Returns:
+            dict
+        """
+        return self._clean_data(form_data)
+
+    def _clean_data(self, form_data) -> Dict:
+        """
+        Конвертирует входящие данные в словарь за один проход по плану очистки.
+
+        Метод не использует цикл событий, поэтому вызывается и в процессах пула (ValidationPlan).
+
+        Ключи, не соответствующие полям формы, пропускаются. Значения полей с несколькими
+        значениями (multiple) собираются в список, для остальных полей используется последнее значение.
+        Отсутствующие поля-флажки получают значение False.
 
         Args:
-            form_data: dict
+            form_data: dict, FormData или объект модели.
 
         Returns:
             dict
         """
-        dict_form = await self._convert_form_data_to_dict(form_data)
-        for key, value in dict_form.copy().items():
-            if key not in self.fields.keys():
-                dict_form.pop(key)
-        dict_form = await self._convert_value_to_required_format(dict_form)
-        dict_form = await self._add_checkbox_value(dict_form)
-        return dict_form
+        entries, checkboxes = self._get_cleaning_plan()
+        fields = self._fields
+        cleaned = {}
+        for key, value in self._iter_form_data(form_data):
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            convert, _, multiple = entry
+            widget = fields[key]
+            if not multiple:
+                try:
+                    cleaned[key] = convert(widget, value)
+                except (ValueError, TypeError):
+                    cleaned[key] = value
+                continue
+            values = cleaned.setdefault(key, [])
+            for item in value if isinstance(value, (list, tuple)) else (value,):
+                if item in (None, ""):
+                    continue
+                try:
+                    values.append(convert(widget, item))
+                except (ValueError, TypeError):
+                    values.append(item)
+        for key in checkboxes:
+            if key not in cleaned:
+                cleaned[key] = False
+        return cleaned
 
 
 class ModelForm(BaseForm):
@@ -231,13 +543,20 @@ class ModelForm(BaseForm):
             replace_protect: List[str] = None,
             replace_hidden: List[str] = None,
             replace_readonly: List[str] = None,
+            load_options: bool = True,
     ):
         super().__init__()
-        nest_asyncio.apply()
+        apply_nest_asyncio()
         self.session = session
+        self.load_options = load_options
+        self._options_loaders: Dict[str, Callable[[], dict]] = {}
+        self._loaded_options: Dict[str, dict] = {}
+        self._foreign_keys: Dict[str, Any] = {}
+        self._relationships: Dict[str, Any] = {}
         self._obj = (
             obj if isinstance(obj, dict) else obj.__dict__ if obj is not None else None
         )
+        self._initial_data = dict(self._obj) if self._obj else {}
         self.prefix_form = prefix_form
         self.disabled = list(self.disabled)
         self.exclude = list(self.exclude)
@@ -258,15 +577,52 @@ class ModelForm(BaseForm):
                 getattr(self, attr).extend(replace)
             elif extend is not None:
                 getattr(self, attr).extend(extend)
-        asyncio.run(self._get_form_fields())
+        with self._span("modelform.init"), self._guard("__init__"):
+            asyncio.run(self._get_form_fields())
+
+    @classmethod
+    def loader_options(cls) -> list:
+        """
+        Возвращает параметры загрузки объекта со всеми данными, которые выводит форма.
+
+        Колонки загружаются через load_only, связанные записи внешних ключей через joinedload,
+        связи многие-ко-многим через selectinload. Форма, созданная по такому объекту с load_options=False,
+        показывает текущие значения списков без запросов опций и ленивых загрузок.
+
+        Пример:
+            product = await session.scalar(
+                select(Product).where(Product.id == pk).options(*ProductForm.loader_options())
+            )
+            form = ProductForm(session=session, obj=product, load_options=False)
 
-    async def _check_unique_value(self, field: str, value: Any):
+        Returns:
+            list: параметры для Select.options().
+        """
+        mapper = class_mapper(cls.model)
+        columns = [
+            getattr(cls.model, prop.key)
+            for prop in mapper.column_attrs
+            if prop.key not in cls.exclude or any(column.primary_key or column.foreign_keys for column in prop.columns)
+        ]
+        options = [load_only(*columns)]
+        for relationship in mapper.relationships:
+            if relationship.viewonly or relationship.key in cls.exclude:
+                continue
+            attribute = getattr(cls.model, relationship.key)
+            if relationship.direction is MANYTOONE and not relationship.uselist:
+                options.append(joinedload(attribute))
+            elif relationship.secondary is not None:
+                options.append(selectinload(attribute))
+        return options
+
+    async def _check_unique_value(self, field: str, value: Any, exclude_pk: Any = None):
         """
             Проверяет, является ли значение уникальным для указанного поля модели.
 
             Args:
                 field: Имя поля для проверки уникальности
                 value: Значение для проверки
+                exclude_pk: Первичный ключ текущей записи, исключаемой из проверки
 
             Returns:
                 bool: True если значение уникально или поле не уникальное, False если значение уже существует
@@ -282,40 +638,177 @@ class ModelForm(BaseForm):
             raise AttributeError(f"Field '{field}' does not exist in model {self.model.__name__}")
         if not mapper.columns[field].unique:
             return True
+        pk_column = mapper.columns[self._get_pk_name()]
+        sql_request = select(pk_column).where(mapper.columns[field] == value)
+        if exclude_pk not in (None, ""):
+            sql_request = sql_request.where(pk_column != exclude_pk)
         try:
-            result = await self._session.execute(
-                select(self.model).where(mapper.columns[field] == value))
-            obj = result.scalar_one_or_none()
-            return obj is None
+            result = await self._session.execute(sql_request.limit(1))
+            return result.scalar_one_or_none() is None
         except Exception as e:
             await self._session.rollback()
             raise e
         finally:
             await self._session.aclose()
 
-    async def _add_checkbox_value(self, formated_data):
+    async def _get_unique_conflicts(self, field: str, values) -> Dict[str, set]:
         """
-        Добавляет в словарь значение False для полей типа checkbox при их отсутствии.
+        Возвращает первичные ключи записей, в которых уже используются значения уникального поля.
+
+        Один запрос для всех значений, используется при проверке нескольких форм (FormSet).
 
         Args:
-            formated_data: dict
+            field: имя уникального поля.
+            values: проверяемые значения.
 
         Returns:
-            dict
+            dict: строковое значение -> множество строковых первичных ключей записей с этим значением.
         """
+        if not self._session:
+            raise AttributeError(f'No database session in class {self.__class__.__name__}')
         mapper = class_mapper(self.model)
-        for column in mapper.columns:
-            if isinstance(column.type, Boolean):
-                if column.name not in formated_data:
-                    formated_data[column.name] = False
-        return formated_data
+        column = mapper.columns[field]
+        pk_column = mapper.columns[self._get_pk_name()]
+        try:
+            result = await self._session.execute(select(pk_column, column).where(column.in_(set(values))))
+            conflicts: Dict[str, set] = {}
+            for pk_value, value in result.all():
+                conflicts.setdefault(str(value), set()).add(str(pk_value))
+            return conflicts
+        except Exception as e:
+            await self._session.rollback()
+            raise e
+        finally:
+            await self._session.aclose()
 
-    async def is_valid(self, form_data) -> bool:
+    def _clone(self, obj: Optional[Union[DeclarativeBase, dict]] = None, prefix_form: Optional[str] = None) -> ModelForm:
+        """
+        Создает форму того же класса без повторного построения полей и загрузки опций.
+
+        Виджеты копируются поверхностно: опции и настройки общие, начальные данные и префикс свои.
+
+        Args:
+            obj: объект или словарь с начальными значениями.
+            prefix_form: префикс формы.
+
+        Returns:
+            ModelForm
+        """
+        form = self.__class__.__new__(self.__class__)
+        form.__dict__.update(self.__dict__)
+        form._fields = {}
+        form._obj = obj if isinstance(obj, dict) else obj.__dict__ if obj is not None else None
+        form._initial_data = dict(form._obj) if form._obj else {}
+        form.prefix_form = prefix_form
+        form.errors = {}
+        for name, widget in self._fields.items():
+            field = copy.copy(widget)
+            validator = field.__dict__.get("default_validator")
+            if getattr(validator, "__self__", None) is widget:
+                # конструктор виджета сохраняет связанный метод, связываем его с копией
+                field.default_validator = validator.__func__.__get__(field)
+            field.list_error = None
+            field.prefix = prefix_form
+            if name in self._relationships:
+                keys = self._get_loaded_related_keys(self._relationships[name], form._obj)
+                field.init_data = {name: keys or []}
+            elif form._obj is not None:
+                field.init_data = {name: form._obj.get(name, "")}
+            else:
+                field.init_data = dict(widget.init_data)
+            field.label_field = field.get_label()
+            # HTML строится при выводе, отложенные опции не загружаются для каждой копии
+            field.field = None
+            form._fields[name] = field
+        return form
+
+    def _get_pk_name(self) -> str:
+        """
+        Возвращает имя первичного ключа модели.
+
+        Returns:
+            str
+        """
+        return self.model.__table__.primary_key.columns.keys()[0]
+
+    def _get_current_pk(self, cleaned_data: dict) -> Any:
+        """
+        Возвращает первичный ключ редактируемой записи.
+
+        Значение берется из привязанного к форме объекта, а при его отсутствии из данных формы.
+
+        Args:
+            cleaned_data: dict
+
+        Returns:
+            Any: значение первичного ключа или None для новой записи.
+        """
+        pk_name = self._get_pk_name()
+        pk_value = self._initial_data.get(pk_name)
+        if pk_value in (None, ""):
+            pk_value = cleaned_data.get(pk_name)
+        return pk_value if pk_value not in (None, "") else None
+
+    def _is_unchanged(self, field: str, value: Any, current_pk: Any) -> bool:
+        """
+        Проверяет, совпадает ли значение поля с сохраненным значением редактируемой записи.
+
+        Args:
+            field: имя поля.
+            value: новое значение.
+            current_pk: первичный ключ редактируемой записи.
+
+        Returns:
+            bool
+        """
+        if current_pk is None or field not in self._initial_data:
+            return False
+        return self._initial_data[field] == value
+
+    def _is_checkbox_field(self, name: str, widget: AbstractWidget) -> bool:
+        """
+        Проверяет, получает ли поле значение False при отсутствии в данных формы.
+
+        Для модели это все поля логических колонок, включая скрытые.
+
+        Args:
+            name: имя поля.
+            widget: виджет поля.
+
+        Returns:
+            bool
+        """
+        columns = class_mapper(self.model).columns
+        return name in columns and isinstance(columns[name].type, Boolean)
+
+    def _clean_data(self, form_data) -> Dict:
+        """
+        Конвертирует входящие данные в словарь, отсутствующие связи многие-ко-многим получают [].
+
+        Список multiple без выбранных значений не отправляется браузером, поэтому отсутствие поля
+        означает очистку связи, как отсутствие флажка означает False. Исключенные и отключенные
+        поля не отправляются формой и остаются без изменений.
+
+        Args:
+            form_data: dict, FormData или объект модели.
+
+        Returns:
+            dict
+        """
+        cleaned = super()._clean_data(form_data)
+        for name in self._relationships:
+            if name not in cleaned and name not in self.exclude and name not in self.disabled:
+                cleaned[name] = []
+        return cleaned
+
+    async def is_valid(self, form_data, fail_fast: Optional[bool] = None) -> bool:
         """
         Валидирует данные формы и заполняет self._obj корректными значениями.
 
         Args:
             form_data: Данные формы (обычно dict или FormData)
+            fail_fast: Прекратить проверку после первой ошибки. Проверки в базе данных
+                не выполняются, если уже найдена ошибка. По умолчанию используется атрибут класса.
 
         Returns:
             bool: True если все данные валидны, False если есть ошибки
@@ -324,28 +817,146 @@ class ModelForm(BaseForm):
             - Заполняет self._obj валидными значениями
             - Заполняет self.errors сообщениями об ошибках
         """
-        self._obj = {}
-        self.errors = {}
-        cleaned_data = await self._cleaned_form(form_data)
-        for field_name, field_value in cleaned_data.items():
-            if field_name not in self.fields:
+        with self._span("is_valid"), self._guard("is_valid"):
+            self._obj = {}
+            self.errors = {}
+            with self._span("is_valid.clean"):
+                cleaned_data = await self._cleaned_form(form_data)
+            fail_fast = self.fail_fast if fail_fast is None else fail_fast
+            current_pk = self._get_current_pk(cleaned_data)
+            with self._span("is_valid.sync"):
+                self._obj = self._run_sync_validators(cleaned_data, fail_fast)
+            valid_data = dict(self._obj)
+            if fail_fast and self.errors:
+                return False
+            # проверки базы данных выполняются после асинхронных валидаторов: валидаторы могут
+            # обращаться к той же сессии, а AsyncSession не допускает одновременных запросов
+            await self._run_async_validators(valid_data, fail_fast)
+            if not (fail_fast and self.errors):
+                await self._run_db_checks(valid_data, current_pk, fail_fast)
+            return len(self.errors) == 0
+
+    async def _run_db_checks(self, valid_data: dict, current_pk: Any, fail_fast: bool = False) -> None:
+        """
+        Выполняет проверки, требующие запросов в базу данных: существование внешних ключей и уникальность.
+
+        Args:
+            valid_data: данные полей, прошедших синхронные проверки.
+            current_pk: первичный ключ редактируемой записи.
+            fail_fast: прекратить проверку после первой ошибки.
+
+        Returns:
+            None
+        """
+        with self._span("is_valid.foreign_keys"):
+            await self._run_foreign_key_checks(valid_data, fail_fast)
+        if fail_fast and self.errors:
+            return
+        with self._span("is_valid.unique"):
+            await self._run_unique_checks(
+                {key: value for key, value in valid_data.items() if key not in self.errors},
+                current_pk,
+                fail_fast,
+            )
+
+    def _has_loaded_options(self, field_name: str) -> bool:
+        """
+        Проверяет, загружены ли все опции поля, то есть проверка значения выполняется виджетом.
+
+        Args:
+            field_name: имя поля.
+
+        Returns:
+            bool
+        """
+        widget = self.fields[field_name]
+        # partial_options проверяется первым: обращение к отложенным опциям загрузило бы их
+        return not widget.partial_options and bool(widget.options)
+
+    async def _run_foreign_key_checks(self, valid_data: dict, fail_fast: bool = False) -> None:
+        """
+        Проверяет существование значений внешних ключей, для которых не загружены опции.
+
+        Значения группируются по связанной колонке, для каждой выполняется один запрос.
+
+        Args:
+            valid_data: данные полей, прошедших синхронные проверки.
+            fail_fast: прекратить проверку после первой ошибки.
+
+        Returns:
+            None
+        """
+        requested: Dict[Any, Dict[str, Any]] = {}
+        for field_name, field_value in valid_data.items():
+            if field_value in (None, "", []) or field_name not in self._foreign_keys:
                 continue
-            is_valid = self.fields[field_name].default_validator(field_value)
-            if not is_valid:
-                self.errors[field_name] = ', '.join(map(str, self.fields[field_name].list_error))
+            if self._has_loaded_options(field_name):
                 continue
-            if self.model:
-                try:
-                    if not await self._check_unique_value(field_name, field_value):
-                        self.fields[field_name].list_error.append("Value must be unique")
-                        self.errors[field_name] = ', '.join(map(str, self.fields[field_name].list_error))
-                        continue
-                except Exception as e:
-                    self.fields[field_name].list_error.append(f"Unique check failed: {str(e)}")
-                    self.errors[field_name] = ', '.join(map(str, self.fields[field_name].list_error))
-                    continue
-            self._obj[field_name] = field_value
-        return len(self.errors) == 0
+            requested.setdefault(self._foreign_keys[field_name], {})[field_name] = field_value
+        for ref_column, values in requested.items():
+            try:
+                existing = await self._get_existing_keys(
+                    ref_column, [item for value in values.values() for item in _as_list(value)]
+                )
+            except Exception as e:
+                for field_name in values:
+                    self._add_field_error(field_name, f"Foreign key check failed: {str(e)}")
+                continue
+            for field_name, field_value in values.items():
+                if any(str(item) not in existing for item in _as_list(field_value)):
+                    self._add_field_error(field_name, f" Invalid value for {field_name}")
+                    if fail_fast:
+                        return
+
+    async def _get_existing_keys(self, ref_column, values) -> set:
+        """
+        Возвращает множество существующих значений связанной колонки.
+
+        Args:
+            ref_column: колонка, на которую ссылается внешний ключ.
+            values: проверяемые значения.
+
+        Returns:
+            set: строковые представления найденных значений.
+        """
+        if not self._session:
+            raise AttributeError(f'No database session in class {self.__class__.__name__}')
+        converted = {_to_column_type(ref_column, value) for value in values}
+        try:
+            result = await self._session.scalars(select(ref_column).where(ref_column.in_(converted)))
+            return {str(value) for value in result.all()}
+        except Exception as e:
+            await self._session.rollback()
+            raise e
+        finally:
+            await self._session.aclose()
+
+    async def _run_unique_checks(self, valid_data: dict, current_pk: Any, fail_fast: bool = False) -> None:
+        """
+        Проверяет уникальность измененных значений.
+
+        Запросы выполняются последовательно, так как сессия не допускает одновременного использования.
+
+        Args:
+            valid_data: данные полей, прошедших синхронные проверки.
+            current_pk: первичный ключ редактируемой записи.
+            fail_fast: прекратить проверку после первой ошибки.
+
+        Returns:
+            None
+        """
+        if not self.model:
+            return
+        for field_name, field_value in valid_data.items():
+            if field_name in self._relationships or self._is_unchanged(field_name, field_value, current_pk):
+                continue
+            try:
+                if not await self._check_unique_value(field_name, field_value, current_pk):
+                    self._add_field_error(field_name, "Value must be unique")
+            except Exception as e:
+                self._add_field_error(field_name, f"Unique check failed: {str(e)}")
+            if fail_fast and self.errors:
+                return
 
     async def save_form(
             self,
@@ -360,20 +971,166 @@ class ModelForm(BaseForm):
             raise ValueError(
                 f"Saving a model {self.model} object from a form is impossible without a session."
             )
-        for key in self.obj.keys():
-            if (
-                    key == self.model.__table__.primary_key.columns.keys()[0]
-                    and self.obj.get(key) != ""
-            ):
-                return await self._update_object_form(self.obj)
-        return await self._save_object_form(self.obj)
+        with self._span("save_form"), self._guard("save_form"):
+            uploaded_images = self._get_uploaded_images()
+            data = dict(self.obj)
+            associations = self._pop_associations(data)
+            instance = None
+            for key in data.keys():
+                if (
+                        key == self.model.__table__.primary_key.columns.keys()[0]
+                        and data.get(key) != ""
+                ):
+                    instance = await self._update_object_form(data, associations)
+                    break
+            if instance is None:
+                instance = await self._save_object_form(data, associations)
+            await self._process_images(instance, uploaded_images)
+            return instance
+
+    def _get_uploaded_images(self) -> List[str]:
+        """
+        Возвращает имена полей ImageField, для которых загружены новые файлы.
 
-    async def _save_object_form(self, data):
+        Returns:
+            list
+        """
+        mapper = class_mapper(self.model)
+        return [
+            column.name
+            for column in mapper.columns
+            if isinstance(column.type, ImageField) and getattr(self.obj.get(column.name), "size", 0)
+        ]
+
+    async def _process_images(self, instance, uploaded_images: List[str], session=None) -> None:
+        """
+        Создает производные изображения для загруженных файлов в пуле процессов.
+
+        Для полей ImageField(strip_exif=True) сначала сохраняется копия без EXIF под новым именем,
+        запись переключается на нее, а загруженный файл удаляется.
+
+        Запись к этому моменту уже сохранена, поэтому ошибка обработки (например, обрезанный файл,
+        заголовок которого прошел проверку) выдается предупреждением: запись ссылается на исходный файл,
+        а производные изображения не создаются.
+
+        Args:
+            instance: сохраненный объект модели.
+            uploaded_images: имена полей с новыми изображениями.
+            session: сессия для обновления имени файла, по умолчанию сессия формы.
+
+        Returns:
+            None
+        """
+        mapper = class_mapper(self.model)
+        for field_name in uploaded_images:
+            column = mapper.columns[field_name]
+            with self._span("save_form.images", field=field_name):
+                name = getattr(instance, field_name)
+                try:
+                    if column.type.strip_exif:
+                        name = await self._replace_image(session or self._session, instance, field_name, name)
+                    await column.type.process(name)
+                except Exception as e:
+                    warnings.warn(f"Image processing of {field_name} {name!r} failed: {e}", RuntimeWarning)
+
+    async def _replace_image(self, session, instance, field_name: str, name: str) -> str:
+        """
+        Переключает запись на копию изображения без EXIF.
+
+        Args:
+            session: сессия базы данных.
+            instance: сохраненный объект модели.
+            field_name: имя поля ImageField.
+            name: имя загруженного файла.
+
+        Returns:
+            str: имя файла, на которое ссылается запись.
+        """
+        column = class_mapper(self.model).columns[field_name]
+        clean_name = await column.type.strip_metadata(name)
+        if clean_name == name:
+            return name
+        pk_name = self._get_pk_name()
+        table = self.model.__table__
+        try:
+            await session.execute(
+                update(table)
+                .where(table.columns[pk_name] == getattr(instance, pk_name))
+                .values({column.name: clean_name})
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            await column.type.storage.delete(clean_name)
+            raise
+        finally:
+            await session.aclose()
+        set_committed_value(instance, field_name, clean_name)
+        await column.type.storage.delete(name)
+        return clean_name
+
+    def _pop_associations(self, data: dict) -> Dict[str, list]:
+        """
+        Извлекает из данных значения полей связей многие-ко-многим.
+
+        Args:
+            data: данные формы, значения связей из них удаляются.
+
+        Returns:
+            dict: имя связи -> список ключей связанных объектов.
+        """
+        return {key: _as_list(data.pop(key)) for key in list(data) if key in self._relationships}
+
+    async def _write_associations(self, instance, associations: Dict[str, list]) -> None:
+        """
+        Приводит строки таблиц связей объекта к отправленным значениям.
+
+        Для каждой связи выполняются выборка существующих строк, одна вставка добавленных
+        и одно удаление исключенных строк. Изменения выполняются в транзакции сессии без фиксации.
+
+        Args:
+            instance: объект модели с назначенным первичным ключом.
+            associations: имя связи -> список ключей связанных объектов.
+
+        Returns:
+            None
+        """
+        for key, values in associations.items():
+            relationship = self._relationships[key]
+            (parent_column, local_column), = relationship.synchronize_pairs
+            (_, remote_column), = relationship.secondary_synchronize_pairs
+            parent_value = getattr(instance, relationship.parent.get_property_by_column(parent_column).key)
+            with self._span("save_form.associations", field=key):
+                result = await self._session.scalars(
+                    select(remote_column).where(local_column == parent_value)
+                )
+                existing = {str(value): value for value in result.all()}
+                submitted = {str(value): value for value in values if value not in (None, "")}
+                added = [
+                    {local_column.name: parent_value, remote_column.name: _to_column_type(remote_column, value)}
+                    for name, value in submitted.items()
+                    if name not in existing
+                ]
+                removed = [value for name, value in existing.items() if name not in submitted]
+                if added:
+                    await self._session.execute(insert(relationship.secondary), added)
+                if removed:
+                    await self._session.execute(
+                        delete(relationship.secondary).where(
+                            local_column == parent_value, remote_column.in_(removed)
+                        )
+                    )
+            if added or removed:
+                # загруженная коллекция связи больше не соответствует таблице
+                self._session.expire(instance, [key])
+
+    async def _save_object_form(self, data, associations: Optional[Dict[str, list]] = None):
         """
         Создает новый объект модели в базе данных и возвращает его.
 
         Args:
             data (dict): Словарь с данными для создания объекта.
+            associations: значения связей многие-ко-многим.
 
         Returns:
             DeclarativeBase: Созданный объект модели. Конкретный тип зависит от self.model.
@@ -386,6 +1143,9 @@ class ModelForm(BaseForm):
         try:
             instance = self.model(**data)
             self._session.add(instance)
+            if associations:
+                await self._session.flush()
+                await self._write_associations(instance, associations)
             await self._session.commit()
             await self._session.refresh(instance)
             await self._session.aclose()
@@ -412,12 +1172,13 @@ class ModelForm(BaseForm):
                 )
         return result
 
-    async def _update_object_form(self, data):
+    async def _update_object_form(self, data, associations: Optional[Dict[str, list]] = None):
         """
         Обновляет объект модели в базе данных и возвращает его.
 
         Args:
             data (dict): Словарь с данными для создания объекта.
+            associations: значения связей многие-ко-многим.
 
         Returns:
             DeclarativeBase: Созданный объект модели. Конкретный тип зависит от self.model.
@@ -430,13 +1191,15 @@ class ModelForm(BaseForm):
             for key, value in data.items():
                 setattr(obj, key, value)
             self._session.add(obj)
+            if associations:
+                await self._write_associations(obj, associations)
             await self._session.commit()
             await self._session.refresh(obj)
             await self._session.aclose()
             return obj
         else:
             data.pop(self.model.__table__.primary_key.columns.keys()[0])
-            return await self._save_object_form(data)
+            return await self._save_object_form(data, associations)
 
     def update_field(
             self,
@@ -458,7 +1221,7 @@ class ModelForm(BaseForm):
                                 UploadFile,
                             ]
                         ],
-                        bool,
+                        Union[bool, Awaitable[bool]],
                     ]
                     | None
             ) = None,
@@ -472,7 +1235,8 @@ class ModelForm(BaseForm):
             label: Имя поля в форме
             extra_attrs: Словарь дополнительных атрибутов поля.
             options_visible_value: Видимое значения для поля select.
-            validator: функция для валидации значений поля.
+            validator: функция для валидации значений поля. Асинхронная функция выполняется
+                после синхронных проверок параллельно с другими асинхронными валидаторами.
         Returns:
             None
 
@@ -485,14 +1249,17 @@ class ModelForm(BaseForm):
         for column in mapper.columns:
             if model_field != column.name:
                 continue
-            if widget is None:
-                widget = asyncio.run(self._get_widget(column))
-            attrs = asyncio.run(
-                self._get_widget_attrs(
-                    column, label, extra_attrs, options_visible_value
+            with self._guard("update_field"):
+                if widget is None:
+                    widget = asyncio.run(self._get_widget(column))
+                attrs = asyncio.run(
+                    self._get_widget_attrs(
+                        column, label, extra_attrs, options_visible_value
+                    )
                 )
-            )
-            self.fields[model_field] = widget(**attrs, name=column.name, validator=validator)
+                self.fields[model_field] = widget(**attrs, name=column.name, validator=validator)
+                self._bind_column_type(column)
+                self._cleaning_plan = None
 
     async def _get_form_fields(self) -> None:
         """
@@ -501,12 +1268,264 @@ class ModelForm(BaseForm):
         Returns:
             None
         """
-        self.fields = {}
-        mapper = class_mapper(self.model)
-        for column in mapper.columns:
-            widget = await self._get_widget(column)
-            attrs = await self._get_widget_attrs(column)
-            self.fields[column.name] = widget(**attrs, name=column.name)
+        with self._span("modelform.fields"):
+            self.fields = {}
+            schema = self.__class__.__dict__.get("_compiled_schema")
+            if schema is not None and schema.matches(self):
+                # схема сгенерирована при сборке (miniform.schema), колонки модели не разбираются
+                await schema.build_fields(self)
+            else:
+                mapper = class_mapper(self.model)
+                for column in mapper.columns:
+                    widget = await self._get_widget(column)
+                    attrs = await self._get_widget_attrs(column)
+                    self.fields[column.name] = widget(**attrs, name=column.name)
+                    self._bind_column_type(column)
+            for relationship in self._get_many_to_many():
+                attrs = await self._get_relationship_widget_attrs(relationship)
+                self.fields[relationship.key] = MultiSelectWidget(**attrs, name=relationship.key)
+                self._bind_relationship(relationship)
+
+    def _get_many_to_many(self) -> list:
+        """
+        Возвращает связи модели многие-ко-многим через таблицу связей с простыми ключами.
+
+        Returns:
+            list: объекты RelationshipProperty.
+        """
+        return [
+            relationship
+            for relationship in class_mapper(self.model).relationships
+            if relationship.secondary is not None
+            and not relationship.viewonly
+            and len(relationship.synchronize_pairs) == 1
+            and len(relationship.secondary_synchronize_pairs) == 1
+        ]
+
+    def _bind_relationship(self, relationship) -> None:
+        """
+        Запоминает связь поля и колонку связанной модели для проверки существования значений.
+
+        Args:
+            relationship: связь многие-ко-многим.
+
+        Returns:
+            None
+        """
+        (target_column, _), = relationship.secondary_synchronize_pairs
+        self._relationships[relationship.key] = relationship
+        self._foreign_keys[relationship.key] = target_column
+        self.fields[relationship.key].foreign_key = target_column
+        self._defer_options(relationship.key)
+
+    async def _get_relationship_widget_attrs(self, relationship) -> dict:
+        """
+        Генерирует атрибуты виджета поля связи многие-ко-многим.
+
+        Опции загружаются так же, как для внешних ключей: при load_options=False список пуст,
+        при load_options=True полный список загружается при первом выводе поля, а существование
+        выбранных значений проверяется запросом при валидации.
+
+        Args:
+            relationship: связь многие-ко-многим.
+
+        Returns:
+            dict: словарь атрибутов
+        """
+        (target_column, _), = relationship.secondary_synchronize_pairs
+        key = relationship.mapper.get_property_by_column(target_column).key
+        if self._session is not None and self.load_options:
+            self._options_loaders[relationship.key] = partial(
+                self._load_options, relationship.key, partial(self._load_relationship_options, relationship)
+            )
+        # коллекция, загруженная вместе с объектом (loader_options), дает опции выбранных значений
+        select_objects = (self._obj.get(relationship.key) or []) if self._obj else []
+        options = {
+            str(getattr(obj, key)): obj for obj in select_objects if isinstance(obj, DeclarativeBase)
+        }
+        return {
+            "label": relationship.key,
+            "readonly": relationship.key in self.readonly,
+            "hidden": relationship.key in self.hidden,
+            "required": False,
+            "disabled": relationship.key in self.disabled,
+            "options": options,
+            "extra_attrs": {},
+            "init_data": await self._get_relationship_init_data(relationship),
+            "prefix": self.__dict__.get("prefix_form", None),
+        }
+
+    def _get_loaded_related_keys(self, relationship, obj: Optional[dict]) -> Optional[List[str]]:
+        """
+        Возвращает ключи связанных объектов из данных объекта без обращения к базе данных.
+
+        Args:
+            relationship: связь многие-ко-многим.
+            obj: словарь объекта формы.
+
+        Returns:
+            list | None: None, если коллекция связи не загружена.
+        """
+        value = obj.get(relationship.key) if obj else None
+        if value is None:
+            return None
+        (target_column, _), = relationship.secondary_synchronize_pairs
+        key = relationship.mapper.get_property_by_column(target_column).key
+        items = value if isinstance(value, (list, tuple, set)) else [value]
+        return [str(getattr(item, key)) if isinstance(item, DeclarativeBase) else str(item) for item in items]
+
+    async def _get_relationship_init_data(self, relationship) -> dict:
+        """
+        Получает начальные значения поля связи многие-ко-многим.
+
+        Если коллекция не загружена в объекте, ключи выбираются одним запросом из таблицы связей.
+
+        Args:
+            relationship: связь многие-ко-многим.
+
+        Returns:
+            dict: словарь с данными.
+        """
+        keys = self._get_loaded_related_keys(relationship, self._obj)
+        if keys is not None:
+            return {relationship.key: keys}
+        (parent_column, local_column), = relationship.synchronize_pairs
+        (_, remote_column), = relationship.secondary_synchronize_pairs
+        parent_value = self._initial_data.get(relationship.parent.get_property_by_column(parent_column).key)
+        if self._session is None or parent_value in (None, ""):
+            return {relationship.key: []}
+        with self._span("modelform.associations", field=relationship.key):
+            result = await self._session.scalars(select(remote_column).where(local_column == parent_value))
+            await self._session.aclose()
+        return {relationship.key: [str(value) for value in result.all()]}
+
+    def _bind_foreign_key(self, column) -> None:
+        """
+        Запоминает колонку, на которую ссылается внешний ключ поля, для проверки существования значений.
+
+        Args:
+            column: колонка модели.
+
+        Returns:
+            None
+        """
+        if not column.foreign_keys:
+            return
+        ref_column = next(iter(column.foreign_keys)).column
+        self._foreign_keys[column.name] = ref_column
+        self.fields[column.name].foreign_key = ref_column
+        self._defer_options(column.name)
+
+    def _defer_options(self, field_name: str) -> None:
+        """
+        Передает виджету поля отложенную загрузку опций.
+
+        Полный список опций запрашивается при первом выводе поля, поэтому форма, созданная только
+        для проверки данных (обработчик POST), не выбирает всю связанную таблицу: значения проверяются
+        одним запросом по ключам в is_valid.
+
+        Args:
+            field_name: имя поля внешнего ключа или связи многие-ко-многим.
+
+        Returns:
+            None
+        """
+        widget = self.fields[field_name]
+        loader = self._options_loaders.pop(field_name, None)
+        widget.partial_options = not self.load_options or loader is not None
+        if loader is not None:
+            widget.options_loader = loader
+            widget.field = None
+
+    def _load_options(self, field_name: str, loader: Callable[[], dict]) -> dict:
+        """
+        Загружает опции поля один раз для формы и ее копий (FormSet).
+
+        Args:
+            field_name: имя поля.
+            loader: функция загрузки опций.
+
+        Returns:
+            dict
+        """
+        if field_name not in self._loaded_options:
+            cached = self.__class__.__dict__.get("_options_cache", {}).get(field_name)
+            if cached is not None and cached[0] > time.monotonic():
+                self._loaded_options[field_name] = cached[1]
+            else:
+                with self._guard("options"):
+                    self._loaded_options[field_name] = loader()
+        return self._loaded_options[field_name]
+
+    @classmethod
+    async def cache_options(cls, session: AsyncSession, ttl: float = 60.0) -> int:
+        """
+        Загружает опции внешних ключей и связей многие-ко-многим в общий кеш класса формы.
+
+        Формы класса, созданные до истечения ttl, берут опции из кеша и не выполняют запросы
+        при выводе полей. Кеш относится только к своему классу и не наследуется.
+
+        Args:
+            session: сессия для загрузки опций.
+            ttl: время жизни кеша в секундах.
+
+        Returns:
+            int: количество загруженных полей.
+        """
+        cls.clear_options_cache()
+        form = cls(session=session)
+        for widget in form.fields.values():
+            if widget.options_loader is not None:
+                widget.options  # noqa: B018 - запускает отложенную загрузку
+        expires_at = time.monotonic() + ttl
+        cls._options_cache = {
+            field_name: (expires_at, options) for field_name, options in form._loaded_options.items()
+        }
+        return len(cls._options_cache)
+
+    @classmethod
+    def clear_options_cache(cls) -> None:
+        """
+        Очищает общий кеш опций класса формы, например после изменения связанных таблиц.
+
+        Returns:
+            None
+        """
+        cls._options_cache = {}
+
+    def _load_relationship_options(self, relationship) -> dict:
+        """
+        Загружает все записи связанной модели связи многие-ко-многим.
+
+        Args:
+            relationship: связь многие-ко-многим.
+
+        Returns:
+            dict: ключ -> объект.
+        """
+        (target_column, _), = relationship.secondary_synchronize_pairs
+        key = relationship.mapper.get_property_by_column(target_column).key
+        with self._span("modelform.options", field=relationship.key):
+            select_objects = asyncio.run(self._get_select_options_data(relationship.mapper.class_))
+        return {str(getattr(obj, key)): obj for obj in select_objects}
+
+    def _bind_column_type(self, column) -> None:
+        """
+        Передает виджету поля тип колонки модели, если виджету нужны его настройки.
+
+        Args:
+            column: колонка модели.
+
+        Returns:
+            None
+        """
+        self._bind_foreign_key(column)
+        widget = self.fields[column.name]
+        if isinstance(column.type, FileField) and isinstance(widget, FileWidget):
+            widget.max_size = column.type.max_size
+            widget.sniff_content = column.type.sniff_content
+        if isinstance(column.type, ImageField):
+            widget.image_field = column.type
 
     async def _get_widget_attrs(
             self,
@@ -568,6 +1587,7 @@ class ModelForm(BaseForm):
             Numeric: IntegerWidget,
             Boolean: CheckboxWidget,
             FileField: FileWidget,
+            ImageField: ImageWidget,
             Date: DateWidget,
             Time: TimeWidget,
             DateTime: DateTimeWidget,
@@ -649,12 +1669,34 @@ class ModelForm(BaseForm):
             return await self._get_option_for_enum_class(column)
         if not column.foreign_keys:
             return options_for_field
+        if self.load_options:
+            # полный список загружается при первом выводе поля (_defer_options)
+            self._options_loaders[column.name] = partial(
+                self._load_options,
+                column.name,
+                partial(self._load_options_for_field_select, column, options_visible_value),
+            )
+        return self._get_current_related_option(column, options_visible_value)
+
+    def _load_options_for_field_select(self, column, options_visible_value: str | None = None) -> dict:
+        """
+        Загружает все записи связанной таблицы внешнего ключа.
+
+        Args:
+            column: колонка внешнего ключа.
+            options_visible_value: отображаемое в списке опций значение.
+
+        Returns:
+            dict: словарь значений
+        """
+        options_for_field = {}
         for i in column.foreign_keys:
-            select_objects = asyncio.run(
-                self._get_select_options_data(
-                    get_class_name_with_table_name(i.column.table.name)
+            with self._span("modelform.options", field=column.name):
+                select_objects = asyncio.run(
+                    self._get_select_options_data(
+                        get_class_name_with_table_name(i.column.table.name)
+                    )
                 )
-            )
             for obj in select_objects:
                 pk_field = obj.__class__.__table__.primary_key.columns.keys()[0]
                 options_for_field[str(obj.__dict__.get(pk_field))] = (
@@ -664,53 +1706,307 @@ class ModelForm(BaseForm):
                 )
         return options_for_field
 
+    def _get_current_related_option(self, column, options_visible_value: str | None = None) -> dict:
+        """
+        Создает опцию текущего значения внешнего ключа из связанной записи, загруженной вместе с объектом.
+
+        Args:
+            column: колонка внешнего ключа.
+            options_visible_value: отображаемое в списке опций значение.
+
+        Returns:
+            dict: пустой словарь, если связанная запись не загружена.
+        """
+        if not self._obj:
+            return {}
+        for relationship in class_mapper(self.model).relationships:
+            if relationship.direction is not MANYTOONE or column not in relationship.local_columns:
+                continue
+            related = self._obj.get(relationship.key)
+            if related is None or not isinstance(related, DeclarativeBase):
+                continue
+            pk_field = related.__class__.__table__.primary_key.columns.keys()[0]
+            return {
+                str(related.__dict__.get(pk_field)): (
+                    related.__dict__.get(options_visible_value, related) if options_visible_value else related
+                )
+            }
+        return {}
+
+    def _get_stream_columns(self, order_by) -> tuple:
+        """
+        Возвращает колонки сортировки для постраничной выборки по ключу.
+
+        Args:
+            order_by: колонка, имя колонки или их последовательность; по умолчанию первичный ключ.
+
+        Returns:
+            tuple
+        """
+        if order_by is None:
+            return tuple(class_mapper(self.model).primary_key)
+        if not isinstance(order_by, (list, tuple)):
+            order_by = (order_by,)
+        return tuple(getattr(self.model, column) if isinstance(column, str) else column for column in order_by)
+
+    async def stream_chunks(
+            self,
+            *filters,
+            order_by=None,
+            after: Any = None,
+            descending: bool = False,
+            limit: Optional[int] = None,
+            offset: Optional[int] = None,
+            chunk_size: int = 1000,
+            options: Sequence = (),
+            as_dict: bool = False,
+    ) -> AsyncIterator[list]:
+        """
+        Выбирает записи модели потоком, порциями по chunk_size.
+
+        Записи сортируются по колонкам order_by. Курсор after - значение (или кортеж значений) этих колонок
+        последней полученной записи: выборка продолжается после нее без OFFSET, поэтому следующая страница
+        большой таблицы выбирается так же быстро, как первая. LIMIT и OFFSET передаются в SQL.
+        Строки читаются через stream_scalars с yield_per, в памяти находится одна порция.
+
+        Пример:
+            async for chunk in form.stream_chunks(Product.active.is_(True), after=last_id, chunk_size=500):
+                ...
+
+        Args:
+            *filters: условия WHERE.
+            order_by: колонка, имя колонки или их последовательность; по умолчанию первичный ключ.
+            after: значение колонок сортировки, после которого начинается выборка.
+            descending: сортировка по убыванию.
+            limit: максимальное количество записей.
+            offset: количество пропускаемых записей.
+            chunk_size: размер порции.
+            options: параметры загрузки, например ModelForm.loader_options().
+            as_dict: возвращать вместо объектов словари полей get_export_fields() со значениями,
+                приведенными методом serialize виджета, как в export (даты и Enum - строки,
+                связи многие-ко-многим - списки ключей); коллекции связей загружаются selectinload.
+
+        Returns:
+            AsyncIterator[list]: порции объектов модели или словарей.
+        """
+        if not self._session:
+            raise AttributeError(f'No database session in class {self.__class__.__name__}')
+        columns = self._get_stream_columns(order_by)
+        statement = select(self.model).where(*filters)
+        if after is not None:
+            key = columns[0] if len(columns) == 1 else tuple_(*columns)
+            cursor = after if len(columns) == 1 else tuple_(*after)
+            statement = statement.where(key < cursor if descending else key > cursor)
+        statement = statement.order_by(*(column.desc() if descending else column for column in columns))
+        if limit is not None:
+            statement = statement.limit(limit)
+        if offset:
+            statement = statement.offset(offset)
+        serializers = None
+        if as_dict:
+            serializers = self._get_record_serializers(self.get_export_fields())
+            options = [*options, *(
+                selectinload(getattr(self.model, name)) for name, _ in serializers if name in self._relationships
+            )]
+        if options:
+            statement = statement.options(*options)
+        with self._span("stream", chunk_size=chunk_size):
+            try:
+                result = await self._session.stream_scalars(
+                    statement.execution_options(yield_per=chunk_size)
+                )
+                async for partition in result.partitions():
+                    if as_dict:
+                        yield [
+                            dict(zip((name for name, _ in serializers), self._serialize_record(obj, serializers)))
+                            for obj in partition
+                        ]
+                    else:
+                        yield partition
+                await result.close()
+            except Exception as e:
+                await self._session.rollback()
+                raise e
+            finally:
+                await self._session.aclose()
+
+    async def stream(self, *filters, **kwargs) -> AsyncIterator[Union[DeclarativeBase, dict]]:
+        """
+        Выбирает записи модели потоком по одной, аргументы такие же, как у stream_chunks.
+
+        Пример:
+            async for product in form.stream(order_by="id", after=cursor, limit=100):
+                ...
+
+        Returns:
+            AsyncIterator: объекты модели или словари полей (as_dict), как в stream_chunks.
+        """
+        async for chunk in self.stream_chunks(*filters, **kwargs):
+            for row in chunk:
+                yield row
+
     async def selected_to_download(
             self, column, value, quantity: int = None
     ) -> Union[Sequence[DeclarativeBase], List]:
         """
-        Перспективная функция. В разработке.
+        Возвращает записи модели со значением value в колонке column.
+
+        Ограничение количества выполняется в SQL. Для выборки больших таблиц используйте stream.
 
         Args:
-            column:
-            value:
-            quantity:
+            column: колонка модели.
+            value: значение колонки, при пустом значении выбираются все записи.
+            quantity: количество записей; отрицательное значение - последние записи.
 
         Returns:
+            list
+        """
+        filters = [column == value] if value else []
+        rows = []
+        async for chunk in self.stream_chunks(
+                *filters,
+                descending=bool(quantity) and quantity < 0,
+                limit=abs(quantity) if quantity else None,
+        ):
+            rows.extend(chunk)
+        if quantity and quantity < 0:
+            rows.reverse()
+        return rows
 
+    def get_export_fields(self) -> List[str]:
         """
-        if value:
-            filter_from_where = column == value
-            result = await self._session.scalars(
-                select(self.model).where(*filter_from_where)
+        Возвращает имена выгружаемых полей формы.
+
+        Поля из exclude, protect и hidden, а также поля паролей не выгружаются.
+
+        Returns:
+            list
+        """
+        mapper = class_mapper(self.model)
+        skipped = set(self.exclude) | set(self.protect) | set(self.hidden)
+        return [
+            name
+            for name, widget in self.fields.items()
+            if name not in skipped
+            and not isinstance(widget, PasswordWidget)
+            and not (name in mapper.columns and isinstance(mapper.columns[name].type, PasswordField))
+        ]
+
+    async def export(
+            self,
+            *filters,
+            export_format: str = "csv",
+            fields: Optional[Sequence[str]] = None,
+            header: bool = True,
+            chunk_size: int = 1000,
+            **stream_kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Выгружает записи модели в CSV или JSON Lines потоком через поля формы.
+
+        Значения приводятся методом serialize виджета поля (даты и время в том же формате,
+        что и в form_dict), заголовки CSV - подписи полей. Записи читаются через stream_chunks,
+        каждая порция возвращается одной строкой, поэтому память не зависит от количества записей.
+
+        Пример:
+            return StreamingResponse(form.export(export_format="jsonl"), media_type="application/x-ndjson")
+
+        Args:
+            *filters: условия WHERE.
+            export_format: "csv" или "jsonl".
+            fields: имена выгружаемых полей, по умолчанию get_export_fields().
+            header: добавить строку заголовков CSV.
+            chunk_size: размер порции.
+            **stream_kwargs: аргументы stream_chunks (order_by, after, limit, offset).
+
+        Returns:
+            AsyncIterator[str]
+        """
+        if export_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported export format: {export_format}")
+        export_fields = self.get_export_fields()
+        if fields is not None:
+            unknown = set(fields) - set(export_fields)
+            if unknown:
+                raise ValueError(f"Fields {sorted(unknown)} cannot be exported from {self.__class__.__name__}")
+            export_fields = list(fields)
+        mapper = class_mapper(self.model)
+        columns = [mapper.columns[name] for name in export_fields if name in mapper.columns]
+        options = [load_only(*(getattr(self.model, mapper.get_property_by_column(column).key) for column in columns))]
+        options.extend(
+            selectinload(getattr(self.model, name)) for name in export_fields if name in self._relationships
+        )
+        serializers = self._get_record_serializers(export_fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv" and header:
+            writer.writerow([self.fields[name].label_name for name in export_fields])
+            yield buffer.getvalue()
+        with self._span("export", format=export_format):
+            async for chunk in self.stream_chunks(
+                    *filters, chunk_size=chunk_size, options=options, **stream_kwargs
+            ):
+                buffer.seek(0)
+                buffer.truncate()
+                for obj in chunk:
+                    record = self._serialize_record(obj, serializers)
+                    if export_format == "csv":
+                        writer.writerow(
+                            ["" if value is None else ",".join(map(str, value)) if isinstance(value, list) else value
+                             for value in record]
+                        )
+                    else:
+                        buffer.write(json.dumps(dict(zip(export_fields, record)), ensure_ascii=False))
+                        buffer.write("\n")
+                yield buffer.getvalue()
+
+    def _get_record_serializers(self, fields: Sequence[str]) -> List[tuple]:
+        """
+        Возвращает функции приведения значений полей записи для выгрузки.
+
+        Args:
+            fields: имена полей формы.
+
+        Returns:
+            list: пары (имя поля, метод serialize виджета).
+        """
+        return [(name, self.fields[name].serialize) for name in fields]
+
+    def _serialize_record(self, obj: DeclarativeBase, serializers: List[tuple]) -> list:
+        """
+        Приводит значения полей объекта модели методами serialize виджетов.
+
+        Args:
+            obj: объект модели.
+            serializers: результат _get_record_serializers.
+
+        Returns:
+            list: значения в порядке serializers, для связей многие-ко-многим - списки ключей.
+        """
+        values = obj.__dict__
+        return [
+            serialize(
+                self._get_loaded_related_keys(self._relationships[name], values)
+                if name in self._relationships
+                else values.get(name)
             )
-        else:
-            result = await self._session.scalars(select(self.model))
-        if quantity:
-            if quantity > 0:
-                return result.all()[:quantity]
-            return result.all()[quantity:]
-        return result.all()
+            for name, serialize in serializers
+        ]
 
     @staticmethod
     async def _get_option_for_enum_class(column) -> dict:
         """
-        Создает словарь опций для виджета select из класса Enum.
+        Возвращает опции виджета select для Enum колонки, вычисленные один раз на Enum.
 
         Args:
-            column:
+            column: колонка модели.
 
         Returns:
-            dict:
+            EnumOptions
         """
-        options_for_field = {}
-        try:
-            for value in column.type.enum_class:
-                options_for_field[value.name] = value.value
-            return options_for_field
-        except Exception:
-            for value in column.type.enums:
-                options_for_field[value] = value
-            return options_for_field
+        if column.type.enum_class is not None:
+            return enum_options(column.type.enum_class)
+        return enum_options(tuple(column.type.enums))
 
     @staticmethod
     async def _get_filefield_extensions(column):
@@ -739,6 +2035,20 @@ class Form(BaseForm):
         self.session = session
         self._obj = obj or None
         self.prefix_form = prefix_form
+        with self._span("form.init"), self._guard("__init__"):
+            self._init_fields(obj, prefix_form)
+
+    def _init_fields(self, obj: Optional[Union[DeclarativeBase, dict]], prefix_form: Optional[str]) -> None:
+        """
+        Копирует объявленные в классе виджеты в поля формы.
+
+        Args:
+            obj: объект с начальными значениями.
+            prefix_form: префикс формы.
+
+        Returns:
+            None
+        """
         for attr_name in vars(self.__class__):
             if attr_name.startswith("__"):
                 continue
@@ -780,45 +2090,22 @@ class Form(BaseForm):
             else:
                 return result
         elif isinstance(model, enum.EnumMeta):
-            objects = list(model)
-            for obj in objects:
-                try:
-                    result[str(obj.name)] = obj.value
-                except Exception:
-                    result[str(obj.name)] = obj
-            return result
+            return enum_options(model)
         else:
             return result
 
-    async def _add_checkbox_value(self, formated_data):
-        """
-        Добавляет в словарь значение False для полей типа checkbox при их отсутствии.
-
-        Args:
-            formated_data: dict
-
-        Returns:
-            dict
-        """
-        for field, widget in self.fields.items():
-            if widget.type is bool:
-                if field not in formated_data:
-                    formated_data[field] = False
-        return formated_data
-
-    async def is_valid(self, form_data):
-        self._obj = {}
-        self.errors = {}
-        cleaned_data = await self._cleaned_form(form_data)
-        for field_name, field_value in cleaned_data.items():
-            if field_name not in self.fields:
-                continue
-            is_valid = self.fields[field_name].default_validator(field_value)
-            if not is_valid:
-                self.errors[field_name] = ', '.join(map(str, self.fields[field_name].list_error))
-                continue
-            self._obj[field_name] = field_value
-        return len(self.errors) == 0
+    async def is_valid(self, form_data, fail_fast: Optional[bool] = None):
+        with self._span("is_valid"), self._guard("is_valid"):
+            self._obj = {}
+            self.errors = {}
+            fail_fast = self.fail_fast if fail_fast is None else fail_fast
+            with self._span("is_valid.clean"):
+                cleaned_data = await self._cleaned_form(form_data)
+            with self._span("is_valid.sync"):
+                self._obj = self._run_sync_validators(cleaned_data, fail_fast)
+            if not (fail_fast and self.errors):
+                await self._run_async_validators(dict(self._obj), fail_fast)
+            return len(self.errors) == 0
 
 
 __all__ = ('ModelForm', 'Form')
\ No newline at end of file
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Type, Union
+
+from markupsafe import Markup
+from sqlalchemy import select
+from sqlalchemy.orm import DeclarativeBase, class_mapper
+
+from miniform.forms import ModelForm, _as_list
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from starlette.datastructures import FormData
+
+
+class FormSet:
+    """
+    Набор форм одной ModelForm, которые выводятся, проверяются и сохраняются вместе.
+
+    Поля и опции внешних ключей строятся один раз в форме-шаблоне, формы строк являются ее копиями
+    с префиксом "{prefix}-{номер}", поэтому имена полей в html: "{prefix}-{номер}_{поле}".
+    Проверки внешних ключей и уникальности выполняются одним запросом на колонку для всех строк,
+    сохранение выполняется в одной транзакции.
+
+    Пример:
+        formset = FormSet(form_class=InvoiceLineForm, session=session, objects=invoice.lines, extra=3)
+        if await formset.is_valid(await request.form()):
+            lines = await formset.save()
+    """
+    form_class: Type[ModelForm] = None
+    prefix: str = "form"
+    extra: int = 1
+    max_num: int = 1000
+
+    def __init__(
+            self,
+            session: Optional[AsyncSession] = None,
+            objects: Optional[Sequence[Union[DeclarativeBase, dict]]] = None,
+            form_class: Optional[Type[ModelForm]] = None,
+            prefix: Optional[str] = None,
+            extra: Optional[int] = None,
+            max_num: Optional[int] = None,
+            **form_kwargs,
+    ):
+        """
+        Конструктор класса.
+
+        Args:
+            session: сессия базы данных.
+            objects: редактируемые объекты, для каждого создается форма.
+            form_class: класс ModelForm строк, по умолчанию атрибут класса.
+            prefix: префикс имен полей.
+            extra: количество пустых форм для новых записей.
+            max_num: максимальное количество форм, строки с большими номерами игнорируются.
+            **form_kwargs: аргументы конструктора ModelForm (replace_exclude, extend_hidden и т. д.).
+        """
+        self.form_class = form_class or self.form_class
+        if self.form_class is None:
+            raise ValueError(f"{self.__class__.__name__} requires form_class")
+        self.prefix = prefix or self.prefix
+        self.extra = self.extra if extra is None else extra
+        self.max_num = self.max_num if max_num is None else max_num
+        self.errors: Dict[int, Dict[str, str]] = {}
+        self.template = self.form_class(session=session, **form_kwargs)
+        with self.template._span("formset.init"):
+            self.forms: List[ModelForm] = [
+                self.template._clone(obj, self.get_form_prefix(index))
+                for index, obj in enumerate(list(objects or [])[:self.max_num])
+            ]
+            for _ in range(min(self.extra, self.max_num - len(self.forms))):
+                self.add_form()
+        self._submitted: List[int] = []
+
+    @property
+    def session(self) -> Optional[AsyncSession]:
+        return self.template.session
+
+    @property
+    def model(self) -> Type[DeclarativeBase]:
+        return self.template.model
+
+    def get_form_prefix(self, index: int) -> str:
+        """
+        Возвращает префикс формы строки.
+
+        Args:
+            index: номер строки.
+
+        Returns:
+            str
+        """
+        return f"{self.prefix}-{index}"
+
+    def add_form(self, obj: Optional[Union[DeclarativeBase, dict]] = None) -> ModelForm:
+        """
+        Добавляет форму строки.
+
+        Args:
+            obj: объект или словарь с начальными значениями.
+
+        Returns:
+            ModelForm
+        """
+        form = self.template._clone(obj, self.get_form_prefix(len(self.forms)))
+        self.forms.append(form)
+        return form
+
+    def __len__(self) -> int:
+        return len(self.forms)
+
+    def __iter__(self):
+        return iter(self.forms)
+
+    def __getitem__(self, index: int) -> ModelForm:
+        return self.forms[index]
+
+    def __html__(self) -> str:
+        """
+        Метод возвращает строку с html кодом всех форм и скрытым полем количества форм.
+
+        Returns:
+            str
+        """
+        with self.template._span("render.html", forms=len(self.forms)):
+            return Markup(
+                f'<input type="hidden" name="{self.prefix}-TOTAL_FORMS" value="{len(self.forms)}" />\n'
+            ) + Markup("").join(Markup(form.__html__()) for form in self.forms)
+
+    def __str__(self) -> str:
+        return str(self.__html__())
+
+    def _parse_form_data(self, form_data: Union[dict, FormData]) -> Dict[int, Dict[str, Any]]:
+        """
+        Разбирает данные всех строк за один проход по ключам вида "{prefix}-{номер}_{поле}".
+
+        Args:
+            form_data: dict или FormData.
+
+        Returns:
+            dict: номер строки -> данные строки без префикса.
+        """
+        items = form_data.multi_items() if hasattr(form_data, "multi_items") else form_data.items()
+        start = f"{self.prefix}-"
+        rows: Dict[int, Dict[str, Any]] = {}
+        for key, value in items:
+            if not key.startswith(start):
+                continue
+            index, separator, field_name = key[len(start):].partition("_")
+            if not separator or not index.isdigit():
+                continue
+            index = int(index)
+            if index >= self.max_num:
+                continue
+            rows.setdefault(index, {})[field_name] = value
+        return rows
+
+    @staticmethod
+    def _is_blank(data: Dict[str, Any]) -> bool:
+        return all(
+            value in (None, "", []) or (getattr(value, "filename", None) == "" and not getattr(value, "size", 0))
+            for value in data.values()
+        )
+
+    async def is_valid(self, form_data: Union[dict, FormData], fail_fast: Optional[bool] = None) -> bool:
+        """
+        Валидирует данные всех строк.
+
+        Пустые строки без привязанного объекта пропускаются. Ошибки строк доступны в self.errors
+        (номер строки -> ошибки формы) и в формах строк.
+
+        Args:
+            form_data: данные формы (dict или FormData).
+            fail_fast: прекратить проверку строки после первой ошибки.
+
+        Returns:
+            bool
+        """
+        template = self.template
+        with template._span("formset.is_valid"), template._guard("formset.is_valid"):
+            self.errors = {}
+            self._submitted = []
+            fail_fast = template.fail_fast if fail_fast is None else fail_fast
+            rows = self._parse_form_data(form_data)
+            while len(self.forms) <= max(rows, default=-1):
+                self.add_form()
+            current_pks: Dict[int, Any] = {}
+            with template._span("is_valid.sync", forms=len(rows)):
+                for index, data in sorted(rows.items()):
+                    form = self.forms[index]
+                    form.errors = {}
+                    form._obj = {}
+                    if not form._initial_data and self._is_blank(data):
+                        continue
+                    cleaned_data = await form._cleaned_form(data)
+                    current_pks[index] = form._get_current_pk(cleaned_data)
+                    form._obj = form._run_sync_validators(cleaned_data, fail_fast)
+                    self._submitted.append(index)
+            await asyncio.gather(
+                *(self.forms[index]._run_async_validators(dict(self.forms[index]._obj), fail_fast)
+                  for index in self._submitted)
+            )
+            with template._span("is_valid.foreign_keys"):
+                await self._run_foreign_key_checks()
+            with template._span("is_valid.unique"):
+                await self._run_unique_checks(current_pks)
+            self.errors = {index: self.forms[index].errors for index in self._submitted if self.forms[index].errors}
+            return not self.errors
+
+    async def _run_foreign_key_checks(self) -> None:
+        """
+        Проверяет существование значений внешних ключей всех строк, один запрос на связанную колонку.
+
+        Returns:
+            None
+        """
+        template = self.template
+        requested: Dict[Any, List[tuple]] = {}
+        for index in self._submitted:
+            form = self.forms[index]
+            for field_name, ref_column in template._foreign_keys.items():
+                value = form._obj.get(field_name)
+                if value in (None, "", []) or form._has_loaded_options(field_name):
+                    continue
+                requested.setdefault(ref_column, []).append((form, field_name, value))
+        for ref_column, entries in requested.items():
+            try:
+                existing = await template._get_existing_keys(
+                    ref_column, [item for _, _, value in entries for item in _as_list(value)]
+                )
+            except Exception as e:
+                for form, field_name, _ in entries:
+                    form._add_field_error(field_name, f"Foreign key check failed: {str(e)}")
+                continue
+            for form, field_name, value in entries:
+                if any(str(item) not in existing for item in _as_list(value)):
+                    form._add_field_error(field_name, f" Invalid value for {field_name}")
+
+    async def _run_unique_checks(self, current_pks: Dict[int, Any]) -> None:
+        """
+        Проверяет уникальность значений строк: повторы внутри набора и один запрос в базу на колонку.
+
+        Args:
+            current_pks: номер строки -> первичный ключ редактируемой записи.
+
+        Returns:
+            None
+        """
+        template = self.template
+        pk_name = template._get_pk_name()
+        for column in class_mapper(self.model).columns:
+            if not column.unique or column.name == pk_name:
+                continue
+            entries = []
+            seen: Dict[str, int] = {}
+            for index in self._submitted:
+                form = self.forms[index]
+                value = form._obj.get(column.name)
+                if value in (None, "") or column.name in form.errors:
+                    continue
+                if str(value) in seen:
+                    form._add_field_error(column.name, "Value must be unique")
+                    continue
+                seen[str(value)] = index
+                if not form._is_unchanged(column.name, value, current_pks.get(index)):
+                    entries.append((index, value))
+            if not entries:
+                continue
+            try:
+                conflicts = await template._get_unique_conflicts(column.name, [value for _, value in entries])
+            except Exception as e:
+                for index, _ in entries:
+                    self.forms[index]._add_field_error(column.name, f"Unique check failed: {str(e)}")
+                continue
+            for index, value in entries:
+                owners = conflicts.get(str(value), set())
+                if owners - {str(current_pks.get(index))}:
+                    self.forms[index]._add_field_error(column.name, "Value must be unique")
+
+    async def save(self) -> List[DeclarativeBase]:
+        """
+        Сохраняет проверенные строки в одной транзакции.
+
+        Существующие записи загружаются одним запросом, после фиксации все записи перечитываются
+        одним запросом.
+
+        Returns:
+            list: сохраненные объекты в порядке строк.
+        """
+        session = self.session
+        if session is None:
+            raise ValueError(
+                f"Saving a model {self.model} objects from a formset is impossible without a session."
+            )
+        template = self.template
+        with template._span("formset.save"), template._guard("formset.save"):
+            mapper = class_mapper(self.model)
+            pk_name = template._get_pk_name()
+            pk_column = mapper.columns[pk_name]
+            forms = [self.forms[index] for index in self._submitted if not self.forms[index].errors]
+            pks = [form._get_current_pk(form._obj) for form in forms]
+            try:
+                existing = {}
+                if any(pk is not None for pk in pks):
+                    result = await session.scalars(
+                        select(self.model).where(pk_column.in_({pk for pk in pks if pk is not None}))
+                    )
+                    existing = {str(getattr(obj, pk_name)): obj for obj in result.all()}
+                instances = []
+                uploaded_images = []
+                associations = []
+                for form, pk in zip(forms, pks):
+                    data = dict(form._obj)
+                    uploaded_images.append(form._get_uploaded_images())
+                    associations.append(form._pop_associations(data))
+                    instance = existing.get(str(pk)) if pk is not None else None
+                    if instance is None:
+                        data.pop(pk_name, None)
+                        instance = self.model(**data)
+                        session.add(instance)
+                    else:
+                        for key, value in data.items():
+                            setattr(instance, key, value)
+                    instances.append(instance)
+                await session.flush()
+                for form, instance, values in zip(forms, instances, associations):
+                    if values:
+                        await form._write_associations(instance, values)
+                saved_pks = [getattr(instance, pk_name) for instance in instances]
+                await session.commit()
+                if instances:
+                    # атрибуты истекли после commit, перечитываем все записи одним запросом
+                    result = await session.scalars(
+                        select(self.model)
+                        .where(pk_column.in_(saved_pks))
+                        .execution_options(populate_existing=True)
+                    )
+                    result.all()
+            except Exception as e:
+                await session.rollback()
+                raise e
+            finally:
+                await session.aclose()
+            for form, instance, images in zip(forms, instances, uploaded_images):
+                await form._process_images(instance, images, session)
+            return instances
+
+
+__all__ = ('FormSet',)
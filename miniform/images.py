@@ -0,0 +1,240 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Optional, Tuple, BinaryIO
+
+_executor: Optional[ProcessPoolExecutor] = None
+_max_workers: Optional[int] = None
+
+FORMAT_EXTENSIONS = {
+    "WEBP": ".webp",
+    "JPEG": ".jpg",
+    "PNG": ".png",
+    "AVIF": ".avif",
+}
+
+
+def set_image_workers(max_workers: Optional[int]) -> None:
+    """
+    Задает количество процессов для обработки изображений. Действующий пул процессов закрывается.
+
+    Args:
+        max_workers: количество процессов, None - по количеству ядер.
+
+    Returns:
+        None
+    """
+    global _max_workers
+    _max_workers = max_workers
+    shutdown_image_executor()
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    """
+    Возвращает пул процессов для обработки изображений, создавая его при первом обращении.
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=_max_workers)
+    return _executor
+
+
+def shutdown_image_executor() -> None:
+    """
+    Закрывает пул процессов обработки изображений.
+
+    Returns:
+        None
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def get_image_size(file: BinaryIO) -> Tuple[int, int]:
+    """
+    Возвращает размеры изображения, читая только заголовок файла.
+
+    Args:
+        file: файловый объект изображения.
+
+    Returns:
+        tuple: ширина и высота.
+
+    Raises:
+        ValueError: если файл не является изображением.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    position = file.tell()
+    try:
+        with Image.open(file) as image:
+            return image.size
+    except UnidentifiedImageError as e:
+        raise ValueError("File is not a valid image") from e
+    finally:
+        file.seek(position)
+
+
+@lru_cache(maxsize=1024)
+def _read_image_size(path: str, mtime_ns: int, file_size: int) -> Tuple[int, int]:
+    with open(path, "rb") as file:
+        return get_image_size(file)
+
+
+def read_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Возвращает размеры изображения на диске. Результат кешируется по времени изменения и размеру файла.
+
+    Args:
+        path: путь изображения.
+
+    Returns:
+        tuple | None: ширина и высота, None если файла нет или он не является изображением.
+    """
+    try:
+        stat = os.stat(path)
+        return _read_image_size(path, stat.st_mtime_ns, stat.st_size)
+    except (OSError, ValueError):
+        return None
+
+
+def get_derivative_path(path: str, name: str, image_format: str) -> str:
+    """
+    Возвращает путь производного изображения.
+
+    Args:
+        path: путь исходного изображения.
+        name: имя производного размера.
+        image_format: формат производного изображения.
+
+    Returns:
+        str: например "media/photo.thumb.webp" для "media/photo.jpg".
+    """
+    base, extension = os.path.splitext(path)
+    return f"{base}.{name}{FORMAT_EXTENSIONS.get(image_format.upper(), extension)}"
+
+
+def strip_metadata(path: str, output_path: str) -> bool:
+    """
+    Записывает копию изображения без EXIF, исходный файл не изменяется.
+
+    Перекодирование теряет качество, поэтому вызывается только при ImageField(strip_exif=True).
+    Функция выполняется в отдельном процессе, поэтому принимает и возвращает только простые типы.
+
+    Args:
+        path: путь исходного изображения.
+        output_path: путь копии без EXIF.
+
+    Returns:
+        bool: False, если копия не записана (GIF не содержит EXIF).
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as original:
+        source_format = original.format
+        if source_format == "GIF":
+            return False
+        # при сохранении без параметра exif метаданные не переносятся
+        image = ImageOps.exif_transpose(original)
+        image.info.pop("exif", None)
+        if source_format == "JPEG":
+            image.save(output_path, format=source_format, quality=95)
+        else:
+            image.save(output_path, format=source_format)
+    return True
+
+
+def process_image(
+        path: str,
+        derivatives: Dict[str, Tuple[int, int]],
+        image_format: str = "WEBP",
+        quality: int = 80,
+) -> Dict[str, str]:
+    """
+    Создает производные изображения, исходный файл не изменяется.
+
+    Функция выполняется в отдельном процессе, поэтому принимает и возвращает только простые типы.
+
+    Args:
+        path: путь исходного изображения.
+        derivatives: словарь имя размера -> (максимальная ширина, максимальная высота).
+        image_format: формат производных изображений.
+        quality: качество сжатия производных изображений.
+
+    Returns:
+        dict: имя размера -> путь производного изображения.
+    """
+    from PIL import Image, ImageOps
+
+    result = {}
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        for name, size in derivatives.items():
+            derivative = image.copy()
+            derivative.thumbnail(size)
+            if image_format.upper() == "JPEG" and derivative.mode not in ("RGB", "L"):
+                derivative = derivative.convert("RGB")
+            derivative_path = get_derivative_path(path, name, image_format)
+            derivative.save(derivative_path, format=image_format.upper(), quality=quality)
+            result[name] = derivative_path
+    return result
+
+
+async def run_image_pipeline(
+        path: str,
+        derivatives: Dict[str, Tuple[int, int]],
+        image_format: str = "WEBP",
+        quality: int = 80,
+) -> Dict[str, str]:
+    """
+    Выполняет process_image в пуле процессов, не блокируя цикл событий.
+
+    Args:
+        path: путь исходного изображения.
+        derivatives: словарь имя размера -> (максимальная ширина, максимальная высота).
+        image_format: формат производных изображений.
+        quality: качество сжатия производных изображений.
+
+    Returns:
+        dict: имя размера -> путь производного изображения.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_image_executor(),
+        partial(process_image, path, derivatives, image_format, quality),
+    )
+
+
+async def run_strip_metadata(path: str, output_path: str) -> bool:
+    """
+    Выполняет strip_metadata в пуле процессов, не блокируя цикл событий.
+
+    Args:
+        path: путь исходного изображения.
+        output_path: путь копии без EXIF.
+
+    Returns:
+        bool: False, если копия не записана.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_executor(), partial(strip_metadata, path, output_path))
+
+
+__all__ = (
+    'set_image_workers',
+    'get_image_executor',
+    'shutdown_image_executor',
+    'get_image_size',
+    'read_image_size',
+    'get_derivative_path',
+    'strip_metadata',
+    'process_image',
+    'run_image_pipeline',
+    'run_strip_metadata',
+)
@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+    Union,
+)
+
+from sqlalchemy import insert
+from sqlalchemy.orm import class_mapper
+
+from miniform.forms import ModelForm, _as_list
+from miniform.schema import ValidationPlan, validate_rows
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+Source = Union[str, "os.PathLike[str]", TextIO, Iterable[dict], AsyncIterable[dict]]
+
+
+class ImportReport:
+    """
+    Итоги импорта.
+
+    Attributes:
+        rows: количество прочитанных строк.
+        inserted: количество сохраненных строк.
+        failed: количество строк с ошибками.
+        elapsed: время импорта в секундах.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(rows={self.rows}, inserted={self.inserted}, "
+            f"failed={self.failed}, rows_per_second={self.rows_per_second:.0f})"
+        )
+
+
+def _iter_csv(file: TextIO) -> Iterator[dict]:
+    return iter(csv.DictReader(file))
+
+
+def _iter_jsonl(file: TextIO) -> Iterator[dict]:
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class ModelImporter:
+    """
+    Импорт строк CSV или JSON Lines в модель через очистку и проверки ModelForm порциями.
+
+    Строки читаются по мере обработки. Для каждой порции строки очищаются и проверяются синхронными
+    и асинхронными валидаторами формы, внешние ключи и уникальность проверяются одним запросом
+    на колонку для всей порции, корректные строки сохраняются одной вставкой. Если вставка порции
+    нарушает ограничение базы данных, строки порции сохраняются по одной и ошибочные попадают в отчет.
+    Ошибки записываются в отчет JSON Lines по мере обработки: {"row": номер, "errors": {...}, "data": {...}}.
+
+    Если задан processes или executor, очистка и синхронные проверки порций выполняются в пуле процессов
+    по ValidationPlan формы, проверки базы данных и асинхронные валидаторы - в основном процессе.
+    Пользовательские валидаторы полей в этом случае должны быть функциями уровня модуля.
+
+    Поля связей многие-ко-многим при импорте не сохраняются.
+
+    Пример:
+        importer = ModelImporter(ProductForm, session_maker, chunk_size=2000, concurrency=4)
+        report = await importer.run("products.csv", error_report="errors.jsonl")
+    """
+
+    def __init__(
+            self,
+            form_class: Type[ModelForm],
+            session_factory: Callable[[], AsyncSession],
+            chunk_size: int = 1000,
+            concurrency: int = 1,
+            fail_fast: Optional[bool] = None,
+            processes: int = 0,
+            executor: Optional[Executor] = None,
+            **form_kwargs,
+    ):
+        """
+        Конструктор класса.
+
+        Args:
+            form_class: класс ModelForm модели.
+            session_factory: фабрика сессий, каждая параллельная порция использует свою сессию.
+            chunk_size: количество строк в порции.
+            concurrency: количество порций, одновременно проверяемых в базе данных и сохраняемых.
+            fail_fast: прекращать проверку строки после первой ошибки, по умолчанию атрибут формы.
+            processes: количество процессов пула для проверки порций, 0 - проверка в текущем процессе.
+            executor: готовый пул (например, общий ProcessPoolExecutor), используется вместо создания пула;
+                processes задает количество порций, одновременно проверяемых в нем (по умолчанию число ядер).
+            **form_kwargs: аргументы конструктора формы, по умолчанию load_options=False.
+        """
+        if chunk_size < 1 or concurrency < 1 or processes < 0:
+            raise ValueError("chunk_size and concurrency must be positive")
+        self.form_class = form_class
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.fail_fast = form_class.fail_fast if fail_fast is None else fail_fast
+        self.processes = processes or (os.cpu_count() or 1 if executor is not None else 0)
+        self.executor = executor
+        form_kwargs.setdefault("load_options", False)
+        self.form_kwargs = form_kwargs
+        self._required_columns: Optional[List[str]] = None
+
+    async def run(
+            self,
+            source: Source,
+            import_format: Optional[str] = None,
+            error_report: Union[str, "os.PathLike[str]", TextIO, None] = None,
+    ) -> ImportReport:
+        """
+        Импортирует строки источника.
+
+        Args:
+            source: путь к файлу, текстовый файл, итерируемый или асинхронный итерируемый объект словарей.
+            import_format: "csv" или "jsonl" для файлов; по умолчанию по расширению файла.
+            error_report: путь или текстовый файл для отчета об ошибках.
+
+        Returns:
+            ImportReport
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        source_file = report_file = None
+        try:
+            if isinstance(source, (str, os.PathLike)):
+                if import_format is None:
+                    import_format = "jsonl" if str(source).endswith((".jsonl", ".ndjson")) else "csv"
+                source = source_file = open(source, newline="", encoding="utf-8")
+            if isinstance(error_report, (str, os.PathLike)):
+                error_report = report_file = open(error_report, "w", encoding="utf-8")
+            rows = self._iter_source(source, import_format)
+            await self._run(rows, report, error_report)
+        finally:
+            if source_file is not None:
+                source_file.close()
+            if report_file is not None:
+                report_file.close()
+            report.elapsed = time.perf_counter() - started
+        return report
+
+    @staticmethod
+    def _iter_source(source: Source, import_format: Optional[str]) -> Union[Iterator[dict], AsyncIterable[dict]]:
+        if hasattr(source, "__aiter__"):
+            return source
+        if hasattr(source, "read"):
+            if import_format not in (None, "csv", "jsonl"):
+                raise ValueError(f"Unsupported import format: {import_format}")
+            return _iter_jsonl(source) if import_format == "jsonl" else _iter_csv(source)
+        return iter(source)
+
+    async def _read_chunks(
+            self, rows: Union[Iterator[dict], AsyncIterable[dict]]
+    ) -> AsyncIterator[Tuple[int, List[dict]]]:
+        start = 1
+        if hasattr(rows, "__aiter__"):
+            chunk = []
+            async for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    yield start, chunk
+                    start += len(chunk)
+                    chunk = []
+            if chunk:
+                yield start, chunk
+            return
+        while True:
+            # чтение файла выполняется в потоке, чтобы не блокировать цикл событий
+            chunk = await asyncio.to_thread(lambda: list(islice(rows, self.chunk_size)))
+            if not chunk:
+                return
+            yield start, chunk
+            start += len(chunk)
+
+    async def _run(
+            self,
+            rows: Union[Iterator[dict], AsyncIterable[dict]],
+            report: ImportReport,
+            error_report: Optional[TextIO],
+    ) -> None:
+        forms: asyncio.Queue = asyncio.Queue()
+        template = None
+        for _ in range(self.concurrency):
+            template = self.form_class(session=self.session_factory(), **self.form_kwargs)
+            forms.put_nowait(template)
+        executor = owned_executor = None
+        plan = None
+        if self.executor is not None or self.processes:
+            plan = ValidationPlan.from_form(template, self.fail_fast)
+            plan.check_picklable()
+            executor = self.executor or ProcessPoolExecutor(self.processes)
+            owned_executor = None if self.executor is not None else executor
+
+        async def worker(start: int, chunk: List[dict]):
+            results = None
+            if executor is not None:
+                # порции проверяются в пуле параллельно, пока предыдущие сохраняются
+                results = await asyncio.get_running_loop().run_in_executor(executor, validate_rows, plan, chunk)
+            form = await forms.get()
+            try:
+                return await self._process_chunk(form, start, chunk, results)
+            finally:
+                forms.put_nowait(form)
+
+        def collect(task: asyncio.Task) -> None:
+            inserted, errors = task.result()
+            report.inserted += inserted
+            report.failed += len(errors)
+            if error_report is not None:
+                for number, row_errors, data in errors:
+                    error_report.write(
+                        json.dumps({"row": number, "errors": row_errors, "data": data}, ensure_ascii=False, default=str)
+                    )
+                    error_report.write("\n")
+
+        pending = set()
+        try:
+            async for start, chunk in self._read_chunks(rows):
+                report.rows += len(chunk)
+                if len(pending) >= self.concurrency + self.processes:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        collect(task)
+                pending.add(asyncio.create_task(worker(start, chunk)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    collect(task)
+        finally:
+            for task in pending:
+                task.cancel()
+            if owned_executor is not None:
+                owned_executor.shutdown(cancel_futures=True)
+
+    async def _process_chunk(
+            self,
+            form: ModelForm,
+            start: int,
+            chunk: List[dict],
+            results: Optional[List[Tuple[dict, Dict[str, str]]]] = None,
+    ) -> Tuple[int, list]:
+        """
+        Проверяет и сохраняет порцию строк.
+
+        Args:
+            form: форма, закрепленная за обработчиком.
+            start: номер первой строки порции.
+            chunk: строки порции.
+            results: результаты синхронных проверок строк из пула процессов, None - проверка в текущем процессе.
+
+        Returns:
+            tuple: количество сохраненных строк и список ошибок (номер строки, ошибки, данные).
+        """
+        with form._span("import.chunk", rows=len(chunk)):
+            errors: List[tuple] = []
+            valid: List[list] = []
+            with form._span("import.validate"):
+                if results is None:
+                    results = self._validate_rows(form, chunk)
+                for number, row, (data, row_errors) in zip(range(start, start + len(chunk)), chunk, results):
+                    form.errors = row_errors
+                    form._obj = data
+                    if not (self.fail_fast and form.errors):
+                        for name in data:
+                            if form.fields[name].async_validator is not None:
+                                form.fields[name].list_error = []
+                        await form._run_async_validators(dict(data), self.fail_fast)
+                    if form.errors:
+                        errors.append((number, dict(form.errors), row))
+                        continue
+                    data = form._obj
+                    form._pop_associations(data)
+                    valid.append([number, data, row, {}])
+            self._check_required(form, valid)
+            with form._span("import.foreign_keys"):
+                await self._check_foreign_keys(form, valid)
+            with form._span("import.unique"):
+                await self._check_unique(form, valid)
+            accepted = []
+            for number, data, row, row_errors in valid:
+                if row_errors:
+                    errors.append((number, row_errors, row))
+                else:
+                    accepted.append((number, data, row))
+            with form._span("import.insert", rows=len(accepted)):
+                inserted, insert_errors = await self._insert(form, accepted)
+            errors.extend(insert_errors)
+            errors.sort(key=lambda error: error[0])
+            return inserted, errors
+
+    def _validate_rows(self, form: ModelForm, chunk: List[dict]) -> List[Tuple[dict, Dict[str, str]]]:
+        """
+        Очищает и проверяет строки синхронными валидаторами формы в текущем процессе.
+
+        Args:
+            form: форма порции.
+            chunk: строки порции.
+
+        Returns:
+            list: для каждой строки кортеж (данные полей, прошедших проверку; ошибки полей).
+        """
+        results = []
+        for row in chunk:
+            form.errors = {}
+            results.append((form._run_sync_validators(form._clean_data(row), self.fail_fast), form.errors))
+        return results
+
+    @staticmethod
+    def _add_error(row_errors: Dict[str, str], field_name: str, message: str) -> None:
+        row_errors[field_name] = f"{row_errors[field_name]}, {message}" if field_name in row_errors else message
+
+    def _check_required(self, form: ModelForm, valid: List[list]) -> None:
+        """
+        Отмечает строки без значений колонок NOT NULL, у которых нет значения по умолчанию.
+
+        Args:
+            form: форма порции.
+            valid: строки, прошедшие проверки формы.
+
+        Returns:
+            None
+        """
+        if self._required_columns is None:
+            self._required_columns = [
+                column.name
+                for column in class_mapper(form.model).columns
+                if not column.nullable
+                and not column.primary_key
+                and column.default is None
+                and column.server_default is None
+                and column.name in form.fields
+            ]
+        for entry in valid:
+            for name in self._required_columns:
+                if entry[1].get(name) in (None, ""):
+                    self._add_error(entry[3], name, " Field cannot be empty")
+
+    async def _check_foreign_keys(self, form: ModelForm, valid: List[list]) -> None:
+        requested: Dict[Any, List[tuple]] = {}
+        for entry in valid:
+            data = entry[1]
+            for field_name, ref_column in form._foreign_keys.items():
+                value = data.get(field_name)
+                if value in (None, "", []) or form._has_loaded_options(field_name):
+                    continue
+                requested.setdefault(ref_column, []).append((entry, field_name, value))
+        for ref_column, entries in requested.items():
+            try:
+                existing = await form._get_existing_keys(
+                    ref_column, [item for _, _, value in entries for item in _as_list(value)]
+                )
+            except Exception as e:
+                for entry, field_name, _ in entries:
+                    self._add_error(entry[3], field_name, f"Foreign key check failed: {str(e)}")
+                continue
+            for entry, field_name, value in entries:
+                if any(str(item) not in existing for item in _as_list(value)):
+                    self._add_error(entry[3], field_name, f" Invalid value for {field_name}")
+
+    async def _check_unique(self, form: ModelForm, valid: List[list]) -> None:
+        for column in class_mapper(form.model).columns:
+            if not (column.unique or column.primary_key):
+                continue
+            entries = []
+            seen = set()
+            for entry in valid:
+                value = entry[1].get(column.name)
+                if value in (None, "") or column.name in entry[3]:
+                    continue
+                if str(value) in seen:
+                    self._add_error(entry[3], column.name, "Value must be unique")
+                    continue
+                seen.add(str(value))
+                entries.append((entry, value))
+            if not entries:
+                continue
+            try:
+                conflicts = await form._get_unique_conflicts(column.name, [value for _, value in entries])
+            except Exception as e:
+                for entry, _ in entries:
+                    self._add_error(entry[3], column.name, f"Unique check failed: {str(e)}")
+                continue
+            for entry, value in entries:
+                if str(value) in conflicts:
+                    self._add_error(entry[3], column.name, "Value must be unique")
+
+    async def _insert(self, form: ModelForm, accepted: List[tuple]) -> Tuple[int, list]:
+        """
+        Сохраняет строки одной вставкой и фиксирует транзакцию порции.
+
+        Args:
+            form: форма с сессией.
+            accepted: проверенные строки (номер строки, данные, исходные данные).
+
+        Returns:
+            tuple: количество сохраненных строк и список ошибок.
+        """
+        if not accepted:
+            return 0, []
+        session = form.session
+        errors: List[tuple] = []
+        try:
+            inserted = await self._insert_batch(session, insert(form.model), accepted, errors)
+            await session.commit()
+            return inserted, errors
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.aclose()
+
+    async def _insert_batch(self, session: AsyncSession, statement, batch: List[tuple], errors: List[tuple]) -> int:
+        """
+        Вставляет строки в точке сохранения, при нарушении ограничения делит их пополам.
+
+        Ограничение может нарушить строка, добавленная параллельной порцией или другим процессом,
+        поэтому ошибочные строки находятся за O(k log n) вставок вместо вставки по одной строке.
+
+        Args:
+            session: сессия порции.
+            statement: insert модели.
+            batch: строки (номер строки, данные, исходные данные).
+            errors: список, в который добавляются ошибки строк.
+
+        Returns:
+            int: количество вставленных строк.
+        """
+        try:
+            async with session.begin_nested():
+                await session.execute(statement, [data for _, data, _ in batch])
+            return len(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                number, _, row = batch[0]
+                errors.append((number, {"__all__": str(getattr(e, "orig", e))}, row))
+                return 0
+        middle = len(batch) // 2
+        return (
+                await self._insert_batch(session, statement, batch[:middle], errors)
+                + await self._insert_batch(session, statement, batch[middle:], errors)
+        )
+
+
+async def import_rows(
+        form_class: Type[ModelForm],
+        session_factory: Callable[[], AsyncSession],
+        source: Source,
+        import_format: Optional[str] = None,
+        error_report: Union[str, "os.PathLike[str]", TextIO, None] = None,
+        **kwargs,
+) -> ImportReport:
+    """
+    Импортирует строки источника через ModelImporter.
+
+    Args:
+        form_class: класс ModelForm модели.
+        session_factory: фабрика сессий.
+        source: путь к файлу, текстовый файл, итерируемый или асинхронный итерируемый объект словарей.
+        import_format: "csv" или "jsonl".
+        error_report: путь или текстовый файл для отчета об ошибках.
+        **kwargs: аргументы ModelImporter (chunk_size, concurrency, processes, аргументы формы).
+
+    Returns:
+        ImportReport
+    """
+    return await ModelImporter(form_class, session_factory, **kwargs).run(source, import_format, error_report)
+
+
+__all__ = (
+    'ImportReport',
+    'ModelImporter',
+    'import_rows',
+)
@@ -0,0 +1,468 @@
+import time
+import warnings
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Any, Tuple, Union, Callable
+
+from sqlalchemy import event
+
+
+class _NullSpan:
+    """
+    Пустой участок замера, используется при выключенном инструментировании.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """
+    Интерфейс инструментирования форм.
+
+    Реализация по умолчанию ничего не делает: span возвращает общий пустой объект,
+    поэтому выключенное инструментирование почти не влияет на скорость работы форм.
+    """
+    enabled = False
+
+    def span(self, name: str, session=None, **attributes):
+        """
+        Возвращает контекстный менеджер замера участка кода.
+
+        Args:
+            name: имя участка (фазы), например "modelform.init".
+            session: сессия, запросы которой нужно посчитать.
+            **attributes: дополнительные атрибуты участка.
+
+        Returns:
+            контекстный менеджер
+        """
+        return _NULL_SPAN
+
+    def count(self, name: str, value: int = 1, **attributes) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            name: имя счетчика.
+            value: значение приращения.
+            **attributes: атрибуты (метки) счетчика.
+
+        Returns:
+            None
+        """
+
+
+def get_engine(session):
+    """
+    Возвращает синхронный движок сессии для подписки на события выполнения запросов.
+
+    Args:
+        session: AsyncSession или Session
+
+    Returns:
+        Engine | None
+    """
+    sync_session = getattr(session, "sync_session", session)
+    try:
+        return sync_session.get_bind()
+    except Exception:
+        return None
+
+
+class StatementCounter:
+    """
+    Контекстный менеджер, считающий SQL запросы движка сессии через событие before_cursor_execute.
+
+    Считаются все запросы движка за время работы менеджера, поэтому при одновременных запросах
+    других сессий к тому же движку результат будет завышен.
+    """
+
+    def __init__(self, session):
+        self.engine = get_engine(session)
+        self.count = 0
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        if self.engine is not None:
+            event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.engine is not None:
+            event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("miniform_current_span", default=None)
+
+
+class Span:
+    """
+    Замер участка кода в стиле OpenTelemetry.
+    """
+
+    def __init__(self, instrumentation: "RecordingInstrumentation", name: str, session=None, **attributes):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[Span] = None
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.status = "ok"
+        self._counter = StatementCounter(session) if session is not None else None
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        if self._counter is not None:
+            self._counter.__enter__()
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end_time = time.perf_counter()
+        if self._counter is not None:
+            self._counter.__exit__(exc_type, exc_value, traceback)
+            self.attributes["db.statements"] = self._counter.count
+        if exc_type is not None:
+            self.status = "error"
+            self.attributes["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        self.instrumentation.exporter.export(self)
+        return False
+
+    def to_dict(self) -> dict:
+        """
+        Возвращает участок в виде словаря.
+
+        Returns:
+            dict
+        """
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "status": self.status,
+            "attributes": dict(self.attributes),
+        }
+
+
+class InMemoryExporter:
+    """
+    Локальный экспортер: хранит завершенные участки и агрегирует метрики в памяти процесса.
+    """
+
+    def __init__(self, max_spans: int = 10000):
+        self.max_spans = max_spans
+        self.spans: List[dict] = []
+        self.durations: Dict[Tuple[str, str], List[float]] = {}
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+
+    def export(self, span: Span) -> None:
+        """
+        Принимает завершенный участок.
+
+        Args:
+            span: Span
+
+        Returns:
+            None
+        """
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span.to_dict())
+        form = str(span.attributes.get("form", ""))
+        key = (span.name, form)
+        duration = self.durations.setdefault(key, [0, 0.0])
+        duration[0] += 1
+        duration[1] += span.duration
+        if "db.statements" in span.attributes:
+            self.add("miniform_sql_statements_total", span.attributes["db.statements"], phase=span.name, form=form)
+
+    def add(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            name: имя метрики.
+            value: значение приращения.
+            **labels: метки.
+
+        Returns:
+            None
+        """
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def clear(self) -> None:
+        self.spans.clear()
+        self.durations.clear()
+        self.counters.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+
+        Returns:
+            str
+        """
+        lines = [
+            "# HELP miniform_phase_duration_seconds Duration of form phases.",
+            "# TYPE miniform_phase_duration_seconds summary",
+        ]
+        for (phase, form), (count, total) in sorted(self.durations.items()):
+            labels = f'phase="{phase}",form="{form}"'
+            lines.append(f"miniform_phase_duration_seconds_count{{{labels}}} {count}")
+            lines.append(f"miniform_phase_duration_seconds_sum{{{labels}}} {total}")
+        types = {}
+        for name, labels in sorted(self.counters):
+            if name not in types:
+                types[name] = True
+                lines.append(f"# TYPE {name} counter")
+            label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+            lines.append(f"{name}{{{label_text}}} {self.counters[(name, labels)]}")
+        return "\n".join(lines) + "\n"
+
+
+class RecordingInstrumentation(Instrumentation):
+    """
+    Инструментирование с записью участков и метрик в локальный экспортер.
+
+    Пример:
+        instrumentation = RecordingInstrumentation()
+        set_instrumentation(instrumentation)
+        ...
+        instrumentation.exporter.spans
+        instrumentation.exporter.to_prometheus()
+    """
+    enabled = True
+
+    def __init__(self, exporter: Optional[InMemoryExporter] = None):
+        self.exporter = exporter or InMemoryExporter()
+
+    def span(self, name: str, session=None, **attributes) -> Span:
+        return Span(self, name, session, **attributes)
+
+    def count(self, name: str, value: int = 1, **attributes) -> None:
+        self.exporter.add(name, value, **attributes)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Исключение при превышении допустимого количества SQL запросов.
+    """
+
+
+_current_guard: ContextVar[Optional["QueryGuard"]] = ContextVar("miniform_query_guard", default=None)
+
+
+class QueryGuard:
+    """
+    Счетчик SQL запросов публичных методов формы с проверкой бюджета.
+
+    Бюджет задается словарем: ключ - имя метода ("__init__", "is_valid", "save_form", "update_field",
+    "render" - вывод формы через __html__ и form_dict, "options" - отложенная загрузка опций одного поля)
+    или имя с классом формы ("ProductForm.__init__"), значение - число или функция, принимающая форму
+    и возвращающая число. Опции внешних ключей загружаются при первом выводе поля, поэтому их запросы
+    учитываются в "render" и в "options", а не в "__init__".
+
+    Подключается к форме атрибутом query_guard или действует на все формы внутри блока with:
+        with QueryGuard({"__init__": 0, "render": QueryGuard.per_foreign_key(1)}) as guard:
+            form = ProductForm(session=session)
+            form.__html__()
+        guard.report  # {"ProductForm.__init__": [0], "ProductForm.options": [1], "ProductForm.render": [1]}
+    """
+
+    def __init__(
+            self,
+            budgets: Optional[Dict[str, Union[int, Callable[[Any], int]]]] = None,
+            raise_on_exceed: bool = True,
+    ):
+        """
+        Конструктор класса.
+
+        Args:
+            budgets: допустимое количество запросов по методам.
+            raise_on_exceed: выбрасывать QueryBudgetExceeded, иначе выдавать предупреждение.
+        """
+        self.budgets = budgets or {}
+        self.raise_on_exceed = raise_on_exceed
+        self.report: Dict[str, List[int]] = {}
+        self._token = None
+
+    @staticmethod
+    def per_foreign_key(queries: int = 1) -> Callable[[Any], int]:
+        """
+        Бюджет, пропорциональный количеству внешних ключей формы, включая связи многие-ко-многим.
+
+        Args:
+            queries: допустимое количество запросов на один внешний ключ.
+
+        Returns:
+            Callable
+        """
+        return lambda form: queries * len(getattr(form, "_foreign_keys", {}))
+
+    def get_budget(self, form, method: str) -> Optional[int]:
+        """
+        Возвращает бюджет метода формы.
+
+        Args:
+            form: форма.
+            method: имя метода.
+
+        Returns:
+            int | None
+        """
+        budget = self.budgets.get(f"{form.__class__.__name__}.{method}", self.budgets.get(method))
+        if callable(budget):
+            return budget(form)
+        return budget
+
+    def track(self, form, method: str, session=None) -> "_GuardedCall":
+        """
+        Возвращает контекстный менеджер подсчета запросов вызова метода.
+
+        Args:
+            form: форма.
+            method: имя метода.
+            session: сессия формы.
+
+        Returns:
+            контекстный менеджер
+        """
+        return _GuardedCall(self, form, method, session)
+
+    def record(self, form, method: str, counter: StatementCounter) -> None:
+        """
+        Сохраняет количество запросов вызова и проверяет бюджет.
+
+        Args:
+            form: форма.
+            method: имя метода.
+            counter: счетчик запросов вызова.
+
+        Returns:
+            None
+        """
+        key = f"{form.__class__.__name__}.{method}"
+        self.report.setdefault(key, []).append(counter.count)
+        budget = self.get_budget(form, method)
+        if budget is None or counter.count <= budget:
+            return
+        message = (
+            f"{key} issued {counter.count} SQL statements, budget is {budget}:\n"
+            + "\n".join(counter.statements)
+        )
+        if self.raise_on_exceed:
+            raise QueryBudgetExceeded(message)
+        warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+    def __enter__(self):
+        self._token = _current_guard.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_guard.reset(self._token)
+        return False
+
+
+class _GuardedCall:
+    """
+    Подсчет запросов одного вызова метода формы.
+    """
+
+    def __init__(self, guard: QueryGuard, form, method: str, session):
+        self.guard = guard
+        self.form = form
+        self.method = method
+        self.counter = StatementCounter(session) if session is not None else None
+
+    def __enter__(self):
+        if self.counter is not None:
+            self.counter.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.counter is None:
+            return False
+        self.counter.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.guard.record(self.form, self.method, self.counter)
+        return False
+
+
+def get_query_guard() -> Optional[QueryGuard]:
+    """
+    Возвращает QueryGuard, действующий в текущем контексте.
+
+    Returns:
+        QueryGuard | None
+    """
+    return _current_guard.get()
+
+
+_instrumentation: Instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """
+    Возвращает глобальное инструментирование.
+
+    Returns:
+        Instrumentation
+    """
+    return _instrumentation
+
+
+def set_instrumentation(instrumentation: Optional[Instrumentation]) -> None:
+    """
+    Устанавливает глобальное инструментирование. None возвращает пустую реализацию.
+
+    Args:
+        instrumentation: Instrumentation | None
+
+    Returns:
+        None
+    """
+    global _instrumentation
+    _instrumentation = instrumentation or Instrumentation()
+
+
+__all__ = (
+    'Instrumentation',
+    'RecordingInstrumentation',
+    'InMemoryExporter',
+    'Span',
+    'StatementCounter',
+    'QueryGuard',
+    'QueryBudgetExceeded',
+    'get_instrumentation',
+    'set_instrumentation',
+    'get_query_guard',
+)
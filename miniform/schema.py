@@ -0,0 +1,746 @@
+"""
+Описания форм без сессии и объектов модели: план проверки для пула процессов
+и скомпилированные схемы полей ModelForm.
+
+Схемы генерируются при сборке и загружаются воркерами при старте:
+    python -m miniform.schema myapp.forms -o forms.schema.json
+
+    # при запуске приложения (до fork мастера gunicorn с preload_app схемы общие для воркеров)
+    miniform.schema.load_schema("forms.schema.json")
+
+Без файла схем те же структуры строит при старте prewarm().
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+import uuid
+import warnings
+from collections import OrderedDict
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+from sqlalchemy import Enum
+from sqlalchemy.orm import class_mapper
+
+from miniform.forms import BaseForm, Form, ModelForm
+from miniform.widgets import AbstractWidget
+
+# атрибуты виджета, которые форма задает после создания и которые нужны проверкам
+_WIDGET_STATE = ("partial_options", "max_size", "sniff_content")
+
+# формы, построенные по плану в текущем процессе: (ключ плана, поток) -> форма, последние _PLAN_FORMS_SIZE
+_PLAN_FORMS: "OrderedDict[Tuple[str, int], BaseForm]" = OrderedDict()
+_PLAN_FORMS_SIZE = 32
+_PLAN_FORMS_LOCK = threading.Lock()
+
+# списки полей формы, от которых зависят виджеты схемы
+_SCHEMA_FLAGS = ("disabled", "protect", "hidden", "readonly")
+
+SCHEMA_VERSION = 1
+
+
+def _primitive(value: Any) -> Any:
+    return value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+
+
+def _import_path(obj: Any) -> str:
+    """
+    Возвращает путь импорта класса или функции в виде "модуль:имя".
+
+    Args:
+        obj: класс или функция уровня модуля.
+
+    Raises:
+        ValueError: объект нельзя импортировать по имени (lambda, локальная функция).
+
+    Returns:
+        str
+    """
+    qualname = getattr(obj, "__qualname__", "")
+    if not qualname or "<" in qualname:
+        raise ValueError(f"{obj!r} can not be referenced by an import path, use a module level object")
+    return f"{obj.__module__}:{qualname}"
+
+
+def _import_object(path: str) -> Any:
+    """
+    Импортирует объект по пути "модуль:имя".
+
+    Args:
+        path: путь импорта.
+
+    Returns:
+        Any
+    """
+    module_name, _, qualname = path.partition(":")
+    obj = import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class FieldSpec:
+    """
+    Описание поля формы без сессии, объектов модели и html: класс виджета и его настройки.
+
+    Attributes:
+        name: имя поля.
+        widget_class: класс виджета.
+        checkbox: поле получает False при отсутствии в данных.
+        validator: пользовательский синхронный валидатор или None.
+        state: атрибуты виджета, заданные формой (partial_options, max_size, ...).
+        foreign_key: колонка внешнего ключа в виде "таблица.колонка" или None.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            widget_class: Type[AbstractWidget],
+            label: Optional[str] = None,
+            required: bool = False,
+            hidden: bool = False,
+            readonly: bool = False,
+            disabled: bool = False,
+            multiple: bool = False,
+            fail_fast: bool = False,
+            extra_attrs: Optional[dict] = None,
+            options: Optional[dict] = None,
+            extensions: Optional[str] = None,
+            checkbox: bool = False,
+            validator: Optional[Callable] = None,
+            state: Optional[dict] = None,
+            foreign_key: Optional[str] = None,
+    ):
+        self.name = name
+        self.widget_class = widget_class
+        self.label = label
+        self.required = required
+        self.hidden = hidden
+        self.readonly = readonly
+        self.disabled = disabled
+        self.multiple = multiple
+        self.fail_fast = fail_fast
+        self.extra_attrs = extra_attrs or {}
+        self.options = options or {}
+        self.extensions = extensions
+        self.checkbox = checkbox
+        self.validator = validator
+        self.state = state or {}
+        self.foreign_key = foreign_key
+
+    @classmethod
+    def from_widget(cls, name: str, widget: AbstractWidget, checkbox: bool = False) -> FieldSpec:
+        """
+        Создает описание поля по виджету формы.
+
+        Опции полей внешних ключей и связей многие-ко-многим не сохраняются и не загружаются:
+        их значения проверяет форма запросом в базу данных.
+
+        Args:
+            name: имя поля.
+            widget: виджет поля.
+            checkbox: поле получает False при отсутствии в данных.
+
+        Returns:
+            FieldSpec
+        """
+        validator = widget.__dict__.get("default_validator")
+        if inspect.ismethod(validator) and validator.__func__ is type(widget).default_validator:
+            validator = None
+        foreign_key = getattr(widget, "foreign_key", None)
+        state = {key: getattr(widget, key) for key in _WIDGET_STATE if key in widget.__dict__}
+        if foreign_key is None:
+            options = {_primitive(key): _primitive(value) for key, value in widget.options.items()}
+        else:
+            options = {}
+            state["partial_options"] = True
+        return cls(
+            name=name,
+            widget_class=type(widget),
+            label=_primitive(widget.label_name),
+            required=widget.required,
+            hidden=widget.hidden,
+            readonly=widget.readonly,
+            disabled=widget.disabled,
+            multiple=widget.multiple,
+            fail_fast=widget.fail_fast,
+            extra_attrs={key: _primitive(value) for key, value in widget.extra_attrs.items()},
+            options=options,
+            extensions=widget.extensions,
+            checkbox=checkbox,
+            validator=validator,
+            state=state,
+            foreign_key=None if foreign_key is None else str(foreign_key),
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Возвращает описание поля для JSON, значения по умолчанию не записываются.
+
+        Returns:
+            dict
+        """
+        data = {"name": self.name, "widget": _import_path(self.widget_class)}
+        defaults = self.__class__(self.name, self.widget_class)
+        for key in ("label", "required", "hidden", "readonly", "disabled", "multiple", "fail_fast",
+                    "extra_attrs", "options", "extensions", "checkbox", "state", "foreign_key"):
+            value = getattr(self, key)
+            if value != getattr(defaults, key):
+                data[key] = list(value.items()) if key == "options" else value
+        if self.validator is not None:
+            data["validator"] = _import_path(self.validator)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> FieldSpec:
+        """
+        Создает описание поля из результата to_dict.
+
+        Args:
+            data: словарь описания поля.
+
+        Returns:
+            FieldSpec
+        """
+        data = dict(data)
+        data["widget_class"] = _import_object(data.pop("widget"))
+        if "validator" in data:
+            data["validator"] = _import_object(data["validator"])
+        if "options" in data:
+            # пары сохраняют тип ключей, которые JSON приводит к строкам
+            data["options"] = {key: value for key, value in data["options"]}
+        return cls(**data)
+
+    def build_widget(self) -> AbstractWidget:
+        """
+        Создает виджет поля.
+
+        Returns:
+            AbstractWidget
+        """
+        widget = self.widget_class(
+            name=self.name,
+            label=self.label,
+            required=self.required,
+            hidden=self.hidden,
+            readonly=self.readonly,
+            disabled=self.disabled,
+            extra_attrs=dict(self.extra_attrs),
+            options=dict(self.options),
+            extensions=self.extensions,
+            validator=self.validator,
+            fail_fast=self.fail_fast,
+            multiple=self.multiple,
+        )
+        for key, value in self.state.items():
+            setattr(widget, key, value)
+        if self.foreign_key is not None:
+            # значения без загруженных опций проверяет форма запросом в базу данных
+            widget.foreign_key = self.foreign_key
+        return widget
+
+
+class _PlanForm(BaseForm):
+    """
+    Форма без сессии, поля которой построены по плану проверки.
+    """
+
+    def __init__(self, specs: Sequence[FieldSpec]):
+        super().__init__()
+        self._checkboxes = {spec.name for spec in specs if spec.checkbox}
+        self.fields = {spec.name: spec.build_widget() for spec in specs}
+
+    def _is_checkbox_field(self, name: str, widget: AbstractWidget) -> bool:
+        return name in self._checkboxes
+
+
+class ValidationPlan:
+    """
+    План очистки и синхронной проверки данных формы, который можно передать в другой процесс.
+
+    План содержит только классы виджетов и их настройки, без сессии, объектов модели и html,
+    поэтому сериализуется pickle и выполняется в ProcessPoolExecutor. Проверки, которым нужна
+    база данных (внешние ключи, уникальность), и асинхронные валидаторы выполняются формой
+    в основном процессе.
+
+    Пример:
+        plan = ValidationPlan.from_form(ProductForm(session=session))
+        results = await loop.run_in_executor(executor, validate_rows, plan, rows)
+    """
+
+    def __init__(self, fields: Sequence[FieldSpec], fail_fast: bool = False, key: Optional[str] = None):
+        """
+        Конструктор класса.
+
+        Args:
+            fields: описания полей.
+            fail_fast: прекращать проверку строки после первой ошибки.
+            key: ключ плана, по которому процесс хранит построенную форму, по умолчанию хеш описаний полей.
+        """
+        self.fields: Tuple[FieldSpec, ...] = tuple(fields)
+        self.fail_fast = fail_fast
+        self.key = key or self.get_key(self.fields)
+
+    @staticmethod
+    def get_key(fields: Sequence[FieldSpec]) -> str:
+        """
+        Вычисляет ключ плана по описаниям полей: одинаковые планы используют одну форму процесса.
+
+        Args:
+            fields: описания полей.
+
+        Returns:
+            str
+        """
+        try:
+            return hashlib.sha1(pickle.dumps(tuple(fields))).hexdigest()
+        except Exception:
+            # план с несериализуемым валидатором выполняется только в текущем процессе
+            return uuid.uuid4().hex
+
+    @classmethod
+    def from_form(cls, form: BaseForm, fail_fast: Optional[bool] = None) -> ValidationPlan:
+        """
+        Создает план по полям формы.
+
+        Args:
+            form: форма с построенными полями.
+            fail_fast: прекращать проверку строки после первой ошибки, по умолчанию атрибут формы.
+
+        Returns:
+            ValidationPlan
+        """
+        return cls(
+            [
+                FieldSpec.from_widget(name, widget, form._is_checkbox_field(name, widget))
+                for name, widget in form.fields.items()
+            ],
+            fail_fast=form.fail_fast if fail_fast is None else fail_fast,
+        )
+
+    def check_picklable(self) -> None:
+        """
+        Проверяет, что план можно передать в другой процесс.
+
+        Raises:
+            ValueError: валидатор или настройка поля не сериализуется pickle (например, lambda).
+
+        Returns:
+            None
+        """
+        for spec in self.fields:
+            try:
+                pickle.dumps(spec)
+            except Exception as e:
+                raise ValueError(
+                    f"Validation plan field {spec.name!r} can not be pickled, "
+                    f"use a module level validator function: {e}"
+                ) from e
+
+    def get_form(self) -> BaseForm:
+        """
+        Возвращает форму, построенную по плану, одну на поток процесса.
+
+        Форма хранит ошибки проверяемой строки, поэтому потоки (ThreadPoolExecutor) получают
+        отдельные формы. Хранятся формы последних _PLAN_FORMS_SIZE планов.
+
+        Returns:
+            BaseForm
+        """
+        key = (self.key, threading.get_ident())
+        with _PLAN_FORMS_LOCK:
+            form = _PLAN_FORMS.get(key)
+            if form is None:
+                form = _PLAN_FORMS[key] = _PlanForm(self.fields)
+                if len(_PLAN_FORMS) > _PLAN_FORMS_SIZE:
+                    _PLAN_FORMS.popitem(last=False)
+            else:
+                _PLAN_FORMS.move_to_end(key)
+        return form
+
+    def validate(self, rows: Sequence[dict]) -> List[Tuple[dict, Dict[str, str]]]:
+        """
+        Очищает и проверяет строки синхронными валидаторами полей.
+
+        Args:
+            rows: данные строк.
+
+        Returns:
+            list: для каждой строки кортеж (данные полей, прошедших проверку; ошибки полей).
+        """
+        form = self.get_form()
+        results = []
+        for row in rows:
+            form.errors = {}
+            results.append((form._run_sync_validators(form._clean_data(row), self.fail_fast), form.errors))
+        return results
+
+
+class FormSchema:
+    """
+    Скомпилированное описание полей колонок ModelForm: классы виджетов, атрибуты и опции Enum.
+
+    Форма, для класса которой зарегистрирована схема, создает виджеты колонок по ней, не разбирая
+    колонки модели. Опции внешних ключей, начальные данные и связи многие-ко-многим по-прежнему
+    загружаются каждой формой. Схема не используется, если списки disabled, protect, hidden
+    или readonly формы изменены аргументами конструктора.
+
+    Attributes:
+        form: путь импорта класса формы.
+        fingerprint: отпечаток колонок модели и списков формы, по которому определяется устаревшая схема.
+        flags: списки полей формы, по которым построена схема.
+        fields: описания полей колонок.
+    """
+
+    def __init__(self, form: str, fingerprint: str, flags: Dict[str, List[str]], fields: Sequence[FieldSpec]):
+        self.form = form
+        self.fingerprint = fingerprint
+        self.flags = flags
+        self.fields: Tuple[FieldSpec, ...] = tuple(fields)
+
+    @staticmethod
+    def get_fingerprint(form_class: Type[ModelForm]) -> str:
+        """
+        Вычисляет отпечаток колонок модели и списков полей класса формы.
+
+        Args:
+            form_class: класс ModelForm.
+
+        Returns:
+            str
+        """
+        columns = [
+            (
+                column.name,
+                repr(column.type),
+                column.nullable,
+                column.primary_key,
+                sorted(str(key.target_fullname) for key in column.foreign_keys),
+                repr(column.default.arg) if column.default is not None and not callable(column.default.arg) else None,
+            )
+            for column in class_mapper(form_class.model).columns
+        ]
+        flags = {attr: sorted(getattr(form_class, attr)) for attr in _SCHEMA_FLAGS}
+        source = json.dumps([SCHEMA_VERSION, columns, flags], default=str)
+        return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+    @classmethod
+    def compile(cls, form_class: Type[ModelForm]) -> FormSchema:
+        """
+        Компилирует схему класса формы без обращения к базе данных.
+
+        Args:
+            form_class: класс ModelForm.
+
+        Returns:
+            FormSchema
+        """
+        form = form_class(load_options=False)
+        fields = []
+        for column in class_mapper(form_class.model).columns:
+            spec = FieldSpec.from_widget(
+                column.name, form.fields[column.name], form._is_checkbox_field(column.name, form.fields[column.name])
+            )
+            # опции Enum постоянны, опции внешних ключей и привязки к колонке задает форма
+            spec.options = (
+                asyncio.run(form._get_option_for_enum_class(column)) if isinstance(column.type, Enum) else {}
+            )
+            spec.state = {}
+            spec.foreign_key = None
+            spec.validator = None
+            fields.append(spec)
+        return cls(
+            form=_import_path(form_class),
+            fingerprint=cls.get_fingerprint(form_class),
+            flags={attr: sorted(getattr(form_class, attr)) for attr in _SCHEMA_FLAGS},
+            fields=fields,
+        )
+
+    def matches(self, form: ModelForm) -> bool:
+        """
+        Проверяет, построены ли виджеты схемы для списков полей формы.
+
+        Args:
+            form: форма.
+
+        Returns:
+            bool
+        """
+        return all(sorted(getattr(form, attr)) == self.flags[attr] for attr in _SCHEMA_FLAGS)
+
+    async def build_fields(self, form: ModelForm) -> None:
+        """
+        Создает виджеты колонок формы по схеме.
+
+        Args:
+            form: форма, поля которой заполняются.
+
+        Returns:
+            None
+        """
+        columns = class_mapper(form.model).columns
+        prefix = form.__dict__.get("prefix_form", None)
+        for spec in self.fields:
+            column = columns[spec.name]
+            if column.foreign_keys:
+                options = await form._get_options_for_field_select(column)
+            elif spec.options and form.session is not None:
+                # форма без сессии не получает опции Enum, как и при разборе колонок
+                options = (
+                    await form._get_option_for_enum_class(column)
+                    if isinstance(column.type, Enum)
+                    else dict(spec.options)
+                )
+            else:
+                options = {}
+            form.fields[spec.name] = spec.widget_class(
+                name=spec.name,
+                label=spec.label,
+                readonly=spec.readonly,
+                hidden=spec.hidden,
+                required=spec.required,
+                disabled=spec.disabled,
+                options=options,
+                extensions=spec.extensions,
+                extra_attrs=dict(spec.extra_attrs),
+                init_data=await form._get_init_data(column),
+                prefix=prefix,
+            )
+            form._bind_column_type(column)
+
+    def register(self) -> bool:
+        """
+        Регистрирует схему для класса формы.
+
+        Устаревшая схема (модель или списки полей изменились после генерации) не регистрируется.
+
+        Returns:
+            bool: True, если схема зарегистрирована.
+        """
+        form_class = _import_object(self.form)
+        if self.fingerprint != self.get_fingerprint(form_class):
+            warnings.warn(f"Form schema of {self.form} is outdated and ignored, regenerate it", RuntimeWarning)
+            return False
+        form_class._compiled_schema = self
+        return True
+
+    def to_dict(self) -> dict:
+        return {
+            "form": self.form,
+            "fingerprint": self.fingerprint,
+            "flags": {attr: values for attr, values in self.flags.items() if values},
+            "fields": [spec.to_dict() for spec in self.fields],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> FormSchema:
+        return cls(
+            form=data["form"],
+            fingerprint=data["fingerprint"],
+            flags={attr: data.get("flags", {}).get(attr, []) for attr in _SCHEMA_FLAGS},
+            fields=[FieldSpec.from_dict(item) for item in data["fields"]],
+        )
+
+
+def find_model_forms(module: Union[str, ModuleType]) -> List[Type[ModelForm]]:
+    """
+    Возвращает классы ModelForm с моделью, объявленные в модуле.
+
+    Args:
+        module: модуль или его имя.
+
+    Returns:
+        list
+    """
+    if isinstance(module, str):
+        module = import_module(module)
+    return [
+        obj
+        for obj in vars(module).values()
+        if isinstance(obj, type)
+        and issubclass(obj, ModelForm)
+        and obj.model is not None
+        and obj.__module__ == module.__name__
+    ]
+
+
+def dump_schema(path: Union[str, "os.PathLike[str]"], form_classes: Iterable[Type[ModelForm]]) -> List[FormSchema]:
+    """
+    Компилирует схемы классов форм и записывает их в компактный JSON файл.
+
+    Args:
+        path: путь к файлу.
+        form_classes: классы ModelForm.
+
+    Returns:
+        list: скомпилированные схемы.
+    """
+    schemas = [FormSchema.compile(form_class) for form_class in form_classes]
+    data = {"version": SCHEMA_VERSION, "forms": [schema.to_dict() for schema in schemas]}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+    return schemas
+
+
+def load_schema(path: Union[str, "os.PathLike[str]"]) -> List[FormSchema]:
+    """
+    Загружает схемы форм из файла и регистрирует актуальные.
+
+    Args:
+        path: путь к файлу, созданному dump_schema.
+
+    Returns:
+        list: зарегистрированные схемы.
+    """
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    if data.get("version") != SCHEMA_VERSION:
+        warnings.warn(f"Form schema file {path} has unsupported version and is ignored", RuntimeWarning)
+        return []
+    schemas = [FormSchema.from_dict(item) for item in data["forms"]]
+    return [schema for schema in schemas if schema.register()]
+
+
+def _iter_subclasses(cls: type) -> Iterable[type]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _iter_subclasses(subclass)
+
+
+def discover_forms() -> List[Type[BaseForm]]:
+    """
+    Возвращает все импортированные подклассы ModelForm с моделью и подклассы Form.
+
+    Returns:
+        list
+    """
+    forms = {}
+    for base in (ModelForm, Form):
+        for form_class in _iter_subclasses(base):
+            if issubclass(form_class, ModelForm) and form_class.model is None:
+                continue
+            forms.setdefault(form_class, None)
+    return list(forms)
+
+
+async def prewarm(
+        forms: Optional[Iterable[Type[BaseForm]]] = None,
+        discover_subclasses: bool = False,
+        session: Optional[Any] = None,
+        compile_schema: bool = True,
+        options_ttl: float = 60.0,
+) -> Dict[Type[BaseForm], float]:
+    """
+    Заранее строит формы, чтобы первый запрос после запуска не платил за их подготовку.
+
+    Для каждого класса формы:
+        - компилируется и регистрируется FormSchema (если схема не загружена из файла),
+          последующие формы не разбирают колонки модели;
+        - создается форма, что настраивает мапперы SQLAlchemy и строит план очистки данных класса;
+        - компилируются регулярные выражения валидаторов полей;
+        - при переданной сессии опции внешних ключей и связей многие-ко-многим загружаются
+          в общий кеш класса (ModelForm.cache_options): формы, созданные до истечения options_ttl,
+          выводят поля без запросов. После изменения связанных таблиц кеш очищается
+          ModelForm.clear_options_cache().
+
+    Пример (FastAPI):
+        @asynccontextmanager
+        async def lifespan(app):
+            async with session_maker() as session:
+                timings = await miniform.prewarm(discover_subclasses=True, session=session)
+            yield
+
+    Args:
+        forms: классы форм.
+        discover_subclasses: добавить все импортированные подклассы ModelForm и Form.
+        session: сессия базы данных для загрузки опций, без нее запросы не выполняются.
+        compile_schema: компилировать FormSchema классов ModelForm.
+        options_ttl: время жизни кеша опций в секундах.
+
+    Returns:
+        dict: класс формы -> время подготовки в секундах.
+    """
+    form_classes = list(forms or [])
+    if discover_subclasses:
+        form_classes.extend(form_class for form_class in discover_forms() if form_class not in form_classes)
+    timings = {}
+    for form_class in form_classes:
+        started = time.perf_counter()
+        if issubclass(form_class, ModelForm):
+            if compile_schema and "_compiled_schema" not in form_class.__dict__:
+                try:
+                    form_class._compiled_schema = FormSchema.compile(form_class)
+                except ValueError:
+                    pass  # класс без пути импорта (например, локальный) строит поля по колонкам
+            form_class.loader_options()
+            if session is not None:
+                await form_class.cache_options(session, ttl=options_ttl)
+            form = form_class(session=session, load_options=False)
+        else:
+            form = form_class(session=session)
+        with form._span("form.prewarm", form=form_class.__name__):
+            form._get_cleaning_plan()
+            for widget in form.fields.values():
+                if widget.pattern:
+                    re.compile(widget.pattern)
+        timings[form_class] = time.perf_counter() - started
+    return timings
+
+
+def validate_rows(plan: ValidationPlan, rows: Sequence[dict]) -> List[Tuple[dict, Dict[str, str]]]:
+    """
+    Проверяет строки по плану, функция для ProcessPoolExecutor.
+
+    Args:
+        plan: план проверки.
+        rows: данные строк.
+
+    Returns:
+        list: для каждой строки кортеж (данные полей, прошедших проверку; ошибки полей).
+    """
+    return plan.validate(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m miniform.schema", description="compile ModelForm schemas")
+    parser.add_argument("targets", nargs="+", help="module with forms or module:FormClass")
+    parser.add_argument("-o", "--output", required=True, help="path of the schema file")
+    args = parser.parse_args(argv)
+    sys.path.insert(0, os.getcwd())
+    form_classes = []
+    for target in args.targets:
+        if ":" in target:
+            form_classes.append(_import_object(target))
+        else:
+            form_classes.extend(find_model_forms(target))
+    schemas = dump_schema(args.output, form_classes)
+    print(f"{len(schemas)} form schemas written to {args.output}")
+    return 0
+
+
+__all__ = (
+    'FieldSpec',
+    'ValidationPlan',
+    'FormSchema',
+    'validate_rows',
+    'find_model_forms',
+    'dump_schema',
+    'load_schema',
+    'discover_forms',
+    'prewarm',
+)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
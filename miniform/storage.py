@@ -0,0 +1,628 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple, Any
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class BaseStorage:
+    """
+    Базовый класс хранилища файлов FileField.
+
+    Имена файлов в хранилище - относительные пути с разделителем "/", их и сохраняет поле модели.
+    Содержимое передается потоком блоками по chunk_size байт, поэтому файл целиком в память не читается.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Конструктор класса.
+
+        Args:
+            chunk_size: размер блока при потоковом чтении и записи в байтах.
+        """
+        self.chunk_size = chunk_size
+
+    async def save(self, name: str, content: BinaryIO) -> str:
+        """
+        Сохраняет файл под свободным именем.
+
+        Args:
+            name: желаемое имя файла.
+            content: файловый объект с методом read.
+
+        Returns:
+            str: имя, под которым файл сохранен.
+        """
+        name = await self.get_available_name(name)
+        return await self._save(name, content)
+
+    async def _save(self, name: str, content: BinaryIO) -> str:
+        raise NotImplementedError
+
+    async def stage(self, name: str, content: BinaryIO) -> Tuple[str, Any]:
+        """
+        Сохраняет файл до фиксации транзакции.
+
+        Возвращает итоговое имя файла и ключ для commit_staged / discard_staged. Реализация по умолчанию
+        сразу сохраняет файл под итоговым именем и удаляет его при отмене.
+
+        Args:
+            name: желаемое имя файла.
+            content: файловый объект с методом read.
+
+        Returns:
+            tuple: итоговое имя файла и ключ подготовленного файла.
+        """
+        name = await self.save(name, content)
+        return name, name
+
+    async def commit_staged(self, token: Any) -> None:
+        """
+        Переносит подготовленный файл под итоговое имя после фиксации транзакции.
+
+        Args:
+            token: ключ из stage.
+
+        Returns:
+            None
+        """
+
+    async def discard_staged(self, token: Any) -> None:
+        """
+        Удаляет подготовленный файл после отката транзакции.
+
+        Args:
+            token: ключ из stage.
+
+        Returns:
+            None
+        """
+        await self.delete(token)
+
+    async def sweep_staging(self, directory: str, max_age: float) -> int:
+        """
+        Удаляет подготовленные файлы, оставшиеся после аварийного завершения процесса.
+
+        Args:
+            directory: каталог файлов в хранилище (upload_to поля).
+            max_age: минимальный возраст удаляемых файлов в секундах.
+
+        Returns:
+            int: количество удаленных файлов.
+        """
+        return 0
+
+    async def open(self, name: str) -> AsyncIterator[bytes]:
+        """
+        Читает файл потоком блоков.
+
+        Args:
+            name: имя файла.
+
+        Returns:
+            AsyncIterator[bytes]
+        """
+        raise NotImplementedError
+        yield b""  # pragma: no cover
+
+    async def read(self, name: str) -> bytes:
+        """
+        Читает файл целиком.
+
+        Args:
+            name: имя файла.
+
+        Returns:
+            bytes
+        """
+        return b"".join([chunk async for chunk in self.open(name)])
+
+    async def delete(self, name: str) -> None:
+        """
+        Удаляет файл. Отсутствующий файл не считается ошибкой.
+
+        Args:
+            name: имя файла.
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    async def exists(self, name: str) -> bool:
+        """
+        Проверяет наличие файла.
+
+        Args:
+            name: имя файла.
+
+        Returns:
+            bool
+        """
+        raise NotImplementedError
+
+    def path(self, name: str) -> str:
+        """
+        Возвращает путь файла в локальной файловой системе.
+
+        Args:
+            name: имя файла.
+
+        Returns:
+            str
+
+        Raises:
+            NotImplementedError: если хранилище не локальное.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not provide local paths")
+
+    @staticmethod
+    def get_alternative_name(name: str, counter: int) -> str:
+        """
+        Возвращает альтернативное имя файла: "photo.jpg" -> "photo(2).jpg".
+
+        Args:
+            name: имя файла.
+            counter: номер.
+
+        Returns:
+            str
+        """
+        base, extension = os.path.splitext(name)
+        return f"{base}({counter}){extension}"
+
+    async def get_available_name(self, name: str) -> str:
+        """
+        Возвращает свободное имя файла.
+
+        Args:
+            name: желаемое имя файла.
+
+        Returns:
+            str
+        """
+        available_name = name
+        counter = 2
+        while await self.exists(available_name):
+            available_name = self.get_alternative_name(name, counter)
+            counter += 1
+        return available_name
+
+
+class LocalStorage(BaseStorage):
+    """
+    Хранилище файлов на локальном диске.
+
+    Без location имена считаются относительно текущего каталога процесса, как раньше делал FileField.
+
+    Подготовленные в транзакции файлы записываются в подкаталог ".staging" каталога файла (та же файловая
+    система, поэтому перенос атомарный), а итоговое имя резервируется пустым файлом до фиксации транзакции.
+    """
+    staging_dir = ".staging"
+
+    def __init__(
+            self,
+            location: Optional[str] = None,
+            atomic: bool = True,
+            fsync: bool = False,
+            file_mode: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Конструктор класса.
+
+        Args:
+            location: корневой каталог хранилища.
+            atomic: записывать во временный файл и переименовывать его после записи,
+                чтобы недописанный файл не был виден под основным именем.
+            fsync: сбрасывать файл и каталог на диск перед возвратом из save.
+            file_mode: права создаваемых файлов, например 0o644.
+            chunk_size: размер блока при потоковом чтении и записи в байтах.
+        """
+        super().__init__(chunk_size)
+        self.location = location
+        self.atomic = atomic
+        self.fsync = fsync
+        self.file_mode = file_mode
+
+    def path(self, name: str) -> str:
+        if self.location is None:
+            return name
+        return os.path.join(self.location, name)
+
+    def get_name(self, path: str) -> str:
+        """
+        Возвращает имя файла в хранилище по пути на диске.
+
+        Args:
+            path: путь к файлу.
+
+        Returns:
+            str
+        """
+        if self.location is None:
+            return os.path.relpath(path)
+        return os.path.relpath(path, self.location).replace(os.sep, "/")
+
+    def _copy(self, content: BinaryIO, file: BinaryIO) -> None:
+        while chunk := content.read(self.chunk_size):
+            file.write(chunk)
+        if self.fsync:
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _fsync_directory(self, directory: str) -> None:
+        if not self.fsync or not hasattr(os, "O_DIRECTORY"):
+            return
+        descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def _save_sync(self, name: str, content: BinaryIO) -> str:
+        path = self.path(name)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # имя резервируется пустым файлом (O_EXCL), поэтому одновременные сохранения не получат одно имя
+        path = self._reserve(path)
+        temp_path = None
+        try:
+            if self.atomic:
+                descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".upload")
+                with os.fdopen(descriptor, "wb") as file:
+                    self._copy(content, file)
+                if self.file_mode is not None:
+                    os.chmod(temp_path, self.file_mode)
+                os.replace(temp_path, path)
+            else:
+                with open(path, "wb") as file:
+                    self._copy(content, file)
+                if self.file_mode is not None:
+                    os.chmod(path, self.file_mode)
+        except BaseException:
+            for file_path in (temp_path, path):
+                if file_path is not None and os.path.exists(file_path):
+                    os.remove(file_path)
+            raise
+        self._fsync_directory(directory)
+        return self.get_name(path)
+
+    async def save(self, name: str, content: BinaryIO) -> str:
+        # свободное имя выбирает _reserve при записи, отдельная проверка exists не нужна
+        return await self._save(name, content)
+
+    async def _save(self, name: str, content: BinaryIO) -> str:
+        # запись выполняется в потоке, чтобы не блокировать цикл событий
+        return await asyncio.to_thread(self._save_sync, name, content)
+
+    def _reserve(self, path: str) -> str:
+        # эксклюзивное создание пустого файла исключает выдачу одного имени двум транзакциям
+        base_path = path
+        counter = 2
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+                return path
+            except FileExistsError:
+                path = self.get_alternative_name(base_path, counter)
+                counter += 1
+
+    def _stage_sync(self, name: str, content: BinaryIO) -> Tuple[str, Tuple[str, str]]:
+        path = self.path(name)
+        directory = os.path.dirname(path) or "."
+        staging = os.path.join(directory, self.staging_dir)
+        os.makedirs(staging, exist_ok=True)
+        path = self._reserve(path)
+        # имя подготовленного файла: <uuid>_<итоговое имя>, по нему sweep_staging находит резерв
+        temp_path = os.path.join(staging, f"{uuid.uuid4().hex}_{os.path.basename(path)}")
+        try:
+            with open(temp_path, "wb") as file:
+                self._copy(content, file)
+            if self.file_mode is not None:
+                os.chmod(temp_path, self.file_mode)
+        except BaseException:
+            for file_path in (temp_path, path):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            raise
+        return self.get_name(path), (temp_path, path)
+
+    async def stage(self, name: str, content: BinaryIO) -> Tuple[str, Any]:
+        return await asyncio.to_thread(self._stage_sync, name, content)
+
+    def _commit_staged_sync(self, token: Tuple[str, str]) -> None:
+        temp_path, path = token
+        os.replace(temp_path, path)
+        self._fsync_directory(os.path.dirname(path) or ".")
+
+    async def commit_staged(self, token: Any) -> None:
+        await asyncio.to_thread(self._commit_staged_sync, token)
+
+    @staticmethod
+    def _discard_staged_sync(token: Tuple[str, str]) -> None:
+        for file_path in token:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    async def discard_staged(self, token: Any) -> None:
+        await asyncio.to_thread(self._discard_staged_sync, token)
+
+    def _sweep_staging_sync(self, directory: str, max_age: float) -> int:
+        staging = os.path.join(self.path(directory) if directory else self.path("."), self.staging_dir)
+        if not os.path.isdir(staging):
+            return 0
+        removed = 0
+        deadline = time.time() - max_age
+        for entry in os.scandir(staging):
+            try:
+                if not entry.is_file() or entry.stat().st_mtime > deadline:
+                    continue
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+            # пустой файл резерва итогового имени
+            reserved = os.path.join(os.path.dirname(staging), entry.name[33:])
+            try:
+                if os.path.getsize(reserved) == 0:
+                    os.remove(reserved)
+            except OSError:
+                pass
+        return removed
+
+    async def sweep_staging(self, directory: str, max_age: float) -> int:
+        return await asyncio.to_thread(self._sweep_staging_sync, directory, max_age)
+
+    async def open(self, name: str) -> AsyncIterator[bytes]:
+        with open(self.path(name), "rb") as file:
+            while chunk := await asyncio.to_thread(file.read, self.chunk_size):
+                yield chunk
+
+    async def delete(self, name: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, self.path(name))
+        except FileNotFoundError:
+            pass
+
+    async def exists(self, name: str) -> bool:
+        return os.path.exists(self.path(name))
+
+
+class MemoryStorage(BaseStorage):
+    """
+    Хранилище файлов в памяти процесса. Предназначено для тестов.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__(chunk_size)
+        self.files: Dict[str, bytes] = {}
+
+    async def _save(self, name: str, content: BinaryIO) -> str:
+        chunks = []
+        while chunk := content.read(self.chunk_size):
+            chunks.append(chunk)
+        self.files[name] = b"".join(chunks)
+        return name
+
+    async def open(self, name: str) -> AsyncIterator[bytes]:
+        try:
+            data = self.files[name]
+        except KeyError:
+            raise FileNotFoundError(name) from None
+        for start in range(0, len(data), self.chunk_size):
+            yield data[start:start + self.chunk_size]
+
+    async def delete(self, name: str) -> None:
+        self.files.pop(name, None)
+
+    async def exists(self, name: str) -> bool:
+        return name in self.files
+
+
+class ContentAddressedStorage(LocalStorage):
+    """
+    Локальное хранилище с дедупликацией файлов по содержимому.
+
+    Хеш считается во время записи во временный файл (за один проход), файл сохраняется под именем
+    "<каталог>/<2 символа хеша>/<хеш><расширение>". Если файл с таким содержимым уже есть,
+    временный файл удаляется и возвращается имя существующего. Количество ссылок на файл хранится
+    рядом в файле "<имя>.refs", delete уменьшает его и удаляет файл после удаления последней ссылки.
+
+    Файл создается через os.link, который не перезаписывает существующий файл, а счетчики ссылок
+    изменяются под блокировкой потоков и, где доступен fcntl, под блокировкой файла ".lock"
+    в корне хранилища, поэтому одновременная загрузка одинаковых файлов сохраняет один файл.
+    """
+
+    refs_suffix = ".refs"
+    lock_name = ".lock"
+
+    def __init__(
+            self,
+            location: Optional[str] = None,
+            hash_name: str = "sha256",
+            fsync: bool = False,
+            file_mode: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Конструктор класса.
+
+        Args:
+            location: корневой каталог хранилища.
+            hash_name: алгоритм хеширования из hashlib.
+            fsync: сбрасывать файл и каталог на диск перед возвратом из save.
+            file_mode: права создаваемых файлов, например 0o644.
+            chunk_size: размер блока при потоковом чтении и записи в байтах.
+        """
+        super().__init__(location, atomic=True, fsync=fsync, file_mode=file_mode, chunk_size=chunk_size)
+        self.hash_name = hash_name
+        self._lock = threading.Lock()
+
+    def _locked(self):
+        return _StorageLock(self._lock, self.path(self.lock_name))
+
+    def _read_refs(self, path: str) -> int:
+        try:
+            with open(path + self.refs_suffix) as file:
+                return int(file.read().strip() or 0)
+        except FileNotFoundError:
+            # файл без счетчика (например, сохраненный до включения дедупликации) имеет одну ссылку
+            return 1 if os.path.exists(path) else 0
+
+    def _write_refs(self, path: str, refs: int) -> None:
+        temp_path = f"{path}{self.refs_suffix}.tmp"
+        with open(temp_path, "w") as file:
+            file.write(str(refs))
+        os.replace(temp_path, path + self.refs_suffix)
+
+    def _save_sync(self, name: str, content: BinaryIO) -> str:
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        root = self.path(directory) if directory else self.path(".")
+        os.makedirs(root, exist_ok=True)
+        digest = hashlib.new(self.hash_name)
+        descriptor, temp_path = tempfile.mkstemp(dir=root, prefix=".", suffix=".upload")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                while chunk := content.read(self.chunk_size):
+                    digest.update(chunk)
+                    file.write(chunk)
+                if self.fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            if self.file_mode is not None:
+                os.chmod(temp_path, self.file_mode)
+            hexdigest = digest.hexdigest()
+            blob_name = os.path.join(directory, hexdigest[:2], f"{hexdigest}{extension}")
+            path = self.path(blob_name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with self._locked():
+                try:
+                    os.link(temp_path, path)
+                    refs = 1
+                except FileExistsError:
+                    refs = self._read_refs(path) + 1
+                self._write_refs(path, refs)
+            self._fsync_directory(os.path.dirname(path))
+        finally:
+            os.remove(temp_path)
+        return self.get_name(path)
+
+    async def save(self, name: str, content: BinaryIO) -> str:
+        # имя определяется содержимым, поэтому поиск свободного имени не нужен
+        return await self._save(name, content)
+
+    # файл с тем же содержимым может уже использоваться другими записями, поэтому в транзакции
+    # файл сохраняется сразу, а при откате удаляется одна ссылка на него
+    stage = BaseStorage.stage
+    commit_staged = BaseStorage.commit_staged
+    discard_staged = BaseStorage.discard_staged
+
+    def _delete_sync(self, name: str) -> None:
+        path = self.path(name)
+        with self._locked():
+            refs = self._read_refs(path) - 1
+            if refs > 0:
+                self._write_refs(path, refs)
+                return
+            for file_path in (path, path + self.refs_suffix):
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+
+    async def delete(self, name: str) -> None:
+        await asyncio.to_thread(self._delete_sync, name)
+
+    async def get_refs(self, name: str) -> int:
+        """
+        Возвращает количество ссылок на файл.
+
+        Args:
+            name: имя файла.
+
+        Returns:
+            int
+        """
+        return self._read_refs(self.path(name))
+
+
+class _StorageLock:
+    """
+    Блокировка изменения счетчиков ссылок: блокировка потоков и блокировка файла между процессами.
+    """
+
+    def __init__(self, lock: threading.Lock, path: str):
+        self.lock = lock
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            import fcntl
+        except ImportError:  # Windows: только блокировка потоков
+            return self
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.file = open(self.path, "a")
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        except BaseException:
+            self.lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.file is not None:
+            self.file.close()  # закрытие файла снимает flock
+            self.file = None
+        self.lock.release()
+        return False
+
+
+_default_storage: Optional[BaseStorage] = None
+
+
+def get_default_storage() -> BaseStorage:
+    """
+    Возвращает хранилище по умолчанию для полей без параметра storage.
+
+    Returns:
+        BaseStorage
+    """
+    global _default_storage
+    if _default_storage is None:
+        _default_storage = LocalStorage()
+    return _default_storage
+
+
+def set_default_storage(storage: Optional[BaseStorage]) -> None:
+    """
+    Устанавливает хранилище по умолчанию. None возвращает LocalStorage в текущем каталоге.
+
+    Args:
+        storage: BaseStorage | None
+
+    Returns:
+        None
+    """
+    global _default_storage
+    _default_storage = storage
+
+
+__all__ = (
+    'BaseStorage',
+    'LocalStorage',
+    'MemoryStorage',
+    'ContentAddressedStorage',
+    'get_default_storage',
+    'set_default_storage',
+)
@@ -0,0 +1,266 @@
+import asyncio
+import warnings
+from contextvars import ContextVar
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, DeclarativeBase, Mapper, class_mapper
+
+from miniform.storage import BaseStorage
+from miniform.utils import run_sync
+
+SESSION_INFO_KEY = "miniform_file_transaction"
+
+
+class FileTransaction:
+    """
+    Файловые операции одной транзакции сессии SQLAlchemy.
+
+    Файлы, записанные FileField во время flush, сохраняются в хранилище как подготовленные
+    и переносятся под итоговое имя после фиксации транзакции (after_commit). Удаление старых файлов
+    откладывается до фиксации. При откате (after_rollback) подготовленные файлы удаляются, а отложенные
+    удаления отменяются.
+    """
+
+    def __init__(self):
+        self.staged: List[Tuple[BaseStorage, Any]] = []
+        self.callbacks: List[Callable[[], None]] = []
+
+    def stage(self, storage: BaseStorage, name: str, content: BinaryIO) -> str:
+        """
+        Сохраняет файл как подготовленный.
+
+        Args:
+            storage: хранилище файла.
+            name: желаемое имя файла.
+            content: файловый объект с методом read.
+
+        Returns:
+            str: итоговое имя файла.
+        """
+        name, token = run_sync(storage.stage(name, content))
+        self.staged.append((storage, token))
+        return name
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Откладывает вызов функции до фиксации транзакции.
+
+        Args:
+            callback: функция без аргументов, например удаление старого файла.
+
+        Returns:
+            None
+        """
+        self.callbacks.append(callback)
+
+    def commit(self) -> None:
+        """
+        Переносит подготовленные файлы и выполняет отложенные функции.
+
+        Транзакция базы данных уже зафиксирована, поэтому ошибки не прерывают обработку
+        остальных файлов и выдаются предупреждением.
+
+        Returns:
+            None
+        """
+        staged, callbacks = self.staged, self.callbacks
+        self.staged, self.callbacks = [], []
+        for storage, token in staged:
+            try:
+                run_sync(storage.commit_staged(token))
+            except Exception as e:
+                warnings.warn(f"Failed to commit staged file {token!r}: {e}", RuntimeWarning)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                warnings.warn(f"Deferred file operation failed: {e}", RuntimeWarning)
+
+    def rollback(self) -> None:
+        """
+        Удаляет подготовленные файлы и отменяет отложенные функции.
+
+        Returns:
+            None
+        """
+        staged = self.staged
+        self.staged, self.callbacks = [], []
+        for storage, token in staged:
+            try:
+                run_sync(storage.discard_staged(token))
+            except Exception as e:
+                warnings.warn(f"Failed to discard staged file {token!r}: {e}", RuntimeWarning)
+
+
+_current_transaction: ContextVar[Optional[FileTransaction]] = ContextVar(
+    "miniform_file_transaction", default=None
+)
+
+
+def get_file_transaction() -> Optional[FileTransaction]:
+    """
+    Возвращает файловую транзакцию сессии, выполняющей flush в текущем контексте.
+
+    Returns:
+        FileTransaction | None: None вне flush сессии, файлы в этом случае сохраняются сразу.
+    """
+    return _current_transaction.get()
+
+
+# атрибуты FileField по классам моделей: класс -> [(имя атрибута, тип колонки)]
+_file_attributes: Dict[type, List[Tuple[str, Any]]] = {}
+
+
+def _keep_file_on_empty_upload(column_type) -> Callable:
+    def on_set(target, value, oldvalue, initiator):
+        # пустая загрузка (файл не выбран в форме) не меняет сохраненный файл записи
+        if column_type.is_empty_upload(value) and isinstance(oldvalue, str) and oldvalue:
+            return oldvalue
+        return value
+
+    return on_set
+
+
+@event.listens_for(Mapper, "mapper_configured")
+def _register_file_attributes(mapper: Mapper, class_) -> None:
+    from miniform.fields import FileField
+
+    attributes = [
+        (prop.key, prop.columns[0].type)
+        for prop in mapper.column_attrs
+        if isinstance(prop.columns[0].type, FileField)
+    ]
+    if not attributes:
+        return
+    _file_attributes[class_] = attributes
+    for key, column_type in attributes:
+        # active_history загружает старое значение при присваивании, даже если атрибут не загружен
+        event.listen(
+            getattr(class_, key),
+            "set",
+            _keep_file_on_empty_upload(column_type),
+            active_history=True,
+            retval=True,
+        )
+
+
+def _remove_replaced_files(session: Session) -> None:
+    # старое значение берется из истории атрибута каждой записи, а не из общего типа колонки
+    for instance in session.dirty:
+        attributes = _file_attributes.get(type(instance))
+        if not attributes:
+            continue
+        state = inspect(instance)
+        for key, column_type in attributes:
+            history = state.attrs[key].history
+            if not history.added or column_type.is_empty_upload(history.added[0]):
+                continue
+            for old_value in history.deleted:
+                if isinstance(old_value, str) and old_value and old_value != history.added[0]:
+                    column_type.remove_file(old_value)
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    transaction = session.info.get(SESSION_INFO_KEY)
+    if transaction is None:
+        transaction = session.info[SESSION_INFO_KEY] = FileTransaction()
+    _current_transaction.set(transaction)
+    _remove_replaced_files(session)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _after_flush_postexec(session: Session, flush_context) -> None:
+    _current_transaction.set(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    transaction = session.info.pop(SESSION_INFO_KEY, None)
+    if transaction is not None:
+        transaction.commit()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    _current_transaction.set(None)
+    transaction = session.info.pop(SESSION_INFO_KEY, None)
+    if transaction is not None:
+        transaction.rollback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _after_transaction_end(session: Session, session_transaction) -> None:
+    # сессия закрыта без commit и rollback
+    if session_transaction.parent is None:
+        _after_rollback(session)
+
+
+def _get_file_columns(models: Iterable[Type[DeclarativeBase]]) -> list:
+    from miniform.fields import FileField
+
+    return [
+        column
+        for model in models
+        for column in class_mapper(model).columns
+        if isinstance(column.type, FileField)
+    ]
+
+
+async def sweep_staging(*models: Type[DeclarativeBase], max_age: float = 3600) -> int:
+    """
+    Удаляет подготовленные файлы полей FileField моделей, оставшиеся после аварийного завершения процесса.
+
+    Args:
+        *models: модели с полями FileField.
+        max_age: минимальный возраст удаляемых файлов в секундах, должен быть больше длительности транзакций.
+
+    Returns:
+        int: количество удаленных файлов.
+    """
+    removed = 0
+    for column in _get_file_columns(models):
+        removed += await column.type.storage.sweep_staging(column.type.upload_to, max_age)
+    return removed
+
+
+def start_staging_sweeper(
+        *models: Type[DeclarativeBase],
+        interval: float = 600,
+        max_age: float = 3600,
+) -> asyncio.Task:
+    """
+    Запускает фоновую задачу, периодически вызывающую sweep_staging.
+
+    Пример:
+        sweeper = start_staging_sweeper(Product, Document, interval=300)
+        ...
+        sweeper.cancel()
+
+    Args:
+        *models: модели с полями FileField.
+        interval: интервал между проверками в секундах.
+        max_age: минимальный возраст удаляемых файлов в секундах.
+
+    Returns:
+        asyncio.Task
+    """
+
+    async def sweeper():
+        while True:
+            try:
+                await sweep_staging(*models, max_age=max_age)
+            except Exception as e:
+                warnings.warn(f"Staging sweep failed: {e}", RuntimeWarning)
+            await asyncio.sleep(interval)
+
+    return asyncio.get_running_loop().create_task(sweeper())
+
+
+__all__ = (
+    'FileTransaction',
+    'get_file_transaction',
+    'sweep_staging',
+    'start_staging_sweeper',
+)
@@ -0,0 +1,210 @@
+import os
+from typing import BinaryIO, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# группы расширений, которые можно указать в allowed_extensions / extensions вместо списка
+EXTENSION_GROUPS: Dict[str, List[str]] = {
+    "image/*": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"],
+    "document/*": [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".txt"],
+    "audio/*": [".mp3", ".wav", ".ogg", ".aac", ".flac", ".m4a", ".wma"],
+    "video/*": [".mp4", ".avi", ".mkv", ".mov", ".wmv", ".flv", ".webm", ".mpeg"],
+    "archive/*": [".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz"],
+    "text/*": [".txt", ".csv", ".json", ".xml", ".html", ".css", ".js", ".log"],
+}
+
+# сигнатуры (смещение, байты) начала файла; файл подходит, если совпала любая из сигнатур расширения,
+# а все элементы одной сигнатуры-кортежа должны совпасть одновременно
+_ZIP = ((0, b"PK\x03\x04"),), ((0, b"PK\x05\x06"),)
+_OLE = ((0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"),),
+_ISO_MEDIA = ((4, b"ftyp"),),
+_MATROSKA = ((0, b"\x1a\x45\xdf\xa3"),),
+SIGNATURES: Dict[str, Tuple[Tuple[Tuple[int, bytes], ...], ...]] = {
+    ".jpg": (((0, b"\xff\xd8\xff"),),),
+    ".jpeg": (((0, b"\xff\xd8\xff"),),),
+    ".png": (((0, b"\x89PNG\r\n\x1a\n"),),),
+    ".gif": (((0, b"GIF87a"),), ((0, b"GIF89a"),)),
+    ".bmp": (((0, b"BM"),),),
+    ".webp": (((0, b"RIFF"), (8, b"WEBP")),),
+    ".avif": _ISO_MEDIA,
+    ".pdf": (((0, b"%PDF-"),),),
+    ".doc": _OLE,
+    ".xls": _OLE,
+    ".docx": _ZIP,
+    ".xlsx": _ZIP,
+    ".zip": _ZIP,
+    ".rar": (((0, b"Rar!\x1a\x07"),),),
+    ".7z": (((0, b"7z\xbc\xaf\x27\x1c"),),),
+    ".tar": (((257, b"ustar"),),),
+    ".gz": (((0, b"\x1f\x8b"),),),
+    ".bz2": (((0, b"BZh"),),),
+    ".xz": (((0, b"\xfd7zXZ\x00"),),),
+    ".mp3": (((0, b"ID3"),), ((0, b"\xff\xfb"),), ((0, b"\xff\xf3"),), ((0, b"\xff\xf2"),)),
+    ".wav": (((0, b"RIFF"), (8, b"WAVE")),),
+    ".ogg": (((0, b"OggS"),),),
+    ".flac": (((0, b"fLaC"),),),
+    ".m4a": _ISO_MEDIA,
+    ".aac": (((0, b"\xff\xf1"),), ((0, b"\xff\xf9"),), ((0, b"ADIF"),)),
+    ".wma": (((0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"),),),
+    ".mp4": _ISO_MEDIA,
+    ".mov": _ISO_MEDIA,
+    ".mkv": _MATROSKA,
+    ".webm": _MATROSKA,
+    ".avi": (((0, b"RIFF"), (8, b"AVI ")),),
+    ".wmv": (((0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"),),),
+    ".flv": (((0, b"FLV"),),),
+    ".mpeg": (((0, b"\x00\x00\x01\xba"),), ((0, b"\x00\x00\x01\xb3"),)),
+}
+
+# расширения текстовых файлов: кодировка не проверяется (CSV из Excel часто в cp1251),
+# отклоняются только нулевые байты и сигнатуры двоичных форматов
+TEXT_EXTENSIONS = frozenset(EXTENSION_GROUPS["text/*"])
+
+# сигнатуры с управляющими байтами: ASCII-сигнатуры ("BM", "ID3") и старшие байты (cp1251 "яы" == b"\xff\xfb")
+# встречаются в начале обычного текста
+_BINARY_SIGNATURES = tuple(
+    signature
+    for signature in dict.fromkeys(
+        signature for signatures in SIGNATURES.values() for signature in signatures
+    )
+    if any(byte < 0x09 or 0x0d < byte < 0x20 or byte == 0x7f for _, magic in signature for byte in magic)
+)
+
+SNIFF_SIZE = 2048
+
+
+class UploadRejected(ValueError):
+    """
+    Исключение при отклонении загрузки до чтения тела запроса.
+    """
+
+
+def expand_extensions(extensions: Iterable[str]) -> List[str]:
+    """
+    Раскрывает группы расширений ("image/*") и приводит расширения к виду ".ext".
+
+    Args:
+        extensions: расширения и группы расширений.
+
+    Returns:
+        list
+    """
+    result = []
+    for extension in extensions:
+        if not isinstance(extension, str):
+            continue
+        if extension in EXTENSION_GROUPS:
+            result.extend(EXTENSION_GROUPS[extension])
+            continue
+        extension = extension.lower().strip()
+        result.append(extension if extension.startswith(".") else f".{extension}")
+    return result
+
+
+def read_head(file: BinaryIO, size: int = SNIFF_SIZE) -> bytes:
+    """
+    Читает начало файла и возвращает позицию чтения на место.
+
+    Args:
+        file: файловый объект.
+        size: количество байтов.
+
+    Returns:
+        bytes
+    """
+    position = file.tell()
+    try:
+        return file.read(size)
+    finally:
+        file.seek(position)
+
+
+def _matches(head: bytes, signature: Tuple[Tuple[int, bytes], ...]) -> bool:
+    return all(head[offset:offset + len(magic)] == magic for offset, magic in signature)
+
+
+def _is_text(head: bytes) -> bool:
+    if b"\x00" in head:
+        return False
+    return not any(_matches(head, signature) for signature in _BINARY_SIGNATURES)
+
+
+def sniff_content(head: bytes, extension: str) -> bool:
+    """
+    Проверяет, что начало файла соответствует расширению.
+
+    Расширения без известной сигнатуры считаются подходящими. Текстовые файлы проверяются
+    только на нулевые байты и сигнатуры двоичных форматов, кодировка может быть любой.
+
+    Args:
+        head: начало файла.
+        extension: расширение файла, например ".pdf".
+
+    Returns:
+        bool
+    """
+    extension = extension.lower()
+    if extension in TEXT_EXTENSIONS:
+        return _is_text(head)
+    signatures = SIGNATURES.get(extension)
+    if signatures is None:
+        return True
+    return any(_matches(head, signature) for signature in signatures)
+
+
+def sniff_upload(file: BinaryIO, filename: str, size: int = SNIFF_SIZE) -> bool:
+    """
+    Проверяет содержимое загруженного файла по первому блоку.
+
+    Args:
+        file: файловый объект.
+        filename: имя файла.
+        size: размер проверяемого блока.
+
+    Returns:
+        bool
+    """
+    return sniff_content(read_head(file, size), os.path.splitext(filename)[1])
+
+
+def check_content_length(headers: Mapping[str, str], max_length: Optional[int]) -> None:
+    """
+    Отклоняет запрос по заголовку Content-Length до чтения тела.
+
+    Вызывается до request.form(), пока Starlette не прочитал и не буферизовал загрузку:
+        check_content_length(request.headers, form.get_max_content_length())
+        form_data = await request.form()
+
+    Args:
+        headers: заголовки запроса.
+        max_length: максимальный размер тела в байтах, None - без ограничения.
+
+    Returns:
+        None
+
+    Raises:
+        UploadRejected: если заявленный размер больше допустимого или заголовок некорректный.
+    """
+    if max_length is None:
+        return
+    value = headers.get("content-length")
+    if value is None:
+        return  # тело передается частями, размер файлов проверяет форма
+    try:
+        length = int(value)
+    except ValueError:
+        raise UploadRejected("Invalid Content-Length header") from None
+    if length > max_length:
+        raise UploadRejected(f"Request body size {length} exceeds maximum allowed {max_length} bytes")
+
+
+__all__ = (
+    'EXTENSION_GROUPS',
+    'SIGNATURES',
+    'TEXT_EXTENSIONS',
+    'SNIFF_SIZE',
+    'UploadRejected',
+    'expand_extensions',
+    'read_head',
+    'sniff_content',
+    'sniff_upload',
+    'check_content_length',
+)
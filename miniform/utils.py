@@ -1,9 +1,14 @@
-from typing import Union
-
-import bcrypt
+import asyncio
+import enum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Union, Awaitable, TypeVar, Any, Optional, Tuple, Type
 
+from markupsafe import escape
 from sqlalchemy.orm import DeclarativeBase
 
+T = TypeVar("T")
+
 
 def get_class_name_with_table_name(name: str):
     """
@@ -50,6 +55,8 @@ def hashed_func(value: Union[str, int, float]):
     Returns:
         str
     """
+    import bcrypt  # импортируется только при работе с паролями
+
     password = str(value).encode("utf-8")
     salt = bcrypt.gensalt()
     hashed_password = bcrypt.hashpw(password, salt)
@@ -67,9 +74,172 @@ def check_hash(input_password: str, hashed_password: str) -> bool:
     Returns:
         bool
     """
+    import bcrypt  # импортируется только при работе с паролями
+
     input_password = str(input_password).encode("utf-8")
     hashed_password = hashed_password.encode("utf-8")
     return bcrypt.checkpw(input_password, hashed_password)
 
 
-__all__ = ('hashed_func', 'check_hash', 'get_class_name_with_table_name')
\ No newline at end of file
+def apply_nest_asyncio() -> None:
+    """
+    Разрешает вложенный вызов asyncio.run. Модуль nest_asyncio импортируется при первом вызове.
+
+    Returns:
+        None
+    """
+    import nest_asyncio
+
+    nest_asyncio.apply()
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """
+    Выполняет корутину из синхронного кода.
+
+    Внутри greenlet SQLAlchemy (например, в process_bind_param при flush асинхронной сессии)
+    корутина выполняется в текущем цикле событий через await_only, иначе через asyncio.run.
+
+    Args:
+        awaitable: корутина.
+
+    Returns:
+        результат корутины
+    """
+    from sqlalchemy.util.concurrency import in_greenlet, await_only
+
+    if in_greenlet():
+        return await_only(awaitable)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+    apply_nest_asyncio()
+    return asyncio.run(awaitable)
+
+
+class EnumOptions(dict):
+    """
+    Неизменяемые опции select для Enum: имя элемента -> значение.
+
+    Создаются один раз на Enum (enum_options), содержат готовые фрагменты <option> и словарь
+    для перевода значения поля (элемент Enum, имя или значение) в ключ опции.
+    Является dict, поэтому сериализуется в JSON и копируется как обычные опции.
+    """
+
+    def __init__(self, source: Union[Type[enum.Enum], Tuple[str, ...]]):
+        """
+        Конструктор класса.
+
+        Args:
+            source: класс Enum или кортеж строковых значений Enum колонки без enum_class.
+        """
+        if isinstance(source, enum.EnumMeta):
+            items = [(str(member.name), member.value) for member in source]
+        else:
+            items = [(value, value) for value in source]
+        super().__init__(items)
+        self.source = source
+        fragments = {}
+        lookup = {}
+        for key, value in items:
+            fragments[key] = tuple(
+                f'<option value="{escape(key)}"{marker}>{escape(value)}</option>\n' for marker in ("", " selected")
+            )
+            if _hashable(value):
+                lookup.setdefault(value, key)
+        if isinstance(source, enum.EnumMeta):
+            lookup.update({member: str(member.name) for member in source})
+        lookup.update({key: key for key, _ in items})
+        self.fragments = MappingProxyType(fragments)
+        # не keys: имя занято методом dict.keys()
+        self._lookup = MappingProxyType(lookup)
+        self._rendered = {}
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} is read-only")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __reduce__(self):
+        # в другом процессе опции берутся из кэша enum_options
+        return enum_options, (self.source,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def key_of(self, value: Any) -> Any:
+        """
+        Возвращает ключ опции для значения поля.
+
+        Args:
+            value: элемент Enum, имя элемента или его значение.
+
+        Returns:
+            ключ опции или исходное значение, если опция не найдена.
+        """
+        if not _hashable(value):
+            return value
+        return self._lookup.get(value, value)
+
+    def render(self, label: str, selected: Optional[str] = None) -> str:
+        """
+        Возвращает html опций с отмеченной выбранной опцией.
+
+        Результат для каждой пары подпись-выбранная опция вычисляется один раз.
+
+        Args:
+            label: подпись группы опций.
+            selected: ключ выбранной опции.
+
+        Returns:
+            str
+        """
+        cache_key = (label, selected if selected in self.fragments else None)
+        html = self._rendered.get(cache_key)
+        if html is None:
+            html = self._rendered[cache_key] = (
+                f'\n<optgroup label="{escape(label)}">\n'
+                '<option value="" hidden>---select---</option>\n'
+                + "".join(
+                    fragment[key == cache_key[1]] for key, fragment in self.fragments.items()
+                )
+                + "</optgroup>\n"
+            )
+        return html
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def enum_options(source: Union[Type[enum.Enum], Tuple[str, ...]]) -> EnumOptions:
+    """
+    Возвращает опции select для Enum, вычисленные один раз на Enum.
+
+    Args:
+        source: класс Enum или кортеж строковых значений.
+
+    Returns:
+        EnumOptions
+    """
+    return EnumOptions(source)
+
+
+__all__ = (
+    'hashed_func',
+    'check_hash',
+    'get_class_name_with_table_name',
+    'apply_nest_asyncio',
+    'run_sync',
+    'EnumOptions',
+    'enum_options',
+)
\ No newline at end of file
@@ -1,14 +1,17 @@
+import inspect
 import re
 from abc import abstractmethod
 from datetime import datetime, date, time
+from enum import Enum
 from functools import wraps
-from importlib import import_module
 from typing import Union, Dict, Any, Optional, Type, Callable, TypedDict
-import nest_asyncio
 from markupsafe import Markup, escape
 
 from sqlalchemy.orm import DeclarativeBase
 
+from miniform.utils import apply_nest_asyncio, EnumOptions
+from miniform.uploads import EXTENSION_GROUPS, sniff_upload
+
 
 class TextWidgetExtraAttrs(TypedDict, total=False):
     """
@@ -217,6 +220,11 @@ class AbstractWidget:
     pattern: str = None
     value_type: Optional[Type[Any]] = None
     list_error: list = None
+    multiple: bool = False  # поле принимает несколько значений с одним именем
+    partial_options: bool = False  # опции содержат только текущие значения, остальные проверяет форма
+    options_loader: Optional[Callable[[], dict]] = None  # загрузка полного списка опций при первом обращении
+    _options: dict = None
+    _field: Any = None
 
     def __init__(
             self,
@@ -232,6 +240,8 @@ class AbstractWidget:
             extensions: str = None,
             prefix: str = None,
             validator: Callable = None,
+            fail_fast: bool = False,
+            multiple: bool = None,
     ):
         self.name = name or None  #
         self.label_name = label
@@ -244,7 +254,50 @@ class AbstractWidget:
         self.options = options or {}
         self.extensions = extensions or None
         self.prefix = prefix or None
-        self.default_validator = validator or self.default_validator  #
+        self.fail_fast = fail_fast or False
+        if multiple is not None:
+            self.multiple = multiple
+        self.async_validator = None
+        if validator is not None and inspect.iscoroutinefunction(validator):
+            # асинхронный валидатор выполняется формой после синхронных проверок
+            self.async_validator = validator
+        else:
+            self.default_validator = validator or self.default_validator  #
+
+    @property
+    def options(self) -> dict:
+        """
+        Опции поля. Отложенные опции (options_loader) загружаются при первом обращении, например при выводе.
+
+        Returns:
+            dict
+        """
+        if self.options_loader is not None:
+            loader, self.options_loader = self.options_loader, None
+            self._options = loader()
+            self.partial_options = False
+        return self._options
+
+    @options.setter
+    def options(self, value: dict) -> None:
+        self.options_loader = None
+        self._options = value
+
+    @property
+    def field(self) -> Any:
+        """
+        HTML поля ввода. None в качестве значения сбрасывает HTML, он строится заново при следующем обращении.
+
+        Returns:
+            Markup
+        """
+        if self._field is None:
+            self._field = self.get_input()
+        return self._field
+
+    @field.setter
+    def field(self, value: Any) -> None:
+        self._field = value
 
     def __set_name__(self, owner, name):
         self.name = name
@@ -252,6 +305,21 @@ class AbstractWidget:
     def get_structure_extra_attrs(self):
         pass
 
+    def add_error(self, message: str) -> bool:
+        """
+        Добавляет сообщение об ошибке валидации.
+
+        Args:
+            message: текст ошибки.
+
+        Returns:
+            bool: True, если проверку нужно прекратить после первой ошибки.
+        """
+        if self.list_error is None:
+            self.list_error = []
+        self.list_error.append(message)
+        return self.fail_fast
+
     @abstractmethod
     def __getitem__(self, item):
         raise NotImplementedError
@@ -286,12 +354,33 @@ class AbstractWidget:
     def convert(self, value):
         raise NotImplementedError
 
+    def serialize(self, value: Any) -> Any:
+        """
+        Приводит значение поля к виду для выгрузки в JSON или CSV.
+
+        Args:
+            value: значение поля.
+
+        Returns:
+            None, str, int, float, bool или список таких значений.
+        """
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        if isinstance(value, (list, tuple, set)):
+            return [self.serialize(item) for item in value]
+        if isinstance(value, Enum):
+            return value.name
+        filename = getattr(value, "filename", None)
+        if isinstance(filename, str):
+            return filename
+        return str(value)
+
 
 class BaseWidget(AbstractWidget):
 
     @wraps(AbstractWidget.__init__)
     def __init__(self, *args, **kwargs):
-        nest_asyncio.apply()
+        apply_nest_asyncio()
         super().__init__(*args, **kwargs)
         self.label_field = self.get_label()
         self.field = self.get_input()
@@ -450,17 +539,20 @@ class BaseWidget(AbstractWidget):
         if value in (None, ""):
             return True
         if value in (None, "") and self.required:
-            self.list_error.append(f" Field cannot be empty")
+            if self.add_error(f" Field cannot be empty"):
+                return False
         if not isinstance(value, self.value_type):
             value = self.convert(value)
         if minlength is not None and minlength > len(value):
-            self.list_error.append(
+            if self.add_error(
                 f" The value must be longer than {minlength} and shorter than {maxlength}."
-            )
+            ):
+                return False
         if maxlength is not None and maxlength < len(value):
-            self.list_error.append(
+            if self.add_error(
                 f" The value must be longer than {minlength} and shorter than {maxlength}."
-            )
+            ):
+                return False
         if not re.fullmatch(self.pattern, escape(value)):
             special_chars = re.sub(
                 r"[a-zA-Zа-яА-Я0-9\s]", "", self.pattern.split("[")[1].split("]")[0]
@@ -469,9 +561,10 @@ class BaseWidget(AbstractWidget):
             unique_chars = "".join(
                 sorted(set(special_chars), key=lambda x: special_chars.index(x))
             )
-            self.list_error.append(
+            if self.add_error(
                 f" Field value contains invalid characters. Use letters, numbers and {unique_chars}"
-            )
+            ):
+                return False
         return len(self.list_error) == 0
 
     def get_options_select(self):
@@ -517,13 +610,15 @@ class EmailWidget(BaseWidget):
         if not isinstance(value, self.value_type):
             value = self.convert(value)
         if value in (None, "") and self.required:
-            self.list_error.append(f" Field cannot be empty")
+            if self.add_error(f" Field cannot be empty"):
+                return False
         if value in (None, "") and not self.required:
             return True
         if not re.fullmatch(self.pattern, escape(value)):
-            self.list_error.append(
+            if self.add_error(
                 " The value does not meet the requirements for an email address."
-            )
+            ):
+                return False
         return len(self.list_error) == 0
 
 
@@ -541,23 +636,27 @@ class IntegerWidget(BaseWidget):
         min = self.convert(self.extra_attrs.get("min", None))
         max = self.convert(self.extra_attrs.get("max", None))
         if (value is None or value == "") and self.required:
-            self.list_error.append(f" Field cannot be empty.")
+            if self.add_error(f" Field cannot be empty."):
+                return False
         if (value is None or value == "") and not self.required:
             return True
         if (min is not None and value < min) or (
                 max is not None and value > max
         ):
-            self.list_error.append(
+            if self.add_error(
                 f" Field must be greater than {min} and less than {max}"
-            )
+            ):
+                return False
         if (minlength is not None and len(str(value)) < minlength) or (
                 maxlength is not None and len(str(value)) > maxlength
         ):
-            self.list_error.append(
+            if self.add_error(
                 f" The number of characters must be greater than {minlength} and less than {maxlength}"
-            )
+            ):
+                return False
         if not re.fullmatch(self.pattern, str(value)):
-            self.list_error.append(" Value does not meet requirements.")
+            if self.add_error(" Value does not meet requirements."):
+                return False
         return len(self.list_error) == 0
 
 
@@ -576,20 +675,24 @@ class FloatWidget(BaseWidget):
         maxlength = int(self.extra_attrs.get("maxlength", 256))
         if value in (None, ""):
             if self.required:
-                self.list_error.append(f" Field cannot be empty.")
+                if self.add_error(f" Field cannot be empty."):
+                    return False
             return not self.required
         if (min is not None and value < min) or (
                 max is not None and value > max
         ):
-            self.list_error.append(
+            if self.add_error(
                 f" Length must be between {min} and {max}"
-            )
+            ):
+                return False
         if len(str(value)) < minlength or len(str(value)) > maxlength:
-            self.list_error.append(
+            if self.add_error(
                 f"Length must be between {minlength} and {maxlength} chars"
-            )
+            ):
+                return False
         if not re.fullmatch(self.pattern, str(value)):
-            self.list_error.append("Invalid format")
+            if self.add_error("Invalid format"):
+                return False
         return len(self.list_error) == 0
 
 
@@ -699,18 +802,21 @@ class PasswordWidget(BaseWidget):
         if value in (None, "") and not self.required and minlength == 0:
             return True
         if (value in (None, "") and self.required) or minlength != 0:
-            self.list_error.append(f" Value cannot be empty")
+            if self.add_error(f" Value cannot be empty"):
+                return False
         if not isinstance(value, self.value_type):
             value = self.convert(value)
         print(minlength, value, "test")
         if minlength is not None and minlength > len(value) if value is not None else 0:
-            self.list_error.append(
+            if self.add_error(
                 f" Content should be shorter than {minlength} and longer than {maxlength}."
-            )
+            ):
+                return False
         if maxlength is not None and maxlength < len(value) if value is not None else 0:
-            self.list_error.append(
+            if self.add_error(
                 f" Content should be shorter than {minlength} and longer than {maxlength}."
-            )
+            ):
+                return False
         if not re.fullmatch(self.pattern, escape(value)):
             special_chars = re.sub(
                 r"[a-zA-Zа-яА-Я0-9\s]", "", self.pattern.split("[")[1].split("]")[0]
@@ -719,9 +825,10 @@ class PasswordWidget(BaseWidget):
             unique_chars = "".join(
                 sorted(set(special_chars), key=lambda x: special_chars.index(x))
             )
-            self.list_error.append(
+            if self.add_error(
                 f" Contains invalid characters. Use letters, numbers and {unique_chars}"
-            )
+            ):
+                return False
         return len(self.list_error) == 0
 
 
@@ -758,19 +865,20 @@ class TimeWidget(BaseWidget):
             and value != "None"
         )
 
+    def serialize(self, value: Any) -> Any:
+        if isinstance(value, time):
+            return value.strftime("%H:%M:%S")
+        return super().serialize(value)
+
     def get_data_to_dict(self):
-        current_value = list(self.init_data.values())[0]
+        current_value = self.serialize(self.init_data.get(self.name)) or ""
         if not self.list_error:
             widget_dict = {
                 self.name: {
                     "type": self.type,
                     "name": self.prefix + "_" + self.name if self.prefix else self.name,
                     "label": self.label_name,
-                    "value": (
-                        current_value
-                        if isinstance(current_value, str)
-                        else current_value.strftime("%H:%M:%S")
-                    ),
+                    "value": current_value,
                     "attrs": {},
                 }
             }
@@ -792,11 +900,7 @@ class TimeWidget(BaseWidget):
         widget_dict = {
             self.name: {
                 "type": "error",
-                "value": (
-                    current_value
-                    if isinstance(current_value, str)
-                    else current_value.strftime("%H:%M:%S")
-                ),
+                "value": current_value,
                 "detail": "".join(value for value in self.list_error),
             }
         }
@@ -808,21 +912,25 @@ class TimeWidget(BaseWidget):
         setattr(self, "field", self.get_input())
         if value is None:
             if self.required:
-                self.list_error.append(f"{self.name} cannot be empty")
+                if self.add_error(f"{self.name} cannot be empty"):
+                    return False
             return not self.required
         try:
             min_value = self.convert(self.extra_attrs.get("min", None))
             max_value = self.convert(self.extra_attrs.get("max", None))
             if min_value is not None and value < min_value:
-                self.list_error.append(
+                if self.add_error(
                     f' Value must be after {min_value.strftime("%Y-%m-%d")}'
-                )
+                ):
+                    return False
             if max_value is not None and value > max_value:
-                self.list_error.append(
+                if self.add_error(
                     f" Value must be before {max_value.strftime('%Y-%m-%d')}"
-                )
+                ):
+                    return False
         except (TypeError, AttributeError) as e:
-            self.list_error.append(f"Invalid range values: {str(e)}")
+            if self.add_error(f"Invalid range values: {str(e)}"):
+                return False
         return len(self.list_error) == 0
 
 
@@ -861,19 +969,20 @@ class DateWidget(BaseWidget):
             and value != "None"
         )
 
+    def serialize(self, value: Any) -> Any:
+        if isinstance(value, date):
+            return value.strftime("%Y-%m-%d")
+        return super().serialize(value)
+
     def get_data_to_dict(self):
-        current_value = list(self.init_data.values())[0]
+        current_value = self.serialize(self.init_data.get(self.name)) or ""
         if not self.list_error:
             widget_dict = {
                 self.name: {
                     "type": self.type,
                     "name": self.prefix + "_" + self.name if self.prefix else self.name,
                     "label": self.label_name,
-                    "value": (
-                        current_value
-                        if isinstance(current_value, str)
-                        else current_value.strftime("%Y-%m-%d")
-                    ),
+                    "value": current_value,
                     "attrs": {},
                 }
             }
@@ -895,11 +1004,7 @@ class DateWidget(BaseWidget):
         widget_dict = {
             self.name: {
                 "type": "error",
-                "value": (
-                    current_value
-                    if isinstance(current_value, str)
-                    else current_value.strftime("%Y-%m-%d")
-                ),
+                "value": current_value,
                 "detail": "".join(value for value in self.list_error),
             }
         }
@@ -911,21 +1016,25 @@ class DateWidget(BaseWidget):
         setattr(self, "field", self.get_input())
         if value is None:
             if self.required:
-                self.list_error.append(f" Field cannot be empty")
+                if self.add_error(f" Field cannot be empty"):
+                    return False
             return not self.required
         try:
             min_value = self.convert(self.extra_attrs.get("min", None))
             max_value = self.convert(self.extra_attrs.get("max", None))
             if min_value is not None and value < min_value:
-                self.list_error.append(
+                if self.add_error(
                     f' Value must be after {min_value.strftime("%Y-%m-%d")}'
-                )
+                ):
+                    return False
             if max_value is not None and value > max_value:
-                self.list_error.append(
+                if self.add_error(
                     f" Value must be before {max_value.strftime('%Y-%m-%d')}"
-                )
+                ):
+                    return False
         except (TypeError, AttributeError) as e:
-            self.list_error.append(f"Invalid range values: {str(e)}")
+            if self.add_error(f"Invalid range values: {str(e)}"):
+                return False
         return len(self.list_error) == 0
 
 
@@ -969,43 +1078,46 @@ class DateTimeWidget(BaseWidget):
     def default_validator(self, value: Optional[datetime]) -> bool:
         self.list_error = []
         self.init_data[self.name] = value
+        setattr(self, "field", self.get_input())
         if value is None:
             if self.required:
-                self.list_error.append(f" Field cannot be empty")
+                if self.add_error(f" Field cannot be empty"):
+                    return False
             return not self.required
         try:
             min_value = self.convert(self.extra_attrs.get("min", None))
             max_value = self.convert(self.extra_attrs.get("max", None))
             if min_value is not None and value < min_value:
-                self.list_error.append(
+                if self.add_error(
                     f' Value must be after {min_value.strftime("%Y-%m-%d %H:%M:%S")}'
-                )
+                ):
+                    return False
             if max_value is not None and value > max_value:
-                self.list_error.append(
+                if self.add_error(
                     f" Value must be before {max_value.strftime('%Y-%m-%d %H:%M:%S')}"
-                )
+                ):
+                    return False
         except (TypeError, AttributeError) as e:
-            self.list_error.append(f"Invalid range values: {str(e)}")
-        setattr(self, "field", self.get_input())
+            if self.add_error(f"Invalid range values: {str(e)}"):
+                return False
         return len(self.list_error) == 0
 
+    def serialize(self, value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        return super().serialize(value)
+
     def get_data_to_dict(self):
-        current_value = list(self.init_data.values())[0]
+        current_value = self.serialize(self.init_data.get(self.name)) or ""
         for key, value in self.extra_attrs.items():
             if key in ("min", "max"):
-                self.extra_attrs[key] = self.extra_attrs[key].strftime(
-                    "%Y-%m-%d %H:%M:%S"
-                )
+                self.extra_attrs[key] = self.serialize(value)
         if not self.list_error:
             widget_dict = {
                 self.name: {
                     "type": self.type,
                     "name": self.get_widget_prefix(),
-                    "value": (
-                        current_value
-                        if isinstance(current_value, str)
-                        else current_value.strftime("%Y-%m-%d %H:%M:%S")
-                    ),
+                    "value": current_value,
                     "attrs": {},
                 }
             }
@@ -1027,11 +1139,7 @@ class DateTimeWidget(BaseWidget):
         widget_dict = {
             self.name: {
                 "type": "error",
-                "value": (
-                    current_value
-                    if isinstance(current_value, str)
-                    else current_value.strftime("%T-%m-%d %H:%M:%S")
-                ),
+                "value": current_value,
                 "detail": "".join(value for value in self.list_error),
             }
         }
@@ -1041,6 +1149,7 @@ class DateTimeWidget(BaseWidget):
 class SelectWidget(BaseWidget):
     type = "select"
     value_type = str
+    foreign_key = None
 
     def get_input(self) -> str:
         html_icon = Markup(" <em>*</em>") if self.required else Markup("")
@@ -1049,16 +1158,21 @@ class SelectWidget(BaseWidget):
         options_select = self.get_options_select()
         extra_attrs = self.get_extra_attrs()
 
+        multiple = " multiple" if self.multiple else ""
         return (
             Markup(
                 f'<{self.type} name="{value}" id="{value}"'
-                f"{attrs}{extra_attrs}>{options_select}</{self.type}>"
+                f"{attrs}{multiple}{extra_attrs}>{options_select}</{self.type}>"
             )
             + html_icon
             + Markup("<br>\n")
         )
 
     def get_options_select(self) -> str:
+        if isinstance(self.options, EnumOptions):
+            # опции Enum отрисованы заранее, остается отметить выбранную
+            init_value = self.get_init_value()
+            return self.options.render(self.label_name, next(iter(init_value.values())) if init_value else None)
         # Генерация HTML для каждого ключа и списка значений
         if self.options:
             options_select = f'\n<optgroup label="{self.label_name}">\n'
@@ -1096,6 +1210,8 @@ class SelectWidget(BaseWidget):
         :return: dict
         """
         for key, value in self.init_data.items():
+            if isinstance(self.options, EnumOptions):
+                return {key: str(self.options.key_of(value))}
             try:
                 return {key: str(value.name)}
             except Exception:
@@ -1105,6 +1221,9 @@ class SelectWidget(BaseWidget):
         current_value: Union[str, int, Any] = None
         if self.init_data:
             for key, value in self.init_data.items():
+                if isinstance(self.options, EnumOptions):
+                    current_value = self.options.key_of(value)
+                    continue
                 try:
                     current_value = value.name
                 except:
@@ -1130,6 +1249,8 @@ class SelectWidget(BaseWidget):
                 widget_dict[self.name]["attrs"]["required"] = True
             if self.disabled:
                 widget_dict[self.name]["attrs"]["disabled"] = True
+            if self.multiple:
+                widget_dict[self.name]["attrs"]["multiple"] = True
             if self.extensions:
                 widget_dict[self.name]["attrs"]["extensions"] = self.extensions
             if self.options:
@@ -1147,16 +1268,59 @@ class SelectWidget(BaseWidget):
     def default_validator(self, value):
         self.list_error = []
         self.init_data[self.name] = value
-        setattr(self, "field", self.get_input())
-        if value in (None, ""):
+        # HTML строится при выводе: проверка не загружает отложенные опции
+        self.field = None
+        options = self._options
+        if value in (None, "", []):
             if self.required:
-                self.list_error.append(f" Field cannot be empty")
-        if value in list(self.options.keys()):
+                if self.add_error(f" Field cannot be empty"):
+                    return False
+            else:
+                return True
+        if isinstance(value, list):
+            if not self.multiple or (
+                    options and not self.partial_options and any(item not in options for item in value)
+            ):
+                if self.add_error(f" Invalid value for {self.name}"):
+                    return False
+            return len(self.list_error) == 0
+        if value in options:
             return True
-        self.list_error.append(f" Invalid value for {self.name}")
+        if self.foreign_key is not None and (not options or self.partial_options):
+            # опции не загружены, существование значения проверяет форма запросом в базу данных
+            return len(self.list_error) == 0
+        if self.add_error(f" Invalid value for {self.name}"):
+            return False
         return len(self.list_error) == 0
 
 
+class MultiSelectWidget(SelectWidget):
+    """
+    Список с выбором нескольких значений, например для связи многие-ко-многим.
+
+    Значение поля - список ключей выбранных опций.
+    """
+    multiple = True
+
+    def get_selected(self) -> set:
+        value = self.init_data.get(self.name)
+        if value in (None, ""):
+            return set()
+        if not isinstance(value, (list, tuple, set)):
+            value = [value]
+        return {str(item) for item in value}
+
+    def get_options_select(self) -> str:
+        if not self.options:
+            return ""
+        selected = self.get_selected()
+        options_select = f'\n<optgroup label="{escape(self.label_name)}">\n'
+        for pk, value in self.options.items():
+            marker = " selected" if str(pk) in selected else ""
+            options_select += f'<option value="{escape(pk)}"{marker}>{escape(value)}</option>\n'
+        return options_select + "</optgroup>\n"
+
+
 class CheckboxWidget(BaseWidget):
     type = "checkbox"
     value_type = bool
@@ -1178,7 +1342,8 @@ class CheckboxWidget(BaseWidget):
         self.init_data[self.name] = value
         setattr(self, "field", self.get_input())
         if value in (None, "", False) and self.required:
-            self.list_error.append(f" {self.name} cannot be empty.")
+            if self.add_error(f" {self.name} cannot be empty."):
+                return False
         return len(self.list_error) == 0
 
 
@@ -1186,6 +1351,8 @@ class FileWidget(BaseWidget):
     type = "file"
     pattern = r"^.+(\.pdf|\.doc|\.docx|\.xls|\.xlsx|\.txt)$"
     value_type = str
+    max_size = None  # максимальный размер файла в байтах, ModelForm берет его из FileField
+    sniff_content = True  # проверять сигнатуру первого блока файла по расширению
 
     def get_input(self) -> str:
         html_icon = Markup(" <em>*</em>") if self.required else Markup("")
@@ -1228,29 +1395,11 @@ class FileWidget(BaseWidget):
         return attrs
 
     def get_extensions_pattern(self):
-        # в словарь добавлен самый минимум
-        extension_groups = {
-            "image/*": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"],
-            "document/*": [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".txt"],
-            "audio/*": [".mp3", ".wav", ".ogg", ".aac", ".flac", ".m4a", ".wma"],
-            "video/*": [
-                ".mp4",
-                ".avi",
-                ".mkv",
-                ".mov",
-                ".wmv",
-                ".flv",
-                ".webm",
-                ".mpeg",
-            ],
-            "archive/*": [".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz"],
-            "text/*": [".txt", ".csv", ".json", ".xml", ".html", ".css", ".js", ".log"],
-        }
         if self.extensions and isinstance(self.extensions, list):
             expanded_extensions = []
             for ext in self.extensions:
-                if ext in extension_groups:
-                    expanded_extensions.extend(extension_groups[ext])
+                if ext in EXTENSION_GROUPS:
+                    expanded_extensions.extend(EXTENSION_GROUPS[ext])
                 else:
                     expanded_extensions.append(ext)
             extensions_pattern = "|".join(
@@ -1264,20 +1413,33 @@ class FileWidget(BaseWidget):
         if value in (None, "") and not self.required:
             return True
         if hasattr(value, "size") and value.size == 0 and self.required:
-            self.list_error.append(f" {self.name} cannot be empty.")
+            if self.add_error(f" {self.name} cannot be empty."):
+                return False
         if not hasattr(value, "filename"):
-            self.list_error.append(f" {self.name} is invalid: data type is unknown.")
+            if self.add_error(f" {self.name} is invalid: data type is unknown."):
+                return False
         if value.size == 0 and not self.required:
             return True
+        # размер известен из заголовков части multipart, файл для проверки не читается
+        if self.max_size is not None and value.size is not None and value.size > self.max_size:
+            if self.add_error(f" File size exceeds maximum allowed {self.max_size / 1024}KB."):
+                return False
         extensions = self.get_extensions_pattern()
         if value.filename != "":
             try:
-                if re.fullmatch(extensions, value.filename):
-                    return True
+                matched = re.fullmatch(extensions, value.filename)
             except re.error:
-                self.list_error.append(
+                matched = None
+            if not matched:
+                if self.add_error(
                     f" The selected file: {value.filename} type is not supported."
-                )
+                ):
+                    return False
+            elif self.sniff_content and not sniff_upload(value.file, value.filename):
+                if self.add_error(
+                    f" The content of the file: {value.filename} does not match its type."
+                ):
+                    return False
         if self.list_error:
             setattr(self, "field", self.get_input())
         return len(self.list_error) == 0
@@ -1290,8 +1452,11 @@ class FileWidget(BaseWidget):
 
 class ImageWidget(FileWidget):
     pattern = r"^.+(\.jpg|\.jpeg|\.png|\.gif|\.bmp|\.webp)$"
+    image_field = None
 
     def get_widget_attrs(self) -> str:
+        if not self.extensions:
+            return super().get_widget_attrs()
         accept_ext = ", ".join(self.extensions)
         attrs = (
             (" required" if self.required else "")
@@ -1300,7 +1465,38 @@ class ImageWidget(FileWidget):
         )
         return attrs
 
+    def get_srcset(self) -> str:
+        """
+        Метод возвращающий значение атрибута srcset из производных изображений поля ImageField.
+
+        Дескриптор w - фактическая ширина производного файла, а не ширина рамки из derivatives:
+        thumbnail сохраняет пропорции и не увеличивает изображение, поэтому из производных одинаковой
+        ширины (маленький исходный файл) в srcset попадает одна.
+        Returns:
+            str
+        """
+        file_path = self.init_data.get(self.name)
+        if not file_path or not isinstance(file_path, str) or self.image_field is None:
+            return ""
+        derivative_paths = self.image_field.get_derivative_paths(file_path)
+        by_width = {}
+        for name, (width, height) in self.image_field.get_derivative_sizes(file_path).items():
+            by_width.setdefault(width, derivative_paths[name])
+        return ", ".join(f"{escape(by_width[width])} {width}w" for width in sorted(by_width))
+
     @property
     def show(self):
         file_path = escape(self.init_data.get(self.name))
-        return Markup(f'<img src="{file_path}" alt="Image"')
+        srcset = self.get_srcset()
+        srcset_attr = f' srcset="{srcset}"' if srcset else ""
+        return Markup(f'<img src="{file_path}"{srcset_attr} alt="Image" />')
+
+
+__all__ = (
+    'TextWidgetExtraAttrs', 'TextAreaWidgetExtraAttrs', 'EmailWidgetExtraAttrs', 'IntegerWidgetExtraAttrs',
+    'FloatWidgetExtraAttrs', 'RangeWidgetExtraAttrs', 'PasswordWidgetExtraAttrs', 'TimeWidgetExtraAttrs',
+    'DateWidgetExtraAttrs', 'DateTimeWidgetExtraAttrs', 'SelectWidgetExtraAttrs', 'CheckBoxWidgetExtraAttrs',
+    'FileWidgetExtraAttrs', 'ExtraAttrsDict', 'AbstractWidget', 'BaseWidget', 'TextWidget', 'TextAreaWidget',
+    'EmailWidget', 'IntegerWidget', 'FloatWidget', 'RangeWidget', 'PasswordWidget', 'TimeWidget', 'DateWidget',
+    'DateTimeWidget', 'SelectWidget', 'MultiSelectWidget', 'CheckboxWidget', 'FileWidget', 'ImageWidget',
+)
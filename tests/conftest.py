@@ -0,0 +1,35 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from tests.models import Base, Category, Tag
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    """Фабрика сессий файловой базы sqlite с категориями 1 и 2 и тегами 1, 2, 3."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add_all([Category(title="a"), Category(title="b")])
+        session.add_all([Tag(name="t1"), Tag(name="t2"), Tag(name="t3")])
+        await session.commit()
+    yield maker
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(session_maker):
+    """SQL-запросы, выполненные базой session_maker во время теста."""
+    recorded = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    engine = session_maker.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
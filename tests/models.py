@@ -0,0 +1,118 @@
+import enum
+import io
+
+from sqlalchemy import Boolean, Column, Enum, ForeignKey, String, Table
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from miniform import ModelForm
+from miniform.fields import FileField, ImageField
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Color(enum.Enum):
+    red = "Red"
+    green = "Green"
+
+
+class Category(Base):
+    __tablename__ = "test_category"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(50), unique=True)
+
+    def __str__(self):
+        return self.title
+
+
+class Product(Base):
+    __tablename__ = "test_product"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True)
+    sku: Mapped[str] = mapped_column(String(50), unique=True, nullable=True)
+    active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=True)
+    color = mapped_column(Enum(Color), nullable=True)
+    category_id: Mapped[int] = mapped_column(ForeignKey("test_category.id"), nullable=True)
+    category = relationship(Category)
+
+
+post_tag = Table(
+    "test_post_tag",
+    Base.metadata,
+    Column("post_id", ForeignKey("test_post.id"), primary_key=True),
+    Column("tag_id", ForeignKey("test_tag.id"), primary_key=True),
+)
+
+
+class Tag(Base):
+    __tablename__ = "test_tag"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+
+    def __str__(self):
+        return self.name
+
+
+class Post(Base):
+    __tablename__ = "test_post"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(50))
+    tags = relationship(Tag, secondary=post_tag)
+
+
+class Document(Base):
+    __tablename__ = "test_document"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    file = mapped_column(FileField(upload_to="docs", max_size=64, allowed_extensions=["text/*"]), nullable=True)
+
+
+class Photo(Base):
+    __tablename__ = "test_photo"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    image = mapped_column(
+        ImageField(
+            upload_to="photos",
+            max_size=1024,
+            derivatives={"thumb": (100, 100), "medium": (400, 400), "large": (800, 800)},
+        ),
+        nullable=True,
+    )
+
+
+class CleanPhoto(Base):
+    __tablename__ = "test_clean_photo"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    image = mapped_column(
+        ImageField(upload_to="clean", max_size=1024, derivatives={"thumb": (100, 100)}, strip_exif=True),
+        nullable=True,
+    )
+
+
+class Upload:
+    """Загруженный файл с атрибутами UploadFile, которые использует miniform."""
+
+    def __init__(self, content: bytes, filename: str = "report.txt"):
+        self.filename = filename
+        self.size = len(content)
+        self.file = io.BytesIO(content)
+
+
+class ProductForm(ModelForm):
+    model = Product
+
+
+class CategoryForm(ModelForm):
+    model = Category
+
+
+class PostForm(ModelForm):
+    model = Post
+
+
+class PhotoForm(ModelForm):
+    model = Photo
+
+
+class CleanPhotoForm(ModelForm):
+    model = CleanPhoto
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from miniform import Form
+from miniform.widgets import TextWidget
+from tests.models import ProductForm
+
+running = []
+active = 0
+
+
+async def tracked(value):
+    global active
+    active += 1
+    running.append(active)
+    await asyncio.sleep(0.01)
+    active -= 1
+    return value != "bad"
+
+
+async def slow(value):
+    await asyncio.sleep(1)
+    return True
+
+
+class CheckedForm(Form):
+    validation_concurrency = 2
+    a = TextWidget(name="a", validator=tracked)
+    b = TextWidget(name="b", validator=tracked)
+    c = TextWidget(name="c", validator=tracked)
+    d = TextWidget(name="d", validator=tracked)
+    e = TextWidget(name="e", validator=tracked)
+
+
+class SlowForm(Form):
+    validator_timeout = 0.05
+    a = TextWidget(name="a", validator=slow)
+    b = TextWidget(name="b", validator=tracked)
+
+
+@pytest.mark.asyncio
+async def test_async_validators_respect_concurrency_limit():
+    running.clear()
+    form = CheckedForm()
+    assert not await form.is_valid({"a": "x", "b": "bad", "c": "x", "d": "x", "e": "bad"})
+    assert sorted(form.errors) == ["b", "e"]
+    assert len(running) == 5
+    assert max(running) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_validator_timeout():
+    form = SlowForm()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert not await form.is_valid({"a": "x", "b": "x"})
+    assert loop.time() - started < 0.5
+    assert form.errors == {"a": "Validation timed out"}
+
+
+@pytest.mark.asyncio
+async def test_database_checks_run_after_async_validators(session_maker, statements):
+    seen = []
+
+    async def check_name(value):
+        before = len(statements)
+        await asyncio.sleep(0.05)
+        # проверки базы данных не выполняются на той же сессии одновременно с валидатором
+        seen.append(len(statements) - before)
+        return True
+
+    form = ProductForm(session=session_maker())
+    form.fields["name"].async_validator = check_name
+    statements.clear()
+    assert not await form.is_valid({"name": "p", "category_id": "9"})
+    assert list(form.errors) == ["category_id"]
+    assert seen == [0]
+    assert statements
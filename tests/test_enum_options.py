@@ -0,0 +1,47 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from miniform.utils import EnumOptions, enum_options
+from tests.models import Color, ProductForm
+
+
+def test_enum_options_behave_like_dict():
+    options = enum_options(Color)
+    assert options is enum_options(Color)
+    assert list(options.keys()) == ["red", "green"]
+    assert list(options.values()) == ["Red", "Green"]
+    assert dict(options) == {"red": "Red", "green": "Green"}
+    assert json.loads(json.dumps(options)) == {"red": "Red", "green": "Green"}
+    with pytest.raises(TypeError):
+        options["blue"] = "Blue"
+
+
+def test_enum_options_key_lookup_and_copies():
+    options = enum_options(Color)
+    assert options.key_of(Color.green) == "green"
+    assert options.key_of("green") == "green"
+    assert options.key_of("Green") == "green"
+    assert options.key_of("missing") == "missing"
+    assert copy.deepcopy(options) is options
+    assert pickle.loads(pickle.dumps(options)) is options
+
+
+def test_enum_options_render_marks_selected_and_escapes():
+    options = EnumOptions(("a{b}", "<x>"))
+    html = options.render("Label", "<x>")
+    assert '<option value="a{b}">a{b}</option>' in html
+    assert '<option value="&lt;x&gt;" selected>&lt;x&gt;</option>' in html
+    assert html.count(" selected") == 1
+
+
+@pytest.mark.asyncio
+async def test_model_form_enum_select(session_maker):
+    form = ProductForm(session=session_maker(), obj={"name": "n", "color": Color.green})
+    widget = form.fields["color"]
+    assert isinstance(widget.options, EnumOptions)
+    assert list(widget.options.keys()) == ["red", "green"]
+    assert '<option value="green" selected>Green</option>' in widget.get_options_select()
+    assert list(form.form_dict()["color"]["options"].keys()) == ["red", "green"]
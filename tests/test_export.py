@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+
+import pytest
+
+from tests.models import Color, Post, PostForm, Product, ProductForm, Tag
+
+
+async def export(form, **kwargs) -> str:
+    return "".join([chunk async for chunk in form.export(**kwargs)])
+
+
+async def create_products(session_maker):
+    async with session_maker() as session:
+        session.add_all([
+            Product(name="first", sku="s1", active=True, color=Color.red, category_id=1),
+            Product(name="second", active=False),
+        ])
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_csv_export(session_maker):
+    await create_products(session_maker)
+    form = ProductForm(session=session_maker())
+    rows = list(csv.reader(io.StringIO(await export(form, chunk_size=1))))
+    assert rows[0] == [form.fields[name].label_name for name in form.get_export_fields()]
+    assert rows[1:] == [
+        ["1", "first", "s1", "True", "red", "1"],
+        ["2", "second", "", "False", "", ""],
+    ]
+    text = await export(form, header=False, fields=["name", "color"])
+    assert list(csv.reader(io.StringIO(text))) == [["first", "red"], ["second", ""]]
+
+
+@pytest.mark.asyncio
+async def test_jsonl_export(session_maker):
+    await create_products(session_maker)
+    async with session_maker() as session:
+        session.add(Post(title="post", tags=[await session.get(Tag, 2), await session.get(Tag, 3)]))
+        await session.commit()
+
+    text = await export(ProductForm(session=session_maker()), export_format="jsonl", fields=["name", "active"])
+    assert [json.loads(line) for line in text.splitlines()] == [
+        {"name": "first", "active": True},
+        {"name": "second", "active": False},
+    ]
+    text = await export(PostForm(session=session_maker()), export_format="jsonl", limit=1)
+    record, = [json.loads(line) for line in text.splitlines()]
+    assert record["title"] == "post" and sorted(record["tags"]) == ["2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_fields_and_formats(session_maker):
+    form = ProductForm(session=session_maker())
+    with pytest.raises(ValueError, match="missing"):
+        await export(form, fields=["name", "missing"])
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        await export(form, export_format="xml")
@@ -0,0 +1,39 @@
+import pytest
+
+from tests.models import Product, ProductForm
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_stops_at_first_sync_error(session_maker, statements):
+    called = []
+
+    async def check_name(value):
+        called.append(value)
+        return True
+
+    data = {"name": "p", "color": "purple", "category_id": "9"}
+    form = ProductForm(session=session_maker())
+    form.fields["name"].async_validator = check_name
+    statements.clear()
+    assert not await form.is_valid(data, fail_fast=True)
+    assert form.errors == {"color": " Invalid value for color"}
+    # асинхронные валидаторы и проверки базы данных не выполняются
+    assert called == []
+    assert statements == []
+
+    form = ProductForm(session=session_maker())
+    assert not await form.is_valid(data)
+    assert sorted(form.errors) == ["category_id", "color"]
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_skips_unique_check_after_foreign_key_error(session_maker, statements):
+    async with session_maker() as session:
+        session.add(Product(name="taken"))
+        await session.commit()
+    form = ProductForm(session=session_maker())
+    form.fail_fast = True
+    statements.clear()
+    assert not await form.is_valid({"name": "taken", "category_id": "9"})
+    assert list(form.errors) == ["category_id"]
+    assert not any("test_product" in statement for statement in statements)
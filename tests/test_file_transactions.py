@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import select
+
+from miniform.storage import LocalStorage, set_default_storage
+from tests.models import Document, Upload
+
+ROWS = 8
+UPDATES = 6
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = LocalStorage(str(tmp_path / "media"))
+    set_default_storage(storage)
+    yield storage
+    set_default_storage(None)
+
+
+def list_files(storage):
+    root = storage.path("docs")
+    return {
+        os.path.relpath(os.path.join(directory, name), storage.location)
+        for directory, _, names in os.walk(root)
+        for name in names
+    }
+
+
+async def create_document(session_maker, content):
+    async with session_maker() as session:
+        document = Document(file=Upload(content))
+        session.add(document)
+        await session.commit()
+        return document.id
+
+
+async def update_document(session_maker, document_id, row):
+    expected = None
+    for step in range(UPDATES):
+        async with session_maker() as session:
+            document = await session.get(Document, document_id)
+            if step % 3 == 2:
+                # пустая загрузка не меняет файл
+                document.file = Upload(b"", filename="")
+                await session.commit()
+                continue
+            content = f"row {row} step {step}".encode()
+            document.file = Upload(content)
+            if step % 3 == 1:
+                # файл откатанной транзакции удаляется, старый файл остается
+                await session.flush()
+                await session.rollback()
+                continue
+            await session.commit()
+            expected = content
+        await asyncio.sleep(0)
+    return expected
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_keep_only_live_files(session_maker, storage):
+    ids = await asyncio.gather(*(create_document(session_maker, f"row {row}".encode()) for row in range(ROWS)))
+    # одновременно с заменой файлов создаются новые записи
+    results = await asyncio.gather(
+        *(update_document(session_maker, document_id, row) for row, document_id in enumerate(ids)),
+        *(create_document(session_maker, f"new {row}".encode()) for row in range(ROWS)),
+    )
+    expected = dict(zip(ids, results[:ROWS]))
+
+    async with session_maker() as session:
+        documents = (await session.scalars(select(Document))).all()
+    assert len(documents) == 2 * ROWS
+    live = {document.file for document in documents}
+    assert len(live) == len(documents)
+    # нет потерянных файлов, подготовленных файлов и резервов имен
+    assert list_files(storage) == live
+    for document in documents:
+        content = await storage.read(document.file)
+        if document.id in expected:
+            assert content == expected[document.id]
+        else:
+            assert content.startswith(b"new ")
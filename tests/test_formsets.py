@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import select
+
+from miniform import FormSet
+from tests.models import Product, ProductForm
+
+
+async def create_products(session_maker, *names):
+    async with session_maker() as session:
+        products = [Product(name=name, category_id=1) for name in names]
+        session.add_all(products)
+        await session.commit()
+        return products
+
+
+def row(index, **values):
+    return {f"form-{index}_{key}": value for key, value in values.items()}
+
+
+@pytest.mark.asyncio
+async def test_duplicates_inside_formset(session_maker):
+    formset = FormSet(session=session_maker(), form_class=ProductForm, extra=3)
+    data = {**row(0, name="x", sku="s"), **row(1, name="x", sku=""), **row(2, name="y", sku="")}
+    assert not await formset.is_valid(data)
+    # повтор отмечается во второй строке, пустые значения уникальной колонки не сравниваются
+    assert list(formset.errors) == [1]
+    assert list(formset.errors[1]) == ["name"]
+
+
+@pytest.mark.asyncio
+async def test_unique_conflicts_with_database(session_maker, statements):
+    first, second = await create_products(session_maker, "first", "second")
+    formset = FormSet(session=session_maker(), objects=[first, second], form_class=ProductForm, extra=1)
+    data = {
+        **row(0, id=str(first.id), name="first"),  # значение записи не изменилось
+        **row(1, id=str(second.id), name="first"),  # занято другой записью
+        **row(2, name="second"),  # занято записью в базе
+    }
+    statements.clear()
+    assert not await formset.is_valid(data)
+    assert sorted(formset.errors) == [1, 2]
+    assert all(list(errors) == ["name"] for errors in formset.errors.values())
+    # одна выборка по колонке на весь набор
+    assert len([s for s in statements if "test_product.name IN" in s]) == 1
+
+
+@pytest.mark.asyncio
+async def test_foreign_keys_checked_with_one_query(session_maker, statements):
+    formset = FormSet(session=session_maker(), form_class=ProductForm, extra=4)
+    data = {
+        **row(0, name="a", category_id="1"),
+        **row(1, name="b", category_id="2"),
+        **row(2, name="c", category_id="9"),
+        **row(3, name="d", category_id=""),
+    }
+    statements.clear()
+    assert not await formset.is_valid(data)
+    assert list(formset.errors) == [2]
+    assert list(formset.errors[2]) == ["category_id"]
+    assert len([s for s in statements if "test_category" in s]) == 1
+
+
+@pytest.mark.asyncio
+async def test_save_inserts_and_updates_in_order(session_maker):
+    existing, = await create_products(session_maker, "old")
+    formset = FormSet(session=session_maker(), objects=[existing], form_class=ProductForm, extra=2)
+    data = {
+        **row(0, id=str(existing.id), name="renamed", category_id="2"),
+        **row(1, name="new", category_id="1"),
+        **row(2, name=""),  # пустая строка без объекта пропускается
+    }
+    assert await formset.is_valid(data), formset.errors
+    saved = await formset.save()
+    assert [product.name for product in saved] == ["renamed", "new"]
+    assert saved[0].id == existing.id
+    async with session_maker() as session:
+        rows = (await session.execute(select(Product.name, Product.category_id).order_by(Product.id))).all()
+    assert rows == [("renamed", 2), ("new", 1)]
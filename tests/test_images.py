@@ -0,0 +1,111 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from miniform.images import process_image, shutdown_image_executor, strip_metadata
+from miniform.storage import ContentAddressedStorage, LocalStorage, set_default_storage
+from tests.models import CleanPhoto, CleanPhotoForm, PhotoForm, Upload
+
+
+def make_jpeg(size=(300, 150)) -> bytes:
+    exif = Image.Exif()
+    exif[0x010f] = "Camera"
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format="JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def has_exif(path) -> bool:
+    with Image.open(path) as image:
+        return len(image.getexif()) > 0
+
+
+@pytest.fixture
+def executor():
+    yield
+    shutdown_image_executor()
+
+
+@pytest.fixture(params=[LocalStorage, ContentAddressedStorage])
+def storage(request, tmp_path, executor):
+    storage = request.param(str(tmp_path / "media"))
+    set_default_storage(storage)
+    yield storage
+    set_default_storage(None)
+
+
+async def save_photo(form_class, session_maker, content):
+    form = form_class(session=session_maker())
+    assert await form.is_valid({"image": Upload(content, "photo.jpg")}), form.errors
+    return await form.save_form()
+
+
+def test_process_image_keeps_original(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(make_jpeg())
+    result = process_image(str(path), {"thumb": (100, 100)})
+    assert path.read_bytes() == make_jpeg()
+    with Image.open(result["thumb"]) as thumb:
+        assert thumb.size == (100, 50)
+
+
+def test_strip_metadata_writes_copy(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(make_jpeg())
+    assert strip_metadata(str(path), str(tmp_path / "clean.jpg"))
+    assert has_exif(path)
+    assert not has_exif(tmp_path / "clean.jpg")
+
+
+@pytest.mark.asyncio
+async def test_exif_is_kept_by_default(session_maker, storage):
+    photo = await save_photo(PhotoForm, session_maker, make_jpeg())
+    assert await storage.read(photo.image) == make_jpeg()
+
+
+@pytest.mark.asyncio
+async def test_strip_exif_saves_copy_under_new_name(session_maker, storage):
+    # тот же файл уже сохранен другой записью: в ContentAddressedStorage это общий файл
+    shared = await storage.save("clean/photo.jpg", io.BytesIO(make_jpeg()))
+
+    photo = await save_photo(CleanPhotoForm, session_maker, make_jpeg())
+    assert photo.image != shared
+    assert not has_exif(storage.path(photo.image))
+    assert os.path.exists(storage.path(os.path.splitext(photo.image)[0] + ".thumb.webp"))
+    assert await storage.read(shared) == make_jpeg()
+    if isinstance(storage, ContentAddressedStorage):
+        assert await storage.get_refs(shared) == 1
+
+    form = CleanPhotoForm(session=session_maker(), obj=photo)
+    assert form.obj["image"] == photo.image
+    files = {
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(storage.path("clean"))
+        for name in names
+        if not name.endswith(".refs")
+    }
+    # загруженный файл удален, остались общий файл, копия без EXIF и ее производное
+    assert len(files) == 3
+
+
+@pytest.mark.asyncio
+async def test_srcset_uses_actual_derivative_widths(session_maker, storage):
+    photo = await save_photo(PhotoForm, session_maker, make_jpeg())
+    widget = PhotoForm(session=session_maker(), obj=photo).fields["image"]
+    base = os.path.splitext(photo.image)[0]
+    # 300x150 вписывается в рамку 100x100 как 100x50, а в рамки 400 и 800 без увеличения
+    assert widget.get_srcset() == f"{base}.thumb.webp 100w, {base}.medium.webp 300w"
+
+
+@pytest.mark.asyncio
+async def test_truncated_image_is_saved_with_warning(session_maker, storage):
+    content = make_jpeg()[:600]
+    with pytest.warns(RuntimeWarning, match="Image processing of image"):
+        photo = await save_photo(CleanPhotoForm, session_maker, content)
+    # запись сохранена и ссылается на загруженный файл, производные не созданы
+    async with session_maker() as session:
+        assert (await session.get(CleanPhoto, photo.id)).image == photo.image
+    assert await storage.read(photo.image) == content
+    assert not os.path.exists(storage.path(os.path.splitext(photo.image)[0] + ".thumb.webp"))
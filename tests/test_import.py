@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# сам пакет импортируется за ~15 мс, одна sqlalchemy.ext.asyncio - за ~350 мс
+IMPORT_TIME_LIMIT_US = 100_000
+
+HEAVY_MODULES = ("sqlalchemy", "starlette", "bcrypt", "PIL", "nest_asyncio")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_time_is_capped():
+    result = run_python("-X", "importtime", "-c", "import miniform")
+    # строка "import time: <self> | <cumulative> | miniform"
+    cumulative = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[-1].strip() == "miniform"
+    ]
+    assert cumulative, result.stderr
+    assert cumulative[0] < IMPORT_TIME_LIMIT_US
+
+
+@pytest.mark.parametrize("code", [
+    "import miniform",
+    "import miniform; dir(miniform)",
+])
+def test_heavy_dependencies_are_not_imported(code):
+    result = run_python("-c", f"import sys; {code}; print(','.join(sorted(sys.modules)))")
+    modules = result.stdout.strip().split(",")
+    loaded = [name for name in HEAVY_MODULES if any(m == name or m.startswith(name + ".") for m in modules)]
+    assert loaded == []
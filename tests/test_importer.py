@@ -0,0 +1,82 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from miniform import ModelImporter
+from tests.models import Product, ProductForm
+
+
+def read_report(report_file):
+    return [json.loads(line) for line in report_file.getvalue().splitlines()]
+
+
+async def product_names(session_maker):
+    async with session_maker() as session:
+        return sorted((await session.scalars(select(Product.name))).all())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("processes", [0, 1])
+async def test_duplicates_inside_chunk(session_maker, processes):
+    rows = [
+        {"name": "a", "sku": "s1", "category_id": "1"},
+        {"name": "b", "sku": "s1", "category_id": "2"},
+        {"name": "a", "sku": "", "category_id": "1"},
+        {"name": "c", "sku": "", "category_id": "1"},
+    ]
+    errors = io.StringIO()
+    importer = ModelImporter(ProductForm, session_maker, chunk_size=10, processes=processes)
+    report = await importer.run(rows, error_report=errors)
+    assert (report.rows, report.inserted, report.failed) == (4, 2, 2)
+    assert [(error["row"], list(error["errors"])) for error in read_report(errors)] == [(2, ["sku"]), (3, ["name"])]
+    assert await product_names(session_maker) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_conflicts_with_database_and_previous_chunks(session_maker):
+    async with session_maker() as session:
+        session.add(Product(name="existing"))
+        await session.commit()
+    rows = [
+        {"name": "existing"},
+        {"name": "x", "category_id": "1"},
+        {"name": "x"},  # уже сохранена предыдущей порцией
+        {"name": "y", "category_id": "9"},
+        {"name": ""},
+        {"name": "z"},
+    ]
+    errors = io.StringIO()
+    report = await ModelImporter(ProductForm, session_maker, chunk_size=2).run(rows, error_report=errors)
+    assert (report.rows, report.inserted, report.failed) == (6, 2, 4)
+    assert [(error["row"], list(error["errors"])) for error in read_report(errors)] == [
+        (1, ["name"]), (3, ["name"]), (4, ["category_id"]), (5, ["name"])
+    ]
+    assert read_report(errors)[0]["data"] == {"name": "existing"}
+    assert await product_names(session_maker) == ["existing", "x", "z"]
+
+
+class UncheckedImporter(ModelImporter):
+    # строки, добавленные другим процессом после проверки уникальности, находит только вставка
+    async def _check_unique(self, form, valid):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_insert_errors_are_bisected(session_maker, statements):
+    async with session_maker() as session:
+        session.add(Product(name="taken"))
+        await session.commit()
+    rows = [{"name": f"p{index}"} for index in range(8)]
+    rows[5] = {"name": "taken"}
+    errors = io.StringIO()
+    statements.clear()
+    report = await UncheckedImporter(ProductForm, session_maker, chunk_size=8).run(rows, error_report=errors)
+    assert (report.inserted, report.failed) == (7, 1)
+    error, = read_report(errors)
+    assert error["row"] == 6
+    assert "UNIQUE" in error["errors"]["__all__"]
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: семь вставок вместо вставки каждой строки после общей ошибки
+    assert len([s for s in statements if s.startswith("INSERT INTO test_product")]) == 7
+    assert len(await product_names(session_maker)) == 8
@@ -0,0 +1,107 @@
+import re
+
+import pytest
+
+from miniform import QueryBudgetExceeded, QueryGuard, RecordingInstrumentation, set_instrumentation
+from miniform.instrumentation import StatementCounter
+from tests.models import PostForm, ProductForm
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = RecordingInstrumentation()
+    set_instrumentation(instrumentation)
+    yield instrumentation
+    set_instrumentation(None)
+
+
+@pytest.mark.asyncio
+async def test_span_names_and_nesting(session_maker, instrumentation):
+    form = ProductForm(session=session_maker())
+    assert await form.is_valid({"name": "p", "category_id": "1"}), form.errors
+    spans = instrumentation.exporter.spans
+    assert [(span["name"], span["parent"]) for span in spans] == [
+        ("modelform.fields", "modelform.init"),
+        ("modelform.init", None),
+        ("is_valid.clean", "is_valid"),
+        ("is_valid.sync", "is_valid"),
+        ("is_valid.foreign_keys", "is_valid"),
+        ("is_valid.unique", "is_valid"),
+        ("is_valid", None),
+    ]
+    assert all(span["status"] == "ok" and span["attributes"]["form"] == "ProductForm" for span in spans)
+    statements = {span["name"]: span["attributes"]["db.statements"] for span in spans}
+    assert statements["modelform.init"] == 0
+    assert statements["is_valid.foreign_keys"] == statements["is_valid.unique"] == 1
+    assert statements["is_valid"] == 2
+
+
+@pytest.mark.asyncio
+async def test_prometheus_export(session_maker, instrumentation):
+    for _ in range(2):
+        ProductForm(session=session_maker()).__html__()
+    instrumentation.count("miniform_custom_total", 3, kind="test")
+    text = instrumentation.exporter.to_prometheus()
+    lines = text.splitlines()
+    assert lines[:2] == [
+        "# HELP miniform_phase_duration_seconds Duration of form phases.",
+        "# TYPE miniform_phase_duration_seconds summary",
+    ]
+    assert 'miniform_phase_duration_seconds_count{phase="render.html",form="ProductForm"} 2' in lines
+    assert re.search(r'^miniform_phase_duration_seconds_sum\{phase="render.html",form="ProductForm"\} [0-9.e-]+$', text, re.M)
+    assert 'miniform_sql_statements_total{form="ProductForm",phase="modelform.options"} 2' in lines
+    assert lines.count("# TYPE miniform_sql_statements_total counter") == 1
+    assert 'miniform_custom_total{kind="test"} 3' in lines
+    assert text.endswith("\n")
+
+
+@pytest.mark.asyncio
+async def test_statement_counter(session_maker):
+    session = session_maker()
+    form = ProductForm(session=session)
+    with StatementCounter(session) as counter:
+        form.__html__()
+    assert counter.count == 1
+    assert "FROM test_category" in counter.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_budget_within_limits(session_maker):
+    budgets = {"__init__": 0, "render": QueryGuard.per_foreign_key(1), "options": 1}
+    with QueryGuard(budgets) as guard:
+        form = ProductForm(session=session_maker())
+        form.__html__()
+        form.form_dict()  # опции уже загружены
+    assert guard.report == {
+        "ProductForm.__init__": [0],
+        "ProductForm.options": [1],
+        "ProductForm.render": [1, 0],
+    }
+
+
+@pytest.mark.asyncio
+async def test_budget_exceeded_by_options_on_render(session_maker):
+    form = ProductForm(session=session_maker())
+    form.query_guard = QueryGuard({"render": 0})
+    with pytest.raises(QueryBudgetExceeded, match="ProductForm.render issued 1 SQL statements, budget is 0"):
+        form.__html__()
+
+    form = ProductForm(session=session_maker())
+    form.query_guard = QueryGuard({"options": 0}, raise_on_exceed=False)
+    with pytest.warns(RuntimeWarning, match="ProductForm.options issued 1"):
+        str(form.fields["category_id"])
+
+
+@pytest.mark.asyncio
+async def test_per_foreign_key_budget(session_maker):
+    guard = QueryGuard({"render": QueryGuard.per_foreign_key(1), "ProductForm.render": QueryGuard.per_foreign_key(0)})
+    post = PostForm(session=session_maker())
+    post.query_guard = guard
+    post.__html__()  # одна связь многие-ко-многим - один запрос
+    assert guard.report == {"PostForm.options": [1], "PostForm.render": [1]}
+    assert QueryGuard.per_foreign_key(1)(post) == 1
+
+    form = ProductForm(session=session_maker())
+    form.query_guard = guard
+    with pytest.raises(QueryBudgetExceeded):
+        form.form_json()
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import select
+
+from tests.models import Post, PostForm, Product, ProductForm, Tag
+
+
+@pytest.mark.asyncio
+async def test_foreign_key_form_renders_without_queries(session_maker, statements):
+    async with session_maker() as session:
+        session.add(Product(name="p", category_id=2))
+        await session.commit()
+
+    async with session_maker() as session:
+        product = await session.scalar(select(Product).options(*ProductForm.loader_options()))
+        statements.clear()
+        form = ProductForm(session=session, obj=product, load_options=False)
+        html = form.__html__()
+        data = form.form_dict()
+        assert statements == []
+    assert "b</option>" in html and ">a</option>" not in html
+    assert data["category_id"]["value"] == 2
+
+
+@pytest.mark.asyncio
+async def test_many_to_many_form_renders_without_queries(session_maker, statements):
+    async with session_maker() as session:
+        session.add(Post(title="post", tags=[await session.get(Tag, 1), await session.get(Tag, 3)]))
+        await session.commit()
+
+    async with session_maker() as session:
+        post = await session.scalar(select(Post).options(*PostForm.loader_options()))
+        statements.clear()
+        form = PostForm(session=session, obj=post, load_options=False)
+        html = form.__html__()
+        assert statements == []
+    assert "t1" in html and "t3" in html and "t2" not in html
+    assert " selected" in html
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import select
+
+from tests.models import Post, PostForm, post_tag
+
+
+async def get_tag_ids(session_maker, post_id):
+    async with session_maker() as session:
+        result = await session.scalars(select(post_tag.c.tag_id).where(post_tag.c.post_id == post_id))
+        return sorted(result.all())
+
+
+async def create_post(session_maker, tags):
+    form = PostForm(session=session_maker())
+    assert await form.is_valid({"title": "post", "tags": tags}), form.errors
+    post = await form.save_form()
+    return post
+
+
+@pytest.mark.asyncio
+async def test_save_and_change_tags(session_maker):
+    post = await create_post(session_maker, ["1", "2"])
+    assert await get_tag_ids(session_maker, post.id) == [1, 2]
+
+    form = PostForm(session=session_maker(), obj=post)
+    assert await form.is_valid({"id": str(post.id), "title": "post", "tags": ["2", "3"]}), form.errors
+    await form.save_form()
+    assert await get_tag_ids(session_maker, post.id) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_missing_multiple_select_clears_tags(session_maker):
+    post = await create_post(session_maker, ["1", "2"])
+
+    form = PostForm(session=session_maker(), obj=post)
+    assert await form.is_valid({"id": str(post.id), "title": "post"}), form.errors
+    await form.save_form()
+    assert await get_tag_ids(session_maker, post.id) == []
+
+
+@pytest.mark.asyncio
+async def test_excluded_relationship_is_kept(session_maker):
+    post = await create_post(session_maker, ["1", "2"])
+
+    form = PostForm(session=session_maker(), obj=post, extend_exclude=["tags"])
+    assert await form.is_valid({"id": str(post.id), "title": "renamed"}), form.errors
+    await form.save_form()
+    assert await get_tag_ids(session_maker, post.id) == [1, 2]
+    async with session_maker() as session:
+        assert (await session.get(Post, post.id)).title == "renamed"
@@ -0,0 +1,81 @@
+import re
+
+import pytest
+
+from miniform import FormSet, QueryGuard, RecordingInstrumentation
+from tests.models import PostForm, ProductForm
+
+
+def full_selects(statements, table):
+    # выборка всей таблицы опций: SELECT ... FROM <table> без WHERE
+    return [
+        statement for statement in statements
+        if re.search(rf"^SELECT .*\sFROM {table}\s*$", statement, re.S)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_post_path_does_not_select_all_options(session_maker, statements):
+    form = ProductForm(session=session_maker())
+    assert await form.is_valid({"name": "p", "category_id": "2"}), form.errors
+    form = ProductForm(session=session_maker())
+    assert not await form.is_valid({"name": "p", "category_id": "9"})
+    assert "category_id" in form.errors
+    assert full_selects(statements, "test_category") == []
+    assert any("test_category.id IN" in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_post_path_many_to_many(session_maker, statements):
+    form = PostForm(session=session_maker())
+    assert await form.is_valid({"title": "p", "tags": ["1", "3"]}), form.errors
+    form = PostForm(session=session_maker())
+    assert not await form.is_valid({"title": "p", "tags": ["1", "7"]})
+    assert "tags" in form.errors
+    assert full_selects(statements, "test_tag") == []
+
+
+@pytest.mark.asyncio
+async def test_options_are_loaded_on_render(session_maker, statements):
+    form = ProductForm(session=session_maker())
+    post = PostForm(session=session_maker())
+    assert statements == []
+    html = str(form.fields["category_id"])
+    assert '<option value="1">a</option>' in html and '<option value="2">b</option>' in html
+    assert str(form.fields["category_id"]) == html
+    assert "t3" in str(post.fields["tags"])
+    assert len(full_selects(statements, "test_category")) == 1
+    assert len(full_selects(statements, "test_tag")) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("form_class", [ProductForm, PostForm])
+async def test_constructor_issues_no_queries_and_render_one_per_foreign_key(session_maker, statements, form_class):
+    form = form_class(session=session_maker())
+    assert statements == []
+    form.instrumentation = RecordingInstrumentation()
+    form.__html__()
+    assert len(statements) == QueryGuard.per_foreign_key(1)(form) == 1
+    spans = form.instrumentation.exporter.spans
+    assert [(span["name"], span["parent"]) for span in spans] == [
+        ("modelform.options", "render.html"), ("render.html", None)
+    ]
+    assert spans[1]["attributes"]["db.statements"] == 1
+    form.__html__()
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_post_renders_options(session_maker):
+    form = ProductForm(session=session_maker())
+    assert not await form.is_valid({"name": "p", "category_id": "9"})
+    html = str(form.fields["category_id"])
+    assert '<option value="1">a</option>' in html and '<option value="2">b</option>' in html
+
+
+@pytest.mark.asyncio
+async def test_formset_forms_share_options(session_maker, statements):
+    formset = FormSet(session=session_maker(), form_class=ProductForm, extra=3)
+    for form in formset.forms:
+        assert '<option value="2">b</option>' in str(form.fields["category_id"])
+    assert len(full_selects(statements, "test_category")) == 1
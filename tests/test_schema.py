@@ -0,0 +1,132 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from miniform import ValidationPlan, prewarm, schema
+from miniform.schema import dump_schema, load_schema, validate_rows
+from tests.models import Post, PostForm, Product, ProductForm, Tag
+
+
+@pytest.fixture
+def options_cache():
+    yield
+    ProductForm.clear_options_cache()
+    PostForm.clear_options_cache()
+
+
+@pytest.fixture
+def compiled_schemas():
+    yield
+    for form_class in (ProductForm, PostForm):
+        if "_compiled_schema" in form_class.__dict__:
+            del form_class._compiled_schema
+
+
+@pytest.mark.asyncio
+async def test_dump_and_load_schema_round_trip(session_maker, tmp_path, compiled_schemas):
+    async with session_maker() as session:
+        session.add(Product(name="p", category_id=2))
+        session.add(Post(title="post", tags=[await session.get(Tag, 2)]))
+        await session.commit()
+        product = await session.scalar(select(Product).options(*ProductForm.loader_options()))
+    forms = [ProductForm(session=session_maker()), PostForm(session=session_maker())]
+    expected = [form.__html__() for form in forms]
+    expected.append(ProductForm(session=session_maker(), obj=product).__html__())
+
+    path = tmp_path / "schema.json"
+    dumped = dump_schema(path, [ProductForm, PostForm])
+    loaded = load_schema(path)
+    assert [schema.to_dict() for schema in loaded] == [schema.to_dict() for schema in dumped]
+    assert ProductForm.__dict__["_compiled_schema"] is loaded[0]
+    assert PostForm.__dict__["_compiled_schema"] is loaded[1]
+
+    forms = [ProductForm(session=session_maker()), PostForm(session=session_maker())]
+    actual = [form.__html__() for form in forms]
+    actual.append(ProductForm(session=session_maker(), obj=product).__html__())
+    assert actual == expected
+
+
+def test_outdated_or_unsupported_schema_is_ignored(tmp_path, compiled_schemas):
+    path = tmp_path / "schema.json"
+    dump_schema(path, [ProductForm])
+    data = json.loads(path.read_text())
+    data["forms"][0]["fingerprint"] = "outdated"
+    path.write_text(json.dumps(data))
+    with pytest.warns(RuntimeWarning, match="outdated"):
+        assert load_schema(path) == []
+    assert "_compiled_schema" not in ProductForm.__dict__
+
+    path.write_text(json.dumps({"version": 0, "forms": []}))
+    with pytest.warns(RuntimeWarning, match="unsupported version"):
+        assert load_schema(path) == []
+
+
+@pytest.mark.asyncio
+async def test_first_request_after_prewarm_uses_cached_options(session_maker, statements, options_cache):
+    async with session_maker() as session:
+        await prewarm([ProductForm, PostForm], session=session, compile_schema=False)
+    assert any("FROM test_category" in statement for statement in statements)
+    statements.clear()
+
+    form = ProductForm(session=session_maker())
+    post = PostForm(session=session_maker())
+    html = form.__html__()
+    assert '<option value="1">a</option>' in html and '<option value="2">b</option>' in html
+    assert "t3" in post.__html__()
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_cleared_options_cache_is_loaded_on_render(session_maker, statements, options_cache):
+    async with session_maker() as session:
+        await prewarm([ProductForm], session=session, compile_schema=False, options_ttl=0)
+    statements.clear()
+    # истекший кеш не используется
+    assert '<option value="2">b</option>' in str(ProductForm(session=session_maker()).fields["category_id"])
+    assert len(statements) == 1
+
+    async with session_maker() as session:
+        await prewarm([ProductForm], session=session, compile_schema=False)
+    ProductForm.clear_options_cache()
+    statements.clear()
+    assert '<option value="2">b</option>' in str(ProductForm(session=session_maker()).fields["category_id"])
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_prewarm_without_session_issues_no_statements(session_maker, statements):
+    timings = await prewarm([ProductForm], compile_schema=False)
+    assert list(timings) == [ProductForm]
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_plan_does_not_load_foreign_key_options(session_maker, statements):
+    form = ProductForm(session=session_maker())
+    plan = ValidationPlan.from_form(form)
+    assert statements == []
+    spec, = [spec for spec in plan.fields if spec.name == "category_id"]
+    assert spec.options == {} and spec.state["partial_options"]
+    # опции, загруженные выводом формы, в план не попадают
+    form.__html__()
+    assert ValidationPlan.from_form(form).key == plan.key
+
+
+@pytest.mark.asyncio
+async def test_plan_forms_are_bounded_and_per_thread(session_maker):
+    plan = ValidationPlan.from_form(ProductForm(session=session_maker()))
+    for index in range(schema._PLAN_FORMS_SIZE + 5):
+        ValidationPlan(plan.fields, key=f"plan-{index}").get_form()
+    assert len(schema._PLAN_FORMS) == schema._PLAN_FORMS_SIZE
+
+    rows = [{"name": "x" * (index % 3), "category_id": str(index)} for index in range(200)]
+    expected = plan.validate(rows)
+    with ThreadPoolExecutor(4) as executor:
+        chunks = list(executor.map(validate_rows, [plan] * 20, [rows[index::20] for index in range(20)]))
+    assert [result for index in range(20) for result in chunks[index]] == [
+        expected[row] for index in range(20) for row in range(index, 200, 20)
+    ]
+    with ThreadPoolExecutor(1) as executor:
+        assert executor.submit(plan.get_form).result() is not plan.get_form()
@@ -0,0 +1,105 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+from miniform.fields import FileField
+from miniform.storage import ContentAddressedStorage, LocalStorage
+
+N = 20
+
+
+def list_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(directory, name), root)
+        for directory, _, names in os.walk(root)
+        for name in names
+        if name != ContentAddressedStorage.lock_name
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_saves_keep_one_blob(tmp_path):
+    # два экземпляра делят только блокировку файла, как разные процессы
+    storages = [ContentAddressedStorage(str(tmp_path)), ContentAddressedStorage(str(tmp_path))]
+    names = await asyncio.gather(*(
+        storages[i % 2].save("docs/report.PDF", io.BytesIO(b"%PDF-1.7 same content"))
+        for i in range(N)
+    ))
+    assert len(set(names)) == 1
+    name = names[0]
+    assert name.startswith("docs/") and name.endswith(".pdf")
+    assert list_files(tmp_path) == [name, name + ".refs"]
+    assert await storages[0].get_refs(name) == N
+    assert await storages[0].read(name) == b"%PDF-1.7 same content"
+
+
+@pytest.mark.asyncio
+async def test_different_content_gets_different_blobs(tmp_path):
+    storage = ContentAddressedStorage(str(tmp_path))
+    first = await storage.save("a.txt", io.BytesIO(b"first"))
+    second = await storage.save("a.txt", io.BytesIO(b"second"))
+    assert first != second
+    assert await storage.get_refs(first) == 1
+    assert await storage.get_refs(second) == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_blob_after_last_reference(tmp_path):
+    storage = ContentAddressedStorage(str(tmp_path))
+    names = await asyncio.gather(*(storage.save("a.txt", io.BytesIO(b"data")) for _ in range(N)))
+    name = names[0]
+
+    await asyncio.gather(*(storage.delete(name) for _ in range(N - 1)))
+    assert await storage.get_refs(name) == 1
+    assert await storage.exists(name)
+
+    await storage.delete(name)
+    assert await storage.get_refs(name) == 0
+    assert not await storage.exists(name)
+    assert list_files(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_saves_and_deletes_keep_refcount(tmp_path):
+    storage = ContentAddressedStorage(str(tmp_path))
+    name = await storage.save("a.txt", io.BytesIO(b"data"))
+
+    async def save_and_delete():
+        await storage.delete(await storage.save("a.txt", io.BytesIO(b"data")))
+
+    await asyncio.gather(*(save_and_delete() for _ in range(N)))
+    assert await storage.get_refs(name) == 1
+    assert await storage.read(name) == b"data"
+    assert not any(path.endswith(".upload") for path in list_files(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_file_without_refs_counts_as_one_reference(tmp_path):
+    storage = ContentAddressedStorage(str(tmp_path))
+    (tmp_path / "legacy.txt").write_bytes(b"old")
+    assert await storage.get_refs("legacy.txt") == 1
+    await storage.delete("legacy.txt")
+    assert not await storage.exists("legacy.txt")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("atomic", [True, False])
+async def test_concurrent_saves_with_same_name_get_unique_names(tmp_path, atomic):
+    storage = LocalStorage(str(tmp_path), atomic=atomic)
+    names = await asyncio.gather(*(
+        storage.save("docs/a.txt", io.BytesIO(f"upload {index}".encode())) for index in range(N)
+    ))
+    assert len(set(names)) == N
+    assert "docs/a.txt" in names
+    assert list_files(tmp_path) == sorted(names)
+    contents = {(await storage.read(name)).decode() for name in names}
+    assert contents == {f"upload {index}" for index in range(N)}
+
+
+def test_deprecated_create_directory(tmp_path):
+    field = FileField(upload_to="docs", max_size=64, storage=LocalStorage(str(tmp_path / "media")))
+    with pytest.warns(DeprecationWarning, match="create_directory"):
+        field.create_directory()
+    assert os.path.isdir(tmp_path / "media" / "docs")
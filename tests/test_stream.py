@@ -0,0 +1,63 @@
+import pytest
+
+from tests.models import Color, Post, Product, ProductForm, PostForm, Tag
+
+
+async def create_products(session_maker, count=10):
+    async with session_maker() as session:
+        products = [
+            Product(name=f"p{index}", active=index % 2 == 0, color=Color.green if index % 2 else Color.red)
+            for index in range(count)
+        ]
+        session.add_all(products)
+        await session.commit()
+        return products
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_stream_keyset_after_and_limit(session_maker, statements):
+    products = await create_products(session_maker)
+    form = ProductForm(session=session_maker())
+    statements.clear()
+    rows = await collect(form.stream(after=products[3].id, limit=3, chunk_size=2))
+    assert [product.name for product in rows] == ["p4", "p5", "p6"]
+    # продолжение выборки по условию на ключ, а не пропуском записей
+    assert "WHERE test_product.id > ?" in statements[-1]
+
+    rows = await collect(form.stream(after=products[3].id, descending=True))
+    assert [product.name for product in rows] == ["p2", "p1", "p0"]
+    rows = await collect(form.stream(order_by=["active", "id"], after=(False, products[7].id), limit=2))
+    assert [product.name for product in rows] == ["p9", "p0"]
+
+
+@pytest.mark.asyncio
+async def test_stream_as_dict_serializes_through_widgets(session_maker):
+    await create_products(session_maker, 2)
+    async with session_maker() as session:
+        tags = [await session.get(Tag, 1), await session.get(Tag, 3)]
+        session.add(Post(title="post", tags=tags))
+        await session.commit()
+
+    rows = await collect(ProductForm(session=session_maker()).stream(as_dict=True))
+    assert rows[0]["name"] == "p0" and rows[0]["active"] is True
+    assert [row["color"] for row in rows] == ["red", "green"]
+    posts = await collect(PostForm(session=session_maker()).stream(as_dict=True))
+    assert posts[0]["title"] == "post"
+    assert sorted(posts[0]["tags"]) == ["1", "3"]
+
+
+@pytest.mark.asyncio
+async def test_selected_to_download(session_maker):
+    await create_products(session_maker)
+    form = ProductForm(session=session_maker())
+    assert [product.name for product in await form.selected_to_download(Product.active, None, 2)] == ["p0", "p1"]
+    # отрицательное количество - последние записи в прямом порядке
+    last = await form.selected_to_download(Product.active, None, -3)
+    assert [product.name for product in last] == ["p7", "p8", "p9"]
+    last_active = await form.selected_to_download(Product.active, True, -2)
+    assert [product.name for product in last_active] == ["p6", "p8"]
+    assert len(await form.selected_to_download(Product.active, None)) == 10
@@ -0,0 +1,43 @@
+import pytest
+
+from tests.models import Product, ProductForm
+
+
+async def create_products(session_maker):
+    async with session_maker() as session:
+        products = [Product(name="first", sku="s1"), Product(name="second", sku="s2")]
+        session.add_all(products)
+        await session.commit()
+        return products
+
+
+@pytest.mark.asyncio
+async def test_check_unique_value_excludes_current_row(session_maker):
+    first, second = await create_products(session_maker)
+    form = ProductForm(session=session_maker())
+    assert await form._check_unique_value("name", "first", exclude_pk=first.id)
+    assert not await form._check_unique_value("name", "first", exclude_pk=second.id)
+    assert not await form._check_unique_value("name", "first")
+    assert await form._check_unique_value("name", "third")
+
+
+@pytest.mark.asyncio
+async def test_edit_keeps_own_unique_values(session_maker):
+    first, _ = await create_products(session_maker)
+    form = ProductForm(session=session_maker(), obj=first)
+    assert await form.is_valid({"id": str(first.id), "name": "first", "sku": "s1"}), form.errors
+    # первичный ключ без объекта берется из данных формы
+    form = ProductForm(session=session_maker())
+    assert await form.is_valid({"id": str(first.id), "name": "first", "sku": "s1"}), form.errors
+    assert form._get_current_pk({"id": first.id}) == first.id
+
+
+@pytest.mark.asyncio
+async def test_edit_conflicting_with_other_row_is_rejected(session_maker):
+    first, second = await create_products(session_maker)
+    form = ProductForm(session=session_maker(), obj=second)
+    assert not await form.is_valid({"id": str(second.id), "name": "first", "sku": "s1"})
+    assert sorted(form.errors) == ["name", "sku"]
+    form = ProductForm(session=session_maker())
+    assert not await form.is_valid({"name": "second"})
+    assert list(form.errors) == ["name"]
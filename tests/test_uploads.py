@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+from miniform.uploads import sniff_content, sniff_upload
+
+
+@pytest.mark.parametrize("head", [
+    "имя;цена\nчай;10\n".encode("utf-8"),
+    "имя;цена\nчай;10\n".encode("cp1251"),
+    "яблоко;1\n".encode("cp1251"),
+    "BM;ID3;FLV\n".encode("ascii"),
+    "цена".encode("utf-8")[:-1],
+])
+def test_text_in_any_encoding_is_accepted(head):
+    assert sniff_content(head, ".csv")
+
+
+@pytest.mark.parametrize("head", [
+    b"a;b\x00c",
+    b"\x89PNG\r\n\x1a\n" + b"\xff" * 8,
+    b"PK\x03\x04" + b"\xff" * 8,
+    b"\x1f\x8b\x08" + b"\xff" * 8,
+])
+def test_binary_disguised_as_text_is_rejected(head):
+    assert not sniff_content(head, ".txt")
+
+
+def test_signature_check_for_binary_extensions():
+    assert sniff_content(b"%PDF-1.7", ".PDF")
+    assert not sniff_content(b"plain text", ".pdf")
+    assert sniff_content(b"anything", ".unknown")
+
+
+def test_sniff_upload_keeps_position():
+    file = io.BytesIO("дата;сумма\n".encode("cp1251"))
+    assert sniff_upload(file, "report.csv")
+    assert file.tell() == 0